@@ -6,9 +6,11 @@
 import json
 import logging
 import asyncio
+import sys
 import socks
+import threading
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from telethon import TelegramClient, events
 from telethon.errors import SessionPasswordNeededError
 
@@ -16,11 +18,54 @@ from models import Account, AccountConfig
 from utils.singleton import Singleton
 from utils.logger import get_logger
 
+_stdin_target: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = None
+_stdin_thread: Optional[threading.Thread] = None
+
+
+def _stdin_put(line: Optional[str]):
+    loop, queue = _stdin_target
+    try:
+        loop.call_soon_threadsafe(queue.put_nowait, line)
+    except RuntimeError:
+        pass
+
+
+def _stdin_reader():
+    for line in sys.stdin:
+        _stdin_put(line.rstrip('\n'))
+    _stdin_put(None)
+
+
+async def _ainput(prompt: str) -> str:
+    global _stdin_target, _stdin_thread
+    loop = asyncio.get_running_loop()
+    if _stdin_target is None or _stdin_target[0] is not loop:
+        _stdin_target = (loop, asyncio.Queue())
+    if _stdin_thread is None:
+        _stdin_thread = threading.Thread(target=_stdin_reader, name='stdin', daemon=True)
+        _stdin_thread.start()
+
+    queue = _stdin_target[1]
+    while sys.stdin.isatty() and not queue.empty():
+        if queue.get_nowait() is None:
+            queue.put_nowait(None)
+            break
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+
+    line = await queue.get()
+    if line is None:
+        queue.put_nowait(None)
+        raise EOFError
+    return line
+
 
 class AccountManager(metaclass=Singleton):
     
     def __init__(self):
         self.accounts: Dict[str, Account] = {}
+        self._accounts_list: Optional[List[Account]] = None
         self.current_account_id: Optional[str] = None
         self.blocked_bots: set = set()
         self.logger = get_logger(__name__)
@@ -39,12 +84,14 @@ class AccountManager(metaclass=Singleton):
             
             for account_data in data.get('accounts', []):
                 try:
+                    config_data = account_data['config']
+                    phone = config_data['phone']
                     config = AccountConfig(
-                        phone=account_data['config']['phone'],
-                        api_id=account_data['config']['api_id'],
-                        api_hash=account_data['config']['api_hash'],
-                        proxy=account_data['config'].get('proxy'),
-                        session_name=account_data['config'].get('session_name', account_data['config']['phone'])
+                        phone=phone,
+                        api_id=config_data['api_id'],
+                        api_hash=config_data['api_hash'],
+                        proxy=config_data.get('proxy'),
+                        session_name=config_data.get('session_name', phone)
                     )
                     
                     account = Account(
@@ -55,10 +102,12 @@ class AccountManager(metaclass=Singleton):
                         monitor_active=account_data.get('monitor_active', False)
                     )
                     
-                    if 'monitor_configs' in account_data:
-                        account.monitor_configs = account_data['monitor_configs']
+                    monitor_configs = account_data.get('monitor_configs')
+                    if monitor_configs is not None:
+                        account.monitor_configs = monitor_configs
                     
                     self.accounts[account.account_id] = account
+                    self._accounts_list = None
                     
                     self.logger.info(f"已加载账号: {account.account_id}")
                     
@@ -142,6 +191,7 @@ class AccountManager(metaclass=Singleton):
                 self.logger.info(f"重新登录账号 {account.account_id}，已保留原有监控配置，监控状态: {account.monitor_active}")
             
             self.accounts[account.account_id] = account
+            self._accounts_list = None
             if self.current_account_id is None:
                 self.current_account_id = account.account_id
             
@@ -187,6 +237,7 @@ class AccountManager(metaclass=Singleton):
                     self.logger.debug(f"删除session-journal文件失败: {e}")
             
             del self.accounts[account_id]
+            self._accounts_list = None
             
             self._save_accounts()
             
@@ -215,7 +266,9 @@ class AccountManager(metaclass=Singleton):
         return False
     
     def list_accounts(self) -> List[Account]:
-        return list(self.accounts.values())
+        if self._accounts_list is None:
+            self._accounts_list = list(self.accounts.values())
+        return self._accounts_list
     
     def get_account_count(self) -> int:
         return len(self.accounts)
@@ -262,13 +315,13 @@ class AccountManager(metaclass=Singleton):
             await client.send_code_request(phone)
             self.logger.info('验证码已发送到您的Telegram账号')
             
-            code = input('请输入您收到的验证码: ').strip()
+            code = (await _ainput('请输入您收到的验证码: ')).strip()
             
             try:
                 await client.sign_in(phone, code)
             except SessionPasswordNeededError:
                 self.logger.info('检测到两步验证，需要输入密码')
-                password = input('请输入您的两步验证密码: ').strip()
+                password = (await _ainput('请输入您的两步验证密码: ')).strip()
                 await client.sign_in(password=password)
             
             return True
@@ -3,37 +3,78 @@
 负责协调各种监控器和处理消息事件
 """
 
+import os
 import json
+import queue
+import logging
 import asyncio
-import pytz
+import smtplib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Set, Optional
-from datetime import datetime
+from typing import List, Dict, Set, Optional, Tuple
+from datetime import datetime, timedelta
 from telethon import events
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from models import MessageEvent, TelegramMessage, MessageSender, Account
-from monitors import BaseMonitor, MonitorResult, monitor_factory
+from models.config import MatchType, MonitorMode
+from monitors import BaseMonitor, MonitorResult, KeywordMonitor, ButtonMonitor, FileMonitor, monitor_factory
 from utils.singleton import Singleton
 from utils.logger import get_logger
+from utils.keyword_matcher import KeywordMatcher
+from utils.validators import SCHEDULE_TIMEZONE, get_cron_trigger
+
+SCHEDULE_REAPER_JOB_ID = "scheduled_messages_reaper"
+SCHEDULE_REAPER_INTERVAL = 5
+FORWARD_BATCH_SIZE = 100
+FORWARD_BATCH_WINDOW = 0.5
+FORWARD_QUEUE_MAXSIZE = 1000
+SMTP_POOL_SIZE = 4
+EMAIL_BATCH_WINDOW = 5
+
+
+def _write_text_atomic(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
 
 
 class MonitorEngine(metaclass=Singleton):
 
     def __init__(self):
         self.monitors: Dict[str, List[BaseMonitor]] = {}
+        self._keyword_matchers: Dict[str, KeywordMatcher] = {}
+        self._button_matchers: Dict[str, KeywordMatcher] = {}
+        self._file_extensions: Dict[str, Set[str]] = {}
+        self._chat_indexes: Dict[str, Tuple[Dict[int, List[int]], List[int]]] = {}
+        self._monitor_entries: Dict[str, List[tuple]] = {}
+        self._event_handlers: Dict[str, tuple] = {}
         self.processed_messages: Set[str] = set()
-        self.scheduled_messages: List[Dict] = []
+        self.scheduled_messages: Dict[str, Dict] = {}
         self.logger = get_logger(__name__)
         self.monitors_file = Path("data/monitor_configs.json")
         self.scheduled_messages_file = Path("data/scheduled_messages.json")
 
         self.scheduler = None
         self._scheduler_started = False
-
-        self._load_monitors()
+        self._scheduled_jobs: Dict[str, Dict] = {}
+        self._schedule_tasks: Set[asyncio.Task] = set()
+        self._forward_queues: Dict[tuple, asyncio.Queue] = {}
+        self._forward_tasks: Set[asyncio.Task] = set()
+        self._input_peers: Dict[tuple, object] = {}
+        self._smtp_pool: queue.Queue = queue.Queue(maxsize=SMTP_POOL_SIZE)
+        self._email_buffers: Dict[tuple, List[tuple]] = {}
+        self._email_tasks: Set[asyncio.Task] = set()
+        self._flush_now: Optional[asyncio.Event] = None
+        self._pending_snapshots: Dict[Path, str] = {}
+        self._snapshot_tasks: Dict[Path, asyncio.Task] = {}
+        self._deferred_accounts: Optional[Set[str]] = None
+
+        with self.batch_monitor_updates():
+            self._load_monitors()
         self._load_scheduled_messages()
 
     def _ensure_scheduler_started(self):
@@ -41,12 +82,19 @@ class MonitorEngine(metaclass=Singleton):
             try:
                 loop = asyncio.get_running_loop()
                 if not self.scheduler:
-                    self.scheduler = AsyncIOScheduler(timezone=pytz.timezone('Asia/Shanghai'))
+                    self.scheduler = AsyncIOScheduler(timezone=SCHEDULE_TIMEZONE)
 
                 if not self.scheduler.running:
                     self.scheduler.start()
                     self.logger.info("调度器已启动")
 
+                self.scheduler.add_job(
+                    self._reap_scheduled_messages,
+                    IntervalTrigger(seconds=SCHEDULE_REAPER_INTERVAL),
+                    id=SCHEDULE_REAPER_JOB_ID,
+                    replace_existing=True
+                )
+
                 self._scheduler_started = True
 
                 self._restore_scheduled_jobs()
@@ -55,47 +103,103 @@ class MonitorEngine(metaclass=Singleton):
                 self.logger.debug("事件循环尚未启动，调度器将延后启动")
 
     def _restore_scheduled_jobs(self):
-        if not self.scheduler or not self.scheduler.running:
-            return
-
         restored_count = 0
-        for message in self.scheduled_messages:
-            job_id = message.get('job_id')
-            cron_expr = message.get('cron', message.get('schedule'))
-            active = message.get('active', True)
-            schedule_mode = message.get('schedule_mode', 'cron')
-
-            if job_id and cron_expr and active:
-                try:
-                    if schedule_mode == 'interval':
-                        parts = cron_expr.split()
-                        hours = int(parts[0]) if len(parts) > 0 else 0
-                        minutes = int(parts[1]) if len(parts) > 1 else 0
-
-                        trigger = IntervalTrigger(
-                            hours=hours,
-                            minutes=minutes,
-                            timezone=pytz.timezone('Asia/Shanghai')
-                        )
-                        self.logger.debug(f"恢复间隔任务 {job_id}: {hours}小时 {minutes}分钟")
-                    else:
-                        trigger = CronTrigger.from_crontab(cron_expr, timezone=pytz.timezone('Asia/Shanghai'))
-                        self.logger.debug(f"恢复Cron任务 {job_id}: {cron_expr}")
-
-                    self.scheduler.add_job(
-                        self._execute_scheduled_message,
-                        trigger,
-                        id=job_id,
-                        args=[job_id],
-                        replace_existing=True
-                    )
-                    restored_count += 1
-                except Exception as scheduler_error:
-                    self.logger.error(f"恢复调度任务失败 {job_id}: {scheduler_error}")
+        for message in self.scheduled_messages.values():
+            if message.get('active', True) and self._schedule_job(message):
+                restored_count += 1
 
         if restored_count > 0:
             self.logger.info(f"恢复 {restored_count} 个调度任务")
 
+    def _build_schedule_trigger(self, cron_expr: str, schedule_mode: str):
+        if schedule_mode == 'interval':
+            parts = cron_expr.split()
+            hours = int(parts[0]) if len(parts) > 0 else 0
+            minutes = int(parts[1]) if len(parts) > 1 else 0
+
+            return IntervalTrigger(
+                hours=hours,
+                minutes=minutes,
+                timezone=SCHEDULE_TIMEZONE
+            )
+
+        return get_cron_trigger(cron_expr)
+
+    def _schedule_job(self, message_config: Dict) -> bool:
+        job_id = message_config.get('job_id')
+        cron_expr = message_config.get('cron', message_config.get('schedule'))
+        schedule_mode = message_config.get('schedule_mode', 'cron')
+
+        if not job_id or not cron_expr:
+            return False
+
+        try:
+            trigger = self._build_schedule_trigger(cron_expr, schedule_mode)
+        except Exception as trigger_error:
+            self.logger.error(f"创建调度触发器失败 {job_id}: {trigger_error}")
+            return False
+
+        now = datetime.now(SCHEDULE_TIMEZONE)
+        fire_time = trigger.get_next_fire_time(None, now)
+        random_delay = message_config.get('random_delay', message_config.get('random_offset', 0)) or 0
+
+        self._scheduled_jobs[job_id] = {
+            'trigger': trigger,
+            'random_delay': random_delay,
+            'fire_time': fire_time,
+            'next_run': self._apply_random_delay(fire_time, random_delay)
+        }
+        self.logger.debug(f"登记调度任务 {job_id}: {schedule_mode} {cron_expr}")
+        return True
+
+    def _unschedule_job(self, job_id: str) -> bool:
+        return self._scheduled_jobs.pop(job_id, None) is not None
+
+    def reschedule_message(self, message_config: Dict) -> bool:
+        self._ensure_scheduler_started()
+        self._unschedule_job(message_config.get('job_id'))
+
+        if not message_config.get('active', True):
+            return False
+
+        return self._schedule_job(message_config)
+
+    def _apply_random_delay(self, fire_time: Optional[datetime], random_delay: int) -> Optional[datetime]:
+        if fire_time is None or random_delay <= 0:
+            return fire_time
+
+        import random  # NOSONAR - 用于模拟人类发送延迟，不需要密码学安全性
+        actual_delay = random.randint(0, random_delay)  # NOSONAR
+        self.logger.debug("⏰ 定时消息延时发送: %s 秒 (最大延时: %s 秒)", actual_delay, random_delay)
+        return fire_time + timedelta(seconds=actual_delay)
+
+    async def _reap_scheduled_messages(self):
+        now = datetime.now(SCHEDULE_TIMEZONE)
+        due_job_ids = []
+
+        for job_id, job in self._scheduled_jobs.items():
+            next_run = job['next_run']
+            if next_run is None or next_run > now:
+                continue
+
+            due_job_ids.append(job_id)
+            fire_time = job['fire_time']
+            while fire_time is not None and fire_time <= now:
+                fire_time = job['trigger'].get_next_fire_time(fire_time, now)
+            job['fire_time'] = fire_time
+            job['next_run'] = self._apply_random_delay(fire_time, job['random_delay'])
+
+        if due_job_ids:
+            task = asyncio.create_task(self._dispatch_scheduled_messages(due_job_ids))
+            self._schedule_tasks.add(task)
+            task.add_done_callback(self._schedule_tasks.discard)
+
+    async def _dispatch_scheduled_messages(self, job_ids: List[str]):
+        await asyncio.gather(
+            *(self._execute_scheduled_message(job_id) for job_id in job_ids),
+            return_exceptions=True
+        )
+
     def _load_monitors(self):
         old_config_file = Path("data/monitor.config")
         if old_config_file.exists():
@@ -209,7 +313,8 @@ class MonitorEngine(metaclass=Singleton):
                                 max_executions=config_data.get('max_executions'),
                                 priority=config_data.get('priority', 50),
                                 execution_mode=config_data.get('execution_mode', 'merge'),
-                                log_file=config_data.get('log_file')
+                                log_file=config_data.get('log_file'),
+                                enable_response_cache=config_data.get('enable_response_cache', True)
                             )
                             monitor = monitor_factory.create_monitor(config)
                             if monitor:
@@ -256,10 +361,33 @@ class MonitorEngine(metaclass=Singleton):
         except Exception as e:
             self.logger.error(f"加载监控器文件失败: {e}")
 
-    def _save_monitors(self):
+    def _write_snapshot(self, path: Path, data):
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+
         try:
-            self.monitors_file.parent.mkdir(parents=True, exist_ok=True)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _write_text_atomic(path, text)
+            return
+
+        self._pending_snapshots[path] = text
+        if path not in self._snapshot_tasks:
+            self._snapshot_tasks[path] = loop.create_task(self._flush_snapshot(path))
+
+    async def _flush_snapshot(self, path: Path):
+        while True:
+            text = self._pending_snapshots.pop(path, None)
+            if text is None:
+                self._snapshot_tasks.pop(path, None)
+                return
+
+            try:
+                await asyncio.to_thread(_write_text_atomic, path, text)
+            except Exception as e:
+                self.logger.error(f"写入配置文件 {path} 失败: {e}")
 
+    def _save_monitors(self):
+        try:
             monitors_data = {}
             for account_id, monitors in self.monitors.items():
                 monitors_data[account_id] = []
@@ -281,8 +409,7 @@ class MonitorEngine(metaclass=Singleton):
 
                         monitors_data[account_id].append(monitor_data)
 
-            with open(self.monitors_file, 'w', encoding='utf-8') as f:
-                json.dump(monitors_data, f, indent=2, ensure_ascii=False)
+            self._write_snapshot(self.monitors_file, monitors_data)
 
             self.logger.info(f"已保存监控器配置")
 
@@ -314,28 +441,44 @@ class MonitorEngine(metaclass=Singleton):
         except Exception as e:
             self.logger.error(f"启动监控引擎失败: {e}")
 
+    def _flush_now_event(self) -> asyncio.Event:
+        if self._flush_now is None:
+            self._flush_now = asyncio.Event()
+        return self._flush_now
+
+    async def shutdown(self):
+        self._flush_now_event().set()
+
+        pending = [*self._forward_tasks, *self._email_tasks, *self._snapshot_tasks.values()]
+        if pending:
+            self.logger.info("正在处理 %s 项待发送的转发、邮件通知和配置写入", len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
+
     def add_monitor(self, account_id: str, monitor: BaseMonitor, monitor_key: str = None):
-        if account_id not in self.monitors:
-            self.monitors[account_id] = []
+        monitors = self.monitors.setdefault(account_id, [])
 
         if monitor_key:
             self.remove_monitor(account_id, monitor_key)
 
-        self.monitors[account_id].append(monitor)
+        monitors.append(monitor)
+        self._monitors_changed(account_id)
+        self._prefetch_input_peers(account_id, monitor)
 
-        self._save_monitors()
+        if self._deferred_accounts is None:
+            self._save_monitors()
 
         self.logger.info(f"为账号 {account_id} 添加监控器: {monitor.__class__.__name__}")
 
     def remove_monitor(self, account_id: str, monitor_key: str = None, monitor_type: type = None) -> bool:
-        if account_id not in self.monitors:
+        monitors = self.monitors.get(account_id)
+        if monitors is None:
             return False
 
-        monitors = self.monitors[account_id]
         original_count = len(monitors)
 
         if monitor_type:
             monitors[:] = [m for m in monitors if not isinstance(m, monitor_type)]
+            self._monitors_changed(account_id)
             return len(monitors) < original_count
 
         if monitor_key:
@@ -346,6 +489,7 @@ class MonitorEngine(metaclass=Singleton):
                         index = int(parts[-1])
                         if 0 <= index < len(monitors):
                             monitors.pop(index)
+                            self._monitors_changed(account_id)
                             self.logger.info(f"移除监控器: {monitor_key}")
                             return True
 
@@ -353,6 +497,7 @@ class MonitorEngine(metaclass=Singleton):
                 for i, monitor in enumerate(monitors):
                     if monitor.__class__.__name__ == monitor_type_name:
                         monitors.pop(i)
+                        self._monitors_changed(account_id)
                         self.logger.info(f"移除监控器: {monitor_key}")
                         return True
 
@@ -364,9 +509,113 @@ class MonitorEngine(metaclass=Singleton):
     def get_monitors(self, account_id: str) -> List[BaseMonitor]:
         return self.monitors.get(account_id, [])
 
+    @contextmanager
+    def batch_monitor_updates(self):
+        if self._deferred_accounts is not None:
+            yield
+            return
+
+        self._deferred_accounts = set()
+        try:
+            yield
+        finally:
+            accounts, self._deferred_accounts = self._deferred_accounts, None
+            for account_id in accounts:
+                self._rebuild_monitor_indexes(account_id)
+            if accounts:
+                self._save_monitors()
+
+    def _monitors_changed(self, account_id: str):
+        if self._deferred_accounts is not None:
+            self._deferred_accounts.add(account_id)
+        else:
+            self._rebuild_monitor_indexes(account_id)
+
+    def _rebuild_monitor_indexes(self, account_id: str):
+        monitors = self.monitors.get(account_id, [])
+
+        entries = []
+        keywords = []
+        button_keywords = []
+        file_extensions = set()
+        for i, monitor in enumerate(monitors):
+            config = monitor.config
+            partial_keyword = None
+            exact_keyword = None
+            button_keyword = None
+            file_extension = None
+            if isinstance(monitor, KeywordMonitor) and monitor.keyword_config.match_type == MatchType.PARTIAL:
+                partial_keyword = monitor.folded_keyword
+                keywords.append(partial_keyword)
+            elif isinstance(monitor, KeywordMonitor) and monitor.keyword_config.match_type == MatchType.EXACT:
+                exact_keyword = monitor.folded_keyword
+            elif (isinstance(monitor, ButtonMonitor) and monitor.button_config.mode is MonitorMode.MANUAL
+                    and monitor.button_keyword_lower):
+                button_keyword = monitor.button_keyword_lower
+                button_keywords.append(button_keyword)
+            elif isinstance(monitor, FileMonitor):
+                file_extension = monitor.file_config.file_extension
+                file_extensions.add(file_extension)
+
+            dispatch = (
+                getattr(config, 'priority', 50),
+                f"{monitor.__class__.__name__}_{i}",
+                monitor,
+                getattr(config, 'execution_mode', 'merge')
+            )
+            entries.append((dispatch, partial_keyword, exact_keyword, button_keyword, file_extension))
+
+        entries.sort(key=lambda entry: entry[0][0])
+        self._monitor_entries[account_id] = entries
+
+        if keywords:
+            self._keyword_matchers[account_id] = KeywordMatcher(keywords)
+        else:
+            self._keyword_matchers.pop(account_id, None)
+
+        if button_keywords:
+            self._button_matchers[account_id] = KeywordMatcher(button_keywords)
+        else:
+            self._button_matchers.pop(account_id, None)
+
+        if file_extensions:
+            self._file_extensions[account_id] = file_extensions
+        else:
+            self._file_extensions.pop(account_id, None)
+
+        bound: Dict[int, List[int]] = {}
+        unbound: List[int] = []
+        for position, (dispatch, *_) in enumerate(entries):
+            chats = dispatch[2].config.chats
+            if chats:
+                for chat_id in set(chats):
+                    bound.setdefault(chat_id, []).append(position)
+            else:
+                unbound.append(position)
+        self._chat_indexes[account_id] = (bound, unbound)
+
+        registered = self._event_handlers.get(account_id)
+        if registered is not None:
+            self._register_event_handler(registered[0])
+
+    def _is_chat_watched(self, account_id: str, chat_id: int) -> bool:
+        chat_index = self._chat_indexes.get(account_id)
+        if chat_index is None:
+            return False
+
+        bound, unbound = chat_index
+        return bool(unbound) or chat_id in bound
+
     def clear_monitors(self, account_id: str):
-        if account_id in self.monitors:
-            del self.monitors[account_id]
+        if self.monitors.pop(account_id, None) is not None:
+            self._keyword_matchers.pop(account_id, None)
+            self._button_matchers.pop(account_id, None)
+            self._file_extensions.pop(account_id, None)
+            self._chat_indexes.pop(account_id, None)
+            self._monitor_entries.pop(account_id, None)
+            registered = self._event_handlers.get(account_id)
+            if registered is not None:
+                self._register_event_handler(registered[0])
             self._save_monitors()
             self.logger.info(f"已清除账号 {account_id} 的所有监控器并保存配置")
 
@@ -374,17 +623,46 @@ class MonitorEngine(metaclass=Singleton):
         self.clear_monitors(account_id)
 
     async def process_message(self, message_event: MessageEvent, account: Account):
-        if not self.monitors.get(account.account_id):
+        entries = self._monitor_entries.get(account.account_id)
+        if not entries:
             return
 
-        monitors_list = []
-        for i, monitor in enumerate(self.monitors[account.account_id]):
-            monitor_key = f"{monitor.__class__.__name__}_{i}"
-            priority = getattr(monitor.config, 'priority', 50)
-            execution_mode = getattr(monitor.config, 'execution_mode', 'merge')
-            monitors_list.append((priority, monitor_key, monitor, execution_mode))
+        bound, unbound = self._chat_indexes[account.account_id]
+        chat_bound = bound.get(message_event.message.chat_id)
+        positions = sorted(unbound + chat_bound) if chat_bound else unbound
+        if not positions:
+            return
+
+        matched_keywords = None
+        keyword_matcher = self._keyword_matchers.get(account.account_id)
+        if keyword_matcher:
+            matched_keywords = keyword_matcher.find_all(message_event.message.text_folded)
+            message_event.matched_keywords = matched_keywords
+
+        matched_button_keywords = None
+        button_matcher = self._button_matchers.get(account.account_id)
+        if button_matcher:
+            matched_button_keywords = button_matcher.find_all(message_event.message.button_texts_joined)
+
+        message_extension = None
+        if account.account_id in self._file_extensions:
+            media = message_event.message.media
+            message_extension = media.resolved_extension if media and media.has_media else ''
 
-        monitors_list.sort(key=lambda x: x[0])
+        monitors_list = []
+        for position in positions:
+            dispatch, partial_keyword, exact_keyword, button_keyword, file_extension = entries[position]
+            if (matched_keywords is not None and partial_keyword is not None
+                    and partial_keyword not in matched_keywords):
+                continue
+            if exact_keyword is not None and exact_keyword != message_event.message.text_folded:
+                continue
+            if (matched_button_keywords is not None and button_keyword is not None
+                    and button_keyword not in matched_button_keywords):
+                continue
+            if file_extension is not None and file_extension != message_extension:
+                continue
+            monitors_list.append(dispatch)
 
         await self._process_monitors_with_individual_modes(message_event, account, monitors_list)
 
@@ -558,12 +836,12 @@ class MonitorEngine(metaclass=Singleton):
                     message_event, account, matched_monitors
                 )
 
-                asyncio.create_task(self._send_email_notification_async(
+                self._enqueue_email(
                     subject=f"TG监控系统 - 检测到 {len(matched_monitors)} 个匹配",
                     content=email_content,
                     email_addresses=actions.get('email_addresses', []),
                     monitor_count=len(matched_monitors)
-                ))
+                )
 
             if actions['forward_targets']:
                 target_ids = [tid for tid in actions['forward_targets'] if tid != message.chat_id]
@@ -577,15 +855,10 @@ class MonitorEngine(metaclass=Singleton):
                             account=account,
                             target_ids=target_ids
                         )
-                        self.logger.info(f"增强转发消息到 {len(target_ids)} 个目标（去重后）")
+                        self.logger.info("增强转发消息到 %s 个目标（去重后）", len(target_ids))
                     else:
-                        client = account.client
                         for target_id in target_ids:
-                            try:
-                                await client.forward_messages(target_id, [message.message_id], message.chat_id)
-                                self.logger.info(f"转发消息到: {target_id}")
-                            except Exception as e:
-                                self.logger.error(f"转发消息到 {target_id} 失败: {e}")
+                            await self._enqueue_forward(account, target_id, message.chat_id, message.message_id)
 
             for log_file in actions['log_files']:
                 try:
@@ -651,7 +924,7 @@ class MonitorEngine(metaclass=Singleton):
                     monitor_type = monitor.__class__.__name__.replace('Monitor', '')
 
                     if hasattr(monitor, '_get_monitor_type_info'):
-                        type_info = await monitor._get_monitor_type_info()
+                        type_info = monitor._get_monitor_type_info()
                     else:
                         type_info = ""
 
@@ -701,6 +974,116 @@ class MonitorEngine(metaclass=Singleton):
         except Exception as e:
             self.logger.error(f"执行合并动作时出错: {e}")
 
+    async def _enqueue_forward(self, account: Account, target_id: int, chat_id: int, message_id: int):
+        key = (account.account_id, target_id, chat_id)
+        queue = self._forward_queues.get(key)
+
+        if queue is None:
+            queue = asyncio.Queue(maxsize=FORWARD_QUEUE_MAXSIZE)
+            self._forward_queues[key] = queue
+            task = asyncio.create_task(self._flush_forward_queue(key, account, queue))
+            self._forward_tasks.add(task)
+            task.add_done_callback(self._forward_tasks.discard)
+
+        await queue.put(message_id)
+
+    async def _flush_forward_queue(self, key: tuple, account: Account, queue: asyncio.Queue):
+        _, target_id, chat_id = key
+
+        while True:
+            message_ids = [await queue.get()]
+            flush_now = self._flush_now_event()
+            try:
+                while len(message_ids) < FORWARD_BATCH_SIZE:
+                    if flush_now.is_set():
+                        message_ids.append(queue.get_nowait())
+                    else:
+                        message_ids.append(await asyncio.wait_for(queue.get(), timeout=FORWARD_BATCH_WINDOW))
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                pass
+
+            client = account.client
+            if client is None:
+                self.logger.warning("账号 %s 未连接，丢弃 %s 条待转发消息", account.account_id, len(message_ids))
+            else:
+                try:
+                    target_peer = await self._get_input_peer(account, target_id)
+                    await client.forward_messages(target_peer, message_ids, chat_id)
+                    self.logger.info("转发 %s 条消息到: %s", len(message_ids), target_id)
+                except Exception as e:
+                    self.logger.error("转发消息到 %s 失败: %s", target_id, e)
+
+            if queue.empty():
+                self._forward_queues.pop(key, None)
+                return
+
+    def _enqueue_email(self, subject: str, content: str, email_addresses: list, monitor_count: int):
+        key = tuple(email_addresses or ())
+        buffer = self._email_buffers.get(key)
+
+        if buffer is None:
+            buffer = []
+            self._email_buffers[key] = buffer
+            task = asyncio.create_task(self._flush_email_buffer(key))
+            self._email_tasks.add(task)
+            task.add_done_callback(self._email_tasks.discard)
+
+        buffer.append((subject, content, monitor_count))
+
+    async def _flush_email_buffer(self, key: tuple):
+        try:
+            await asyncio.wait_for(self._flush_now_event().wait(), EMAIL_BATCH_WINDOW)
+        except asyncio.TimeoutError:
+            pass
+        batch = self._email_buffers.pop(key, [])
+        if not batch:
+            return
+
+        if len(batch) == 1:
+            subject, content, monitor_count = batch[0]
+        else:
+            subject = f"TG监控系统 - {len(batch)} 条匹配通知汇总"
+            content = "\n\n---\n\n".join(item[1] for item in batch)
+            monitor_count = sum(item[2] for item in batch)
+
+        await self._send_email_notification_async(subject, content, list(key), monitor_count)
+
+    async def _get_input_peer(self, account: Account, peer_id: int):
+        key = (account.account_id, peer_id)
+        input_peer = self._input_peers.get(key)
+
+        if input_peer is None:
+            input_peer = await account.client.get_input_entity(peer_id)
+            self._input_peers[key] = input_peer
+
+        return input_peer
+
+    def _prefetch_input_peers(self, account_id: str, monitor: BaseMonitor):
+        config = monitor.config
+        if not config.auto_forward or not config.forward_targets:
+            return
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        from core.account_manager import AccountManager
+        account = AccountManager().get_account(account_id)
+        if not account or not account.is_connected():
+            return
+
+        async def prefetch():
+            for target_id in config.forward_targets:
+                try:
+                    await self._get_input_peer(account, target_id)
+                except Exception as e:
+                    self.logger.warning(f"解析转发目标 {target_id} 失败: {e}")
+
+        task = asyncio.create_task(prefetch())
+        self._forward_tasks.add(task)
+        task.add_done_callback(self._forward_tasks.discard)
+
     async def _build_enhanced_email_content(self, message_event: MessageEvent, account: Account,
                                             matched_monitors: list) -> str:
         """
@@ -718,8 +1101,9 @@ class MonitorEngine(metaclass=Singleton):
 
         chat_info = "未知聊天"
         try:
-            if hasattr(account, 'client') and account.client:
-                entity = await account.client.get_entity(message.chat_id)
+            client = account.client
+            if client is not None:
+                entity = await client.get_entity(message.chat_id)
                 if hasattr(entity, 'title'):
                     chat_info = f"{entity.title} (ID: {message.chat_id})"
                 elif hasattr(entity, 'username'):
@@ -815,7 +1199,7 @@ class MonitorEngine(metaclass=Singleton):
 
     async def process_message_event(self, event: events.NewMessage, account: Account):
         try:
-            if not account.monitor_active:
+            if not account.monitor_active or not self._is_chat_watched(account.account_id, event.chat_id):
                 return
 
             sender = await event.get_sender()
@@ -826,15 +1210,9 @@ class MonitorEngine(metaclass=Singleton):
 
             telegram_message = TelegramMessage.from_telethon_event(event, message_sender)
 
-            if event.message.media:
-                self.logger.debug(f"消息包含媒体: {type(event.message.media).__name__}")
-                if hasattr(event.message.media, 'document') and event.message.media.document:
-                    self.logger.debug(f"消息包含文档")
-                    if hasattr(event.message.media.document, 'attributes'):
-                        for attr in event.message.media.document.attributes:
-                            if hasattr(attr, 'file_name'):
-                                self.logger.debug(f"文件名: {attr.file_name}")
-                                break
+            media = telegram_message.media
+            if media is not None and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"消息包含媒体: {type(event.message.media).__name__}, 文件名: {media.file_name}")
 
             message_event = MessageEvent(
                 account_id=account.account_id,
@@ -895,13 +1273,32 @@ class MonitorEngine(metaclass=Singleton):
         if not account.client:
             return
 
-        account.client.add_event_handler(
-            lambda event: self.process_message_event(event, account),
-            events.NewMessage()
-        )
+        self._register_event_handler(account)
 
         self.logger.info(f"为账号 {account.account_id} 设置事件处理器")
 
+    def _watched_chats(self, account_id: str) -> Optional[List[int]]:
+        chat_index = self._chat_indexes.get(account_id)
+        if chat_index is None:
+            return None
+
+        bound, unbound = chat_index
+        return list(bound) if bound and not unbound else None
+
+    def _register_event_handler(self, account: Account):
+        previous = self._event_handlers.pop(account.account_id, None)
+        if previous is not None:
+            _, previous_client, previous_handler = previous
+            previous_client.remove_event_handler(previous_handler)
+
+        client = account.client
+        if client is None:
+            return
+
+        handler = lambda event: self.process_message_event(event, account)
+        client.add_event_handler(handler, events.NewMessage(chats=self._watched_chats(account.account_id)))
+        self._event_handlers[account.account_id] = (account, client, handler)
+
     def get_statistics(self) -> Dict[str, int]:
         return {
             "total_accounts": len(self.monitors),
@@ -909,7 +1306,24 @@ class MonitorEngine(metaclass=Singleton):
             "processed_messages": len(self.processed_messages)
         }
 
-    def add_scheduled_message(self, config):
+    def add_scheduled_message(self, config) -> bool:
+        schedule_mode = getattr(config, 'schedule_mode', 'cron')
+        try:
+            self._build_schedule_trigger(config.cron, schedule_mode)
+        except (ValueError, TypeError) as e:
+            self.logger.error(f"定时规则无效 {config.job_id}: {config.cron} ({e})")
+            return False
+
+        random_offset = getattr(config, 'random_offset', 0) or 0
+        try:
+            random_offset = int(random_offset)
+        except (ValueError, TypeError):
+            self.logger.error(f"随机延时无效 {config.job_id}: {random_offset}")
+            return False
+        if random_offset < 0:
+            self.logger.error(f"随机延时不能为负数 {config.job_id}: {random_offset}")
+            return False
+
         try:
             message_dict = {
                 'job_id': config.job_id,
@@ -919,8 +1333,8 @@ class MonitorEngine(metaclass=Singleton):
                 'cron': config.cron,
                 'schedule': config.cron,
                 'account_id': config.account_id,
-                'random_offset': getattr(config, 'random_offset', 0),
-                'random_delay': getattr(config, 'random_offset', 0),
+                'random_offset': random_offset,
+                'random_delay': random_offset,
                 'delete_after_sending': getattr(config, 'delete_after_sending', False),
                 'delete_after_send': getattr(config, 'delete_after_sending', False),
                 'max_executions': getattr(config, 'max_executions', None),
@@ -931,79 +1345,49 @@ class MonitorEngine(metaclass=Singleton):
                 'use_ai': getattr(config, 'use_ai', False),
                 'ai_prompt': getattr(config, 'ai_prompt', None),
                 'ai_model': getattr(config, 'ai_model', 'gpt-4o'),
-                'schedule_mode': getattr(config, 'schedule_mode', 'cron')
+                'schedule_mode': schedule_mode
             }
 
-            self.scheduled_messages.append(message_dict)
+            self.scheduled_messages[config.job_id] = message_dict
 
             self._save_scheduled_messages()
 
             self.logger.info(f"添加定时消息: {config.job_id}")
 
-            self._ensure_scheduler_started()
+            if self.reschedule_message(message_dict):
+                self.logger.info(f"已启动定时任务: {config.job_id}")
+            if not self._scheduler_started:
+                self.logger.warning(f"调度器未启动，定时消息任务将延后执行: {config.job_id}")
 
-            if self.scheduler and self.scheduler.running:
-                try:
-                    schedule_mode = getattr(config, 'schedule_mode', 'cron')
-                    if schedule_mode == 'interval':
-                        parts = config.cron.split()
-                        hours = int(parts[0]) if len(parts) > 0 else 0
-                        minutes = int(parts[1]) if len(parts) > 1 else 0
-
-                        trigger = IntervalTrigger(
-                            hours=hours,
-                            minutes=minutes,
-                            timezone=pytz.timezone('Asia/Shanghai')
-                        )
-                        self.logger.info(f"使用间隔触发器: {hours}小时 {minutes}分钟")
-                    else:
-                        trigger = CronTrigger.from_crontab(config.cron, timezone=pytz.timezone('Asia/Shanghai'))
-                        self.logger.info(f"使用Cron触发器: {config.cron}")
-
-                    self.scheduler.add_job(
-                        self._execute_scheduled_message,
-                        trigger,
-                        id=config.job_id,
-                        args=[config.job_id],
-                        replace_existing=True
-                    )
-                    self.logger.info(f"已启动定时任务: {config.job_id}")
-                except Exception as scheduler_error:
-                    self.logger.error(f"添加调度任务失败: {scheduler_error}")
-            else:
-                self.logger.warning(f"调度器未启动，定时消息任务将延后添加: {config.job_id}")
+            return True
 
         except Exception as e:
             self.logger.error(f"添加定时消息失败: {e}")
+            return False
+
+    def get_scheduled_messages(self) -> List[Dict]:
+        return list(self.scheduled_messages.values())
 
-    def get_scheduled_messages(self):
-        return self.scheduled_messages
+    def get_scheduled_message(self, job_id: str) -> Optional[Dict]:
+        return self.scheduled_messages.get(job_id)
 
     async def _execute_scheduled_message(self, job_id: str):
         try:
-            message_config = None
-            for msg in self.scheduled_messages:
-                if msg['job_id'] == job_id:
-                    message_config = msg
-                    break
-
+            message_config = self.scheduled_messages.get(job_id)
             if not message_config:
-                self.logger.error(f"未找到定时消息配置: {job_id}")
+                self.logger.error("未找到定时消息配置: %s", job_id)
                 return
 
             if not message_config.get('active', True):
-                self.logger.debug(f"定时消息已暂停，跳过执行: {job_id}")
+                self.logger.debug("定时消息已暂停，跳过执行: %s", job_id)
                 return
 
             max_executions = message_config.get('max_executions')
             execution_count = message_config.get('execution_count', 0)
 
             if max_executions and execution_count >= max_executions:
-                self.logger.info(f"定时消息达到执行次数限制，停止执行: {job_id}")
-                try:
-                    self.scheduler.remove_job(job_id)
-                except:
-                    pass
+                self.logger.info("定时消息达到执行次数限制，停止执行: %s", job_id)
+                self._unschedule_job(job_id)
                 return
 
             account_id = message_config.get('account_id')
@@ -1011,7 +1395,7 @@ class MonitorEngine(metaclass=Singleton):
             message_text = message_config.get('message', '')
 
             if not account_id or not target_id:
-                self.logger.error(f"定时消息配置不完整: account_id={account_id}, target_id={target_id}")
+                self.logger.error("定时消息配置不完整: account_id=%s, target_id=%s", account_id, target_id)
                 return
 
             from core.account_manager import AccountManager
@@ -1019,7 +1403,7 @@ class MonitorEngine(metaclass=Singleton):
             account = account_manager.get_account(account_id)
 
             if not account or not account.client:
-                self.logger.error(f"账号未找到或未连接: {account_id}")
+                self.logger.error("账号未找到或未连接: %s", account_id)
                 return
 
             if message_config.get('use_ai', False) and message_config.get('ai_prompt'):
@@ -1028,7 +1412,7 @@ class MonitorEngine(metaclass=Singleton):
                     ai_service = AIService()
 
                     if ai_service.is_configured():
-                        self.logger.info(f"🤖 开始AI内容生成: {job_id}")
+                        self.logger.info("🤖 开始AI内容生成: %s", job_id)
 
                         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                         enhanced_prompt = f"""
@@ -1053,50 +1437,44 @@ class MonitorEngine(metaclass=Singleton):
 
                         if ai_response and ai_response.strip():
                             message_text = ai_response.strip()
-                            self.logger.info(
-                                f"✅ AI内容生成成功: \"{message_text[:50]}{'...' if len(message_text) > 50 else ''}\"")
+                            self.logger.info("✅ AI内容生成成功: \"%.50s%s\"",
+                                             message_text, '...' if len(message_text) > 50 else '')
                         else:
-                            self.logger.warning(f"⚠️ AI返回空内容，跳过此次执行")
+                            self.logger.warning("⚠️ AI返回空内容，跳过此次执行")
                             return
                     else:
-                        self.logger.error(f"❌ AI服务未配置，跳过此次执行")
+                        self.logger.error("❌ AI服务未配置，跳过此次执行")
                         return
 
                 except Exception as ai_error:
-                    self.logger.error(f"❌ AI生成内容失败: {ai_error}")
+                    self.logger.error("❌ AI生成内容失败: %s", ai_error)
                     return
 
             if not message_text or not message_text.strip():
-                self.logger.error(f"❌ 消息内容为空，跳过发送: {job_id}")
+                self.logger.error("❌ 消息内容为空，跳过发送: %s", job_id)
                 return
 
             random_delay = message_config.get('random_delay', message_config.get('random_offset', 0))
-            if random_delay > 0:
-                import random  # NOSONAR - 用于模拟人类发送延迟，不需要密码学安全性
-                actual_delay = random.randint(0, random_delay)  # NOSONAR
-                self.logger.info(f"⏰ 定时消息延时发送: {actual_delay} 秒 (最大延时: {random_delay} 秒)")
-                await asyncio.sleep(actual_delay)
 
             try:
                 if isinstance(target_id, str):
                     target_id = int(target_id)
 
                 try:
-                    entity = await account.client.get_entity(target_id)
-                    self.logger.debug(
-                        f"✅ 目标实体验证成功: {target_id} -> {getattr(entity, 'title', getattr(entity, 'username', target_id))}")
+                    target_peer = await self._get_input_peer(account, target_id)
+                    self.logger.debug("✅ 目标实体验证成功: %s", target_id)
                 except Exception as entity_error:
-                    self.logger.error(f"❌ 无法找到目标实体 {target_id}: {entity_error}")
-                    self.logger.error(f"💡 解决方案：请检查目标ID是否正确，或账号是否有权限访问此频道/群组")
+                    self.logger.error("❌ 无法找到目标实体 %s: %s", target_id, entity_error)
+                    self.logger.error("💡 解决方案：请检查目标ID是否正确，或账号是否有权限访问此频道/群组")
                     return
 
-                await account.client.send_message(target_id, message_text)
+                await account.client.send_message(target_peer, message_text)
 
             except ValueError as ve:
-                self.logger.error(f"❌ 无效的目标ID格式: {target_id}, 错误: {ve}")
+                self.logger.error("❌ 无效的目标ID格式: %s, 错误: %s", target_id, ve)
                 return
             except Exception as send_error:
-                self.logger.error(f"❌ 发送消息失败到目标 {target_id}: {send_error}")
+                self.logger.error("❌ 发送消息失败到目标 %s: %s", target_id, send_error)
                 return
 
             old_count = execution_count
@@ -1104,56 +1482,44 @@ class MonitorEngine(metaclass=Singleton):
             new_count = message_config['execution_count']
             max_executions = message_config.get('max_executions')
 
-            self.logger.info(f"✅ 定时消息执行成功: {job_id} -> {target_id}")
-            self.logger.info(f"📊 执行统计更新: {old_count} → {new_count}/{max_executions or '无限制'} 次")
+            self.logger.info("✅ 定时消息执行成功: %s -> %s", job_id, target_id)
+            self.logger.info("📊 执行统计更新: %s → %s/%s 次", old_count, new_count, max_executions or '无限制')
             if random_delay > 0:
-                self.logger.info(f"⏰ 延时设置: {random_delay} 秒")
+                self.logger.info("⏰ 延时设置: %s 秒", random_delay)
 
             self._save_scheduled_messages()
 
             if max_executions and message_config['execution_count'] >= max_executions:
                 try:
-                    if self.scheduler and self.scheduler.running:
-                        try:
-                            self.scheduler.pause_job(job_id)
-                            self.logger.info(f"⏸️ 定时消息任务已暂停: {job_id}")
-                        except Exception as pause_error:
-                            self.scheduler.remove_job(job_id)
-                            self.logger.warning(f"无法暂停任务，已移除: {job_id}")
+                    if self._unschedule_job(job_id):
+                        self.logger.info("⏸️ 定时消息任务已暂停: %s", job_id)
 
                     message_config['active'] = False
 
                     self._save_scheduled_messages()
-                    self.logger.info(f"🛑 定时消息已达到执行限制 ({max_executions} 次)，已暂停任务: {job_id}")
+                    self.logger.info("🛑 定时消息已达到执行限制 (%s 次)，已暂停任务: %s", max_executions, job_id)
                 except Exception as pause_error:
-                    self.logger.error(f"暂停达到限制的定时任务失败: {pause_error}")
+                    self.logger.error("暂停达到限制的定时任务失败: %s", pause_error)
             else:
-                self.logger.info(
-                    f"📈 定时消息继续运行，剩余执行次数: {max_executions - message_config['execution_count'] if max_executions else '无限制'}")
+                self.logger.info("📈 定时消息继续运行，剩余执行次数: %s",
+                                 max_executions - message_config['execution_count'] if max_executions else '无限制')
 
             if message_config.get('delete_after_send', False):
                 try:
                     pass
                 except Exception as delete_error:
-                    self.logger.error(f"删除消息失败: {delete_error}")
+                    self.logger.error("删除消息失败: %s", delete_error)
 
         except Exception as e:
-            self.logger.error(f"执行定时消息失败 {job_id}: {e}")
+            self.logger.error("执行定时消息失败 %s: %s", job_id, e)
 
     def remove_scheduled_message(self, job_id: str):
         try:
-            original_count = len(self.scheduled_messages)
-            self.scheduled_messages = [msg for msg in self.scheduled_messages if msg.get('job_id') != job_id]
-
-            if len(self.scheduled_messages) < original_count:
-                if self.scheduler and self.scheduler.running:
-                    try:
-                        self.scheduler.remove_job(job_id)
-                        self.logger.info(f"从调度器中移除任务: {job_id}")
-                    except Exception as scheduler_error:
-                        self.logger.warning(f"从调度器移除任务失败 {job_id}: {scheduler_error}")
+            if self.scheduled_messages.pop(job_id, None) is not None:
+                if self._unschedule_job(job_id):
+                    self.logger.info(f"从调度器中移除任务: {job_id}")
                 else:
-                    self.logger.debug(f"调度器未运行，跳过移除任务: {job_id}")
+                    self.logger.debug(f"调度任务未登记，跳过移除: {job_id}")
 
                 self._save_scheduled_messages()
                 self.logger.info(f"删除定时消息: {job_id}")
@@ -1169,10 +1535,7 @@ class MonitorEngine(metaclass=Singleton):
 
     def _save_scheduled_messages(self):
         try:
-            self.scheduled_messages_file.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(self.scheduled_messages_file, 'w', encoding='utf-8') as f:
-                json.dump(self.scheduled_messages, f, indent=2, ensure_ascii=False)
+            self._write_snapshot(self.scheduled_messages_file, list(self.scheduled_messages.values()))
 
             self.logger.info(f"已保存 {len(self.scheduled_messages)} 条定时消息")
 
@@ -1188,7 +1551,7 @@ class MonitorEngine(metaclass=Singleton):
             with open(self.scheduled_messages_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
-            self.scheduled_messages = data
+            self.scheduled_messages = {msg['job_id']: msg for msg in data if msg.get('job_id')}
             self.logger.info(f"已加载 {len(self.scheduled_messages)} 条定时消息")
 
         except Exception as e:
@@ -1214,7 +1577,6 @@ class MonitorEngine(metaclass=Singleton):
                 return
 
         try:
-            import smtplib
             from email.mime.text import MIMEText
             from email.mime.multipart import MIMEMultipart
             from email.header import Header
@@ -1250,13 +1612,10 @@ class MonitorEngine(metaclass=Singleton):
 
             msg.attach(MIMEText(content, 'plain', 'utf-8'))
 
-            server = smtplib.SMTP_SSL(smtp_host, int(smtp_port))
-            server.login(email_from, email_password)
-
-            for email in email_addresses:
-                server.sendmail(email_from, [email], msg.as_string())
-
-            server.quit()
+            settings = (smtp_host, smtp_port, email_from, email_password)
+            await asyncio.to_thread(
+                self._send_via_smtp_pool, settings, email_from, email_addresses, msg.as_string()
+            )
 
             self.logger.debug(f"邮件通知发送成功，接收者: {', '.join(email_addresses)}")
             self.logger.debug(f"使用配置: {smtp_host}:{smtp_port}, 发件人: {email_from}")
@@ -1266,6 +1625,60 @@ class MonitorEngine(metaclass=Singleton):
             self.logger.error(f"邮件配置：SMTP_HOST={smtp_host}, "
                               f"SMTP_PORT={smtp_port}, EMAIL_FROM={email_from}")
 
+    def _open_smtp_connection(self, settings: tuple) -> smtplib.SMTP_SSL:
+        smtp_host, smtp_port, email_from, email_password = settings
+        server = smtplib.SMTP_SSL(smtp_host, smtp_port)
+        try:
+            server.login(email_from, email_password)
+        except Exception:
+            self._close_smtp_connection(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close_smtp_connection(server: smtplib.SMTP_SSL):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _acquire_smtp_connection(self, settings: tuple) -> smtplib.SMTP_SSL:
+        while True:
+            try:
+                pooled_settings, server = self._smtp_pool.get_nowait()
+            except queue.Empty:
+                return self._open_smtp_connection(settings)
+
+            if pooled_settings == settings:
+                return server
+            self._close_smtp_connection(server)
+
+    def _release_smtp_connection(self, settings: tuple, server: smtplib.SMTP_SSL):
+        try:
+            self._smtp_pool.put_nowait((settings, server))
+        except queue.Full:
+            self._close_smtp_connection(server)
+
+    def _send_via_smtp_pool(self, settings: tuple, email_from: str, email_addresses: list, message: str):
+        server = self._acquire_smtp_connection(settings)
+        sent = 0
+        try:
+            try:
+                for email in email_addresses:
+                    server.sendmail(email_from, [email], message)
+                    sent += 1
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                self.logger.debug("SMTP连接已断开，重新建立连接后从第 %s 个收件人继续发送", sent + 1)
+                self._close_smtp_connection(server)
+                server = self._open_smtp_connection(settings)
+                for email in email_addresses[sent:]:
+                    server.sendmail(email_from, [email], message)
+        except Exception:
+            self._close_smtp_connection(server)
+            raise
+
+        self._release_smtp_connection(settings, server)
+
     def get_system_stats(self) -> dict:
         total_monitors = sum(len(monitors) for monitors in self.monitors.values())
         return {
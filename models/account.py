@@ -132,12 +132,8 @@ class Account:
         self.monitor_configs[config_type] = config_data
     
     def add_monitor_config(self, config_type: str, key: str, config: Dict[str, Any]):
-        if config_type not in self.monitor_configs:
-            self.monitor_configs[config_type] = {}
-        self.monitor_configs[config_type][key] = config
+        self.monitor_configs.setdefault(config_type, {})[key] = config
     
     def remove_monitor_config(self, config_type: str, key: str) -> bool:
-        if config_type in self.monitor_configs and key in self.monitor_configs[config_type]:
-            del self.monitor_configs[config_type][key]
-            return True
-        return False 
\ No newline at end of file
+        configs = self.monitor_configs.get(config_type)
+        return configs is not None and configs.pop(key, None) is not None 
\ No newline at end of file
@@ -34,6 +34,11 @@ class ExecutionMode(Enum):
     ALL = "all"
 
 
+def _normalize_ext(extension: str) -> str:
+    extension = extension.strip().lstrip('.').lower()
+    return '.' + extension if extension else ''
+
+
 @dataclass
 class BaseMonitorConfig:
     chats: List[int] = field(default_factory=list)
@@ -108,6 +113,9 @@ class FileConfig(BaseMonitorConfig):
     min_size: Optional[float] = None
     max_size: Optional[float] = None
     
+    def __post_init__(self):
+        self.file_extension = _normalize_ext(self.file_extension)
+    
     def is_size_valid(self, file_size_mb: float) -> bool:
         if self.min_size is not None and file_size_mb < self.min_size:
             return False
@@ -194,6 +202,7 @@ class AIMonitorConfig(BaseMonitorConfig):
     reply_mode: ReplyMode = ReplyMode.REPLY
     ai_reply_prompt: str = ""
     ai_response_content: Optional[str] = None
+    enable_response_cache: bool = True
     
     def __post_init__(self):
         if not self.ai_prompt:
@@ -217,25 +226,19 @@ class MonitorConfig:
         self.keyword_configs[keyword] = config
     
     def remove_keyword_config(self, keyword: str) -> bool:
-        if keyword in self.keyword_configs:
-            del self.keyword_configs[keyword]
-            return True
-        return False
+        return self.keyword_configs.pop(keyword, None) is not None
     
     def get_keyword_config(self, keyword: str) -> Optional[KeywordConfig]:
         return self.keyword_configs.get(keyword)
     
     def add_file_config(self, extension: str, config: FileConfig):
-        self.file_configs[extension] = config
+        self.file_configs[_normalize_ext(extension)] = config
     
     def remove_file_config(self, extension: str) -> bool:
-        if extension in self.file_configs:
-            del self.file_configs[extension]
-            return True
-        return False
+        return self.file_configs.pop(_normalize_ext(extension), None) is not None
     
     def get_file_config(self, extension: str) -> Optional[FileConfig]:
-        return self.file_configs.get(extension)
+        return self.file_configs.get(_normalize_ext(extension))
     
     def to_dict(self) -> Dict[str, Any]:
         pass
@@ -2,12 +2,35 @@
 消息相关数据模型
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Set
 from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime
 from telethon.tl.types import User, Channel, Chat
 from telethon import events
 
+BUTTON_TEXT_SEPARATOR = "\x1f"
+
+MIME_TO_EXTENSION = MappingProxyType({
+    'application/pdf': '.pdf',
+    'application/zip': '.zip',
+    'application/x-rar-compressed': '.rar',
+    'application/x-7z-compressed': '.7z',
+    'text/plain': '.txt',
+    'application/msword': '.doc',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'application/vnd.ms-excel': '.xls',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'video/mp4': '.mp4',
+    'audio/mpeg': '.mp3',
+    'audio/ogg': '.ogg',
+    'video/webm': '.webm'
+})
+
 
 @dataclass
 class MessageSender:
@@ -68,7 +91,18 @@ class MessageMedia:
     file_extension: Optional[str] = None
     mime_type: Optional[str] = None
     
-    @property
+    @cached_property
+    def resolved_extension(self) -> str:
+        if self.file_extension:
+            return self.file_extension
+        if self.file_name:
+            _, dot, extension = self.file_name.rpartition('.')
+            return '.' + extension.lower() if dot else ''
+        if self.media_type:
+            return MIME_TO_EXTENSION.get(self.mime_type, '')
+        return ''
+    
+    @cached_property
     def file_size_mb(self) -> Optional[float]:
         if self.file_size:
             return self.file_size / (1024 * 1024)
@@ -96,33 +130,36 @@ class TelegramMessage:
     forward_from_channel_id: Optional[int] = None
     reply_to_message_id: Optional[int] = None
     
-    @property
-    def text_lower(self) -> str:
-        return self.text.lower().strip()
+    @cached_property
+    def text_folded(self) -> str:
+        return self.text.casefold().strip()
     
-    @property
+    @cached_property
     def has_buttons(self) -> bool:
         return len(self.buttons) > 0
     
-    @property
+    @cached_property
     def button_texts(self) -> List[str]:
-        texts = []
-        for row in self.buttons:
-            for button in row:
-                texts.append(button.text.strip())
-        return texts
+        return [button.text.strip() for row in self.buttons for button in row]
+    
+    @cached_property
+    def button_texts_lower(self) -> List[str]:
+        return [button.text.lower() for row in self.buttons for button in row]
+    
+    @cached_property
+    def button_texts_joined(self) -> str:
+        return BUTTON_TEXT_SEPARATOR.join(self.button_texts_lower)
     
     def get_button_by_text(self, text: str, exact_match: bool = False) -> Optional[MessageButton]:
         search_text = text.lower()
-        for row in self.buttons:
-            for button in row:
-                button_text = button.text.lower()
-                if exact_match:
-                    if button_text == search_text:
-                        return button
-                else:
-                    if search_text in button_text:
-                        return button
+        buttons = (button for row in self.buttons for button in row)
+        for button, button_text in zip(buttons, self.button_texts_lower):
+            if exact_match:
+                if button_text == search_text:
+                    return button
+            else:
+                if search_text in button_text:
+                    return button
         return None
     
     @classmethod
@@ -140,8 +177,9 @@ class TelegramMessage:
                 for attr in doc.attributes:
                     if hasattr(attr, 'file_name'):
                         media.file_name = attr.file_name
-                        if '.' in attr.file_name:
-                            media.file_extension = '.' + attr.file_name.split('.')[-1].lower()
+                        _, dot, extension = attr.file_name.rpartition('.')
+                        if dot:
+                            media.file_extension = '.' + extension.lower()
                         break
                 
                 if media.mime_type:
@@ -198,6 +236,24 @@ class MessageEvent:
     message: TelegramMessage
     event_type: str = "new_message"
     processed: bool = False
+    matched_keywords: Optional[Set[str]] = None
+    _original_message: Optional[asyncio.Future] = field(default=None, init=False, repr=False, compare=False)
+    
+    async def get_original_message(self, client):
+        if self._original_message is None:
+            self._original_message = asyncio.ensure_future(
+                client.get_messages(self.message.chat_id, ids=self.message.message_id)
+            )
+        
+        fetch = self._original_message
+        try:
+            return await asyncio.shield(fetch)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if self._original_message is fetch:
+                self._original_message = None
+            raise
     
     @property
     def unique_id(self) -> str:
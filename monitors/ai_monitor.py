@@ -4,13 +4,51 @@ AI监控器
 """
 
 import re
-from typing import List
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
 
 from models import MessageEvent, Account
 from models.config import AIMonitorConfig
 from services import AIService
 from .base_monitor import BaseMonitor
 from utils.logger import get_logger
+from utils.keyword_matcher import KeywordMatcher
+
+AI_RESPONSE_CACHE_SIZE = 1024
+_CACHE_NORMALIZE_RE = re.compile(r'\W+')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+_LEADING_WORD_RE = re.compile(r'\s*([^\W_]+)[\W_]')
+VERDICT_WORDS = frozenset({'yes', 'no', '是', '否', 'true', 'false'})
+
+POSITIVE_KEYWORDS = ('yes', 'y', '是', '符合', '匹配', 'true', '1', 'match')
+NEGATIVE_KEYWORDS = ('no', 'n', '否', '不符合', '不匹配', 'false', '0', 'nomatch')
+
+SIMPLE_RESPONSES = frozenset({'yes', 'no', 'y', 'n', '是', '否', 'true', 'false', '1', '0'})
+REPLY_PREFIXES = ("yes,", "no,", "是,", "否,", "符合,", "不符合,", "匹配,", "不匹配,")
+
+_JUDGMENT_MATCHER = KeywordMatcher(POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS)
+_VERDICT_MATCHER = KeywordMatcher(VERDICT_WORDS)
+
+REPLY_FORMAT_INSTRUCTIONS = "\n".join([
+    "请按照以下格式回复:",
+    "判断: yes/no (是否符合监控条件)",
+    "回复: [如果符合条件，请生成一条合适的回复内容；如果不符合，请写'无']",
+    "",
+    "示例:",
+    "判断: yes",
+    "回复: 您好！我注意到您提到了相关内容。"
+])
+
+SIMPLE_FORMAT_INSTRUCTIONS = "\n".join([
+    "请仅回答 'yes' 或 'no'，表示是否符合监控条件。",
+    "如果符合条件回答 yes，不符合回答 no。"
+])
+
+
+def _has_leading_verdict(text: str) -> bool:
+    match = _LEADING_WORD_RE.match(text)
+    return match is not None and match.group(1).lower() in VERDICT_WORDS
 
 
 class AIMonitor(BaseMonitor):
@@ -20,6 +58,15 @@ class AIMonitor(BaseMonitor):
         self.ai_config = config
         self.ai_service = AIService()
         self.logger = get_logger(__name__)
+        self._system_prompt_key = None
+        self._system_message: dict = {}
+        self._prompt_preview_key = None
+        self._prompt_previews: Tuple[str, str, str] = ("", "", "")
+        self._response_cache: "OrderedDict[tuple, Tuple[bool, str]]" = OrderedDict()
+    
+    @classmethod
+    def from_kwargs(cls, **kwargs) -> 'AIMonitor':
+        return cls(AIMonitorConfig(**kwargs))
     
     async def _match_condition(self, message_event: MessageEvent, account: Account) -> bool:
         message = message_event.message
@@ -28,11 +75,26 @@ class AIMonitor(BaseMonitor):
             self.logger.error("AI服务未配置，无法进行AI监控")
             return False
         
-        ai_prompt = self._build_ai_prompt(message)
-        
-        ai_response = await self.ai_service.get_chat_completion([
-            {"role": "user", "content": ai_prompt}
-        ])
+        messages = self._build_messages(message)
+        
+        cache_key = None
+        if self.ai_config.enable_response_cache:
+            cache_key = (
+                messages[0]["content"],
+                _CACHE_NORMALIZE_RE.sub('', messages[1]["content"].casefold())
+            )
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                matched, self.ai_config.ai_response_content = cached
+                self.logger.debug(f"命中AI判断缓存: {'匹配' if matched else '不匹配'}")
+                return matched
+        
+        reply_mode = self.ai_config.reply_enabled and not self.ai_config.reply_texts
+        ai_response = await self.ai_service.get_chat_completion(
+            messages,
+            is_complete=None if reply_mode else _has_leading_verdict
+        )
         
         if not ai_response:
             self.logger.warning("AI服务返回空结果")
@@ -41,68 +103,91 @@ class AIMonitor(BaseMonitor):
         self.ai_config.ai_response_content = ai_response
         self.logger.debug(f"保存AI返回内容: {ai_response[:100]}...")
         
-        return self._parse_ai_response(ai_response)
+        matched = self._parse_ai_response(ai_response)
+        
+        if cache_key is not None:
+            self._response_cache[cache_key] = (matched, self.ai_config.ai_response_content)
+            if len(self._response_cache) > AI_RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        
+        return matched
+    
+    def _get_system_message(self) -> dict:
+        reply_mode = self.ai_config.reply_enabled and not self.ai_config.reply_texts
+        key = (self.ai_config.ai_prompt, reply_mode)
+        if key != self._system_prompt_key:
+            instructions = REPLY_FORMAT_INSTRUCTIONS if reply_mode else SIMPLE_FORMAT_INSTRUCTIONS
+            self._system_message = {
+                "role": "system",
+                "content": f"用户提示词: {self.ai_config.ai_prompt}\n\n请根据上述提示词判断用户发送的消息是否符合条件。\n\n{instructions}"
+            }
+            self._system_prompt_key = key
+        return self._system_message
     
-    def _build_ai_prompt(self, message) -> str:
-        prompt_parts = [
-            f"用户提示词: {self.ai_config.ai_prompt}",
-            "",
-            "请根据上述提示词判断以下消息是否符合条件:",
-            f"消息内容: {message.text}",
+    def _get_prompt_previews(self) -> Tuple[str, str, str]:
+        prompt = self.ai_config.ai_prompt
+        if prompt is not self._prompt_preview_key:
+            self._prompt_previews = (
+                prompt[:30] + "..." if len(prompt) > 30 else prompt,
+                prompt[:50],
+                prompt[:80] + "..." if len(prompt) > 80 else prompt
+            )
+            self._prompt_preview_key = prompt
+        return self._prompt_previews
+    
+    def _build_messages(self, message) -> List[dict]:
+        return [
+            self._get_system_message(),
+            {"role": "user", "content": self._build_message_content(message)}
         ]
+    
+    def _build_message_content(self, message) -> str:
+        content = f"消息内容: {message.text}"
         
-        if message.sender:
-            prompt_parts.append(f"发送者: {message.sender.full_name}")
-            if message.sender.username:
-                prompt_parts.append(f"用户名: @{message.sender.username}")
+        sender = message.sender
+        if sender:
+            content += f"\n发送者: {sender.full_name}"
+            if sender.username:
+                content += f"\n用户名: @{sender.username}"
         
-        if message.media and message.media.has_media:
-            prompt_parts.append(f"包含媒体: {message.media.media_type}")
-            if message.media.file_name:
-                prompt_parts.append(f"文件名: {message.media.file_name}")
+        media = message.media
+        if media and media.has_media:
+            content += f"\n包含媒体: {media.media_type}"
+            if media.file_name:
+                content += f"\n文件名: {media.file_name}"
         
-        if message.has_buttons:
-            button_texts = ", ".join(message.button_texts)
-            prompt_parts.append(f"包含按钮: {button_texts}")
+        if message.buttons:
+            content += f"\n包含按钮: {', '.join(message.button_texts)}"
         
         if message.is_forwarded:
-            prompt_parts.append("这是一条转发消息")
-        
-        if self.ai_config.reply_enabled and not self.ai_config.reply_texts:
-            prompt_parts.extend([
-                "",
-                "请按照以下格式回复:",
-                "判断: yes/no (是否符合监控条件)",
-                "回复: [如果符合条件，请生成一条合适的回复内容；如果不符合，请写'无']",
-                "",
-                "示例:",
-                "判断: yes",
-                "回复: 您好！我注意到您提到了相关内容。"
-            ])
-        else:
-            prompt_parts.extend([
-                "",
-                "请仅回答 'yes' 或 'no'，表示是否符合监控条件。",
-                "如果符合条件回答 yes，不符合回答 no。"
-            ])
-        
-        return "\n".join(prompt_parts)
+            content += "\n这是一条转发消息"
+        
+        return content
     
     def _parse_ai_response(self, ai_response: str) -> bool:
         if "判断:" in ai_response and "回复:" in ai_response:
-            lines = ai_response.strip().split('\n')
             judgment_result = None
             reply_content = None
+            reply_seen = False
             
-            for line in lines:
+            start = 0
+            while judgment_result is None or not reply_seen:
+                end = ai_response.find('\n', start)
+                line = ai_response[start:end] if end != -1 else ai_response[start:]
                 line = line.strip()
+                
                 if line.startswith("判断:"):
-                    judgment_part = line.replace("判断:", "").strip().lower()
+                    judgment_part = line[3:].strip().lower()
                     judgment_result = "yes" in judgment_part or "是" in judgment_part
                 elif line.startswith("回复:"):
-                    reply_part = line.replace("回复:", "").strip()
+                    reply_seen = True
+                    reply_part = line[3:].strip()
                     if reply_part and reply_part != "无":
                         reply_content = reply_part
+                
+                if end == -1:
+                    break
+                start = end + 1
             
             if reply_content:
                 self.ai_config.ai_response_content = reply_content
@@ -112,22 +197,18 @@ class AIMonitor(BaseMonitor):
                 self.logger.info(f"AI判断结果: {'匹配' if judgment_result else '不匹配'}")
                 return judgment_result
         
-        response = ai_response.lower().strip()
+        response = _PUNCTUATION_RE.sub('', ai_response.lower().strip())
+        found = _JUDGMENT_MATCHER.find_all(response)
         
-        response = re.sub(r'[^\w\s]', '', response)
+        keyword = next((k for k in POSITIVE_KEYWORDS if k in found), None)
+        if keyword is not None:
+            self.logger.info(f"AI判断结果: 匹配 (关键词: {keyword})")
+            return True
         
-        positive_keywords = ['yes', 'y', '是', '符合', '匹配', 'true', '1', 'match']
-        negative_keywords = ['no', 'n', '否', '不符合', '不匹配', 'false', '0', 'nomatch']
-        
-        for keyword in positive_keywords:
-            if keyword in response:
-                self.logger.info(f"AI判断结果: 匹配 (关键词: {keyword})")
-                return True
-        
-        for keyword in negative_keywords:
-            if keyword in response:
-                self.logger.info(f"AI判断结果: 不匹配 (关键词: {keyword})")
-                return False
+        keyword = next((k for k in NEGATIVE_KEYWORDS if k in found), None)
+        if keyword is not None:
+            self.logger.info(f"AI判断结果: 不匹配 (关键词: {keyword})")
+            return False
         
         self.logger.warning(f"AI回复不明确: {ai_response}，默认为不匹配")
         return False
@@ -140,7 +221,7 @@ class AIMonitor(BaseMonitor):
         self.logger.info(
             f"AI监控匹配: 聊天={message_event.message.chat_id}, "
             f"发送者={message_event.message.sender.full_name}, "
-            f"提示词='{self.ai_config.ai_prompt[:50]}...'"
+            f"提示词='{self._get_prompt_previews()[1]}...'"
         )
         
         return actions_taken
@@ -160,21 +241,17 @@ class AIMonitor(BaseMonitor):
         if not ai_response:
             return ""
         
-        if not any(keyword in ai_response.lower() for keyword in ['yes', 'no', '是', '否', 'true', 'false']):
+        if not _VERDICT_MATCHER.find_all(ai_response.lower()):
             return ai_response.strip()
         
         response = ai_response.strip()
+        response_lower = response.lower()
         
-        simple_responses = ['yes', 'no', 'y', 'n', '是', '否', 'true', 'false', '1', '0']
-        if response.lower().strip() in simple_responses:
+        if response_lower in SIMPLE_RESPONSES:
             return ""
         
-        prefixes_to_remove = [
-            "yes,", "no,", "是,", "否,", "符合,", "不符合,", "匹配,", "不匹配,"
-        ]
-        
-        for prefix in prefixes_to_remove:
-            if response.lower().startswith(prefix.lower()):
+        for prefix in REPLY_PREFIXES:
+            if response_lower.startswith(prefix):
                 response = response[len(prefix):].strip()
                 break
         
@@ -183,9 +260,9 @@ class AIMonitor(BaseMonitor):
         
         return response
 
-    async def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
+    def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
         log_parts.append(f"🤖 AI模型: {self.ai_config.ai_model}")
-        log_parts.append(f"🎨 提示词: \"{self.ai_config.ai_prompt[:80]}{'...' if len(self.ai_config.ai_prompt) > 80 else ''}\"")
+        log_parts.append(f"🎨 提示词: \"{self._get_prompt_previews()[2]}\"")
         log_parts.append(f"📊 置信度阈值: {self.ai_config.confidence_threshold}")
         
         if hasattr(self.ai_config, 'ai_response_content') and self.ai_config.ai_response_content:
@@ -204,8 +281,8 @@ class AIMonitor(BaseMonitor):
             if self.ai_config.reply_delay_max > 0:
                 log_parts.append(f"⏱️ 回复延时: {self.ai_config.reply_delay_min}-{self.ai_config.reply_delay_max}秒")
     
-    async def _get_monitor_type_info(self) -> str:
-        prompt_preview = self.ai_config.ai_prompt[:30] + "..." if len(self.ai_config.ai_prompt) > 30 else self.ai_config.ai_prompt
+    def _get_monitor_type_info(self) -> str:
+        prompt_preview = self._get_prompt_previews()[0]
         ai_response_preview = ""
         
         if hasattr(self.ai_config, 'ai_response_content') and self.ai_config.ai_response_content:
@@ -217,58 +294,58 @@ class AIMonitor(BaseMonitor):
 class AIMonitorBuilder:
     
     def __init__(self):
-        self.config = AIMonitorConfig()
+        self._kwargs: Dict[str, Any] = {}
     
     def with_prompt(self, prompt: str):
-        self.config.ai_prompt = prompt
+        self._kwargs['ai_prompt'] = prompt
         return self
     
     def with_chats(self, chat_ids: List[int]):
-        self.config.chats = chat_ids
+        self._kwargs['chats'] = chat_ids
         return self
     
     def with_email_notify(self, enabled: bool = True):
-        self.config.email_notify = enabled
+        self._kwargs['email_notify'] = enabled
         return self
     
     def with_auto_forward(self, enabled: bool = True, targets: List[int] = None):
-        self.config.auto_forward = enabled
+        self._kwargs['auto_forward'] = enabled
         if targets:
-            self.config.forward_targets = targets
+            self._kwargs['forward_targets'] = targets
         return self
     
     def with_enhanced_forward(self, enabled: bool = True, max_size_mb: float = None):
-        self.config.enhanced_forward = enabled
+        self._kwargs['enhanced_forward'] = enabled
         if max_size_mb:
-            self.config.max_download_size_mb = max_size_mb
+            self._kwargs['max_download_size_mb'] = max_size_mb
         return self
     
     def with_confidence_threshold(self, threshold: float):
-        self.config.confidence_threshold = threshold
+        self._kwargs['confidence_threshold'] = threshold
         return self
     
     def with_max_executions(self, max_executions: int):
-        self.config.max_executions = max_executions
+        self._kwargs['max_executions'] = max_executions
         return self
     
     def with_reply(self, enabled: bool = True, reply_texts: List[str] = None, 
                    reply_delay_min: float = 0, reply_delay_max: float = 0, 
                    reply_mode: str = 'reply'):
-        self.config.reply_enabled = enabled
+        self._kwargs['reply_enabled'] = enabled
         if reply_texts:
-            self.config.reply_texts = reply_texts
-        self.config.reply_delay_min = reply_delay_min
-        self.config.reply_delay_max = reply_delay_max
-        self.config.reply_mode = reply_mode
+            self._kwargs['reply_texts'] = reply_texts
+        self._kwargs['reply_delay_min'] = reply_delay_min
+        self._kwargs['reply_delay_max'] = reply_delay_max
+        self._kwargs['reply_mode'] = reply_mode
         return self
     
     def with_priority(self, priority: int):
-        self.config.priority = priority
+        self._kwargs['priority'] = priority
         return self
     
     def with_execution_mode(self, execution_mode: str):
-        self.config.execution_mode = execution_mode
+        self._kwargs['execution_mode'] = execution_mode
         return self
     
     def build(self) -> AIMonitor:
-        return AIMonitor(self.config) 
\ No newline at end of file
+        return AIMonitor.from_kwargs(**self._kwargs)
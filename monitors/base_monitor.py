@@ -3,9 +3,10 @@
 定义监控器的基本接口和通用逻辑
 """
 
+import sys
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Callable, Sequence
 from dataclasses import dataclass
 from enum import Enum
 
@@ -14,6 +15,20 @@ from models.config import BaseMonitorConfig
 from utils.logger import get_logger
 
 
+CHANNEL_ID_OFFSET = 1000000000000
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _lower_str(value: Any) -> str:
+    return str(value).lower()
+
+
+def _channel_sender_id(channel_id: int) -> Optional[int]:
+    if channel_id < 0 and str(channel_id).startswith("-100"):
+        return abs(channel_id) - CHANNEL_ID_OFFSET
+    return None
+
+
 class MonitorResult(Enum):
     NO_MATCH = "no_match"
     MATCHED = "matched"
@@ -22,62 +37,66 @@ class MonitorResult(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class MonitorAction:
     result: MonitorResult
-    actions_taken: List[str]
+    actions_taken: Sequence[str] = ()
     message: str = ""
     error: Optional[Exception] = None
 
 
+_NO_MATCH_PAUSED = MonitorAction(result=MonitorResult.NO_MATCH, message="监控器已暂停")
+_NO_MATCH_FILTERED = MonitorAction(result=MonitorResult.NO_MATCH, message="消息不符合处理条件")
+_NO_MATCH_CONDITION = MonitorAction(result=MonitorResult.NO_MATCH, message="消息不匹配监控条件")
+_BLOCKED = MonitorAction(result=MonitorResult.BLOCKED, message="消息被屏蔽规则拦截")
+_LIMIT_REACHED = MonitorAction(result=MonitorResult.LIMIT_REACHED, message="已达到最大执行次数")
+
+
 class BaseMonitor(ABC):
     
     def __init__(self, config: BaseMonitorConfig):
         self.config = config
         self.logger = get_logger(self.__class__.__name__)
+        self._config_sets: Dict[tuple, tuple] = {}
+        self._limit_logged = False
+        self._monitor_type_name = type(self).__name__.removesuffix('Monitor')
+    
+    def _config_set(self, field_name: str, transform: Optional[Callable[[Any], Any]] = None) -> frozenset:
+        values = getattr(self.config, field_name)
+        key = (field_name, transform)
+        cached = self._config_sets.get(key)
+        if cached is None or cached[0] is not values or cached[1] != len(values):
+            converted = frozenset(map(transform, values) if transform else values)
+            cached = (values, len(values), converted)
+            self._config_sets[key] = cached
+        return cached[2]
     
     async def process_message(self, message_event: MessageEvent, account: Account) -> MonitorAction:
         try:
             if hasattr(self.config, 'active') and self.config.active is False:
                 self.logger.debug(f"监控器已暂停，跳过处理")
-                return MonitorAction(
-                    result=MonitorResult.NO_MATCH,
-                    actions_taken=[],
-                    message="监控器已暂停"
-                )
+                return _NO_MATCH_PAUSED
             
-            if not self._should_process(message_event, account):
-                return MonitorAction(
-                    result=MonitorResult.NO_MATCH,
-                    actions_taken=[],
-                    message="消息不符合处理条件"
-                )
+            if self.config.is_execution_limit_reached():
+                if not self._limit_logged:
+                    self.logger.info(f"监控器已达到最大执行次数 {self.config.max_executions}，跳过后续消息")
+                    self._limit_logged = True
+                return _LIMIT_REACHED
+            self._limit_logged = False
             
-            if self._is_blocked(message_event):
-                return MonitorAction(
-                    result=MonitorResult.BLOCKED,
-                    actions_taken=[],
-                    message="消息被屏蔽规则拦截"
-                )
+            if not self._chat_allowed(message_event, account) or not self._user_allowed(message_event):
+                return _NO_MATCH_FILTERED
             
-            if self.config.is_execution_limit_reached():
-                return MonitorAction(
-                    result=MonitorResult.LIMIT_REACHED,
-                    actions_taken=[],
-                    message="已达到最大执行次数"
-                )
+            if self._is_blocked(message_event):
+                return _BLOCKED
             
             if not await self._match_condition(message_event, account):
-                return MonitorAction(
-                    result=MonitorResult.NO_MATCH,
-                    actions_taken=[],
-                    message="消息不匹配监控条件"
-                )
+                return _NO_MATCH_CONDITION
             
             
             actions_taken = await self._execute_actions(message_event, account)
             
-            await self._log_monitor_trigger(message_event, account)
+            self._log_monitor_trigger(message_event, account)
             
             if actions_taken:
                 self._log_execution_result(message_event, account, actions_taken)
@@ -97,22 +116,28 @@ class BaseMonitor(ABC):
                 error=e
             )
     
-    def _should_process(self, message_event: MessageEvent, account: Account) -> bool:
+    def _chat_allowed(self, message_event: MessageEvent, account: Account) -> bool:
         message = message_event.message
         
         if message.sender.id == account.own_user_id:
             return False
         
-        if self.config.chats and message.chat_id not in self.config.chats:
+        if self.config.chats and message.chat_id not in self._config_set('chats'):
             self.logger.debug(f"消息来源聊天 {message.chat_id} 不在监控列表 {self.config.chats} 中")
             return False
             
         self.logger.debug(f"✅ 消息来源聊天 {message.chat_id} 在监控列表中")
+        return True
+    
+    def _user_allowed(self, message_event: MessageEvent) -> bool:
+        message = message_event.message
+        config = self.config
         
-        if not self._match_user_filter(message.sender):
+        if config.users and not self._match_user_filter(message.sender):
             return False
 
-        if not self._match_chat_filter(message_event):
+        has_specific_ids = config.bot_ids or config.channel_ids or config.group_ids
+        if has_specific_ids and not self._match_chat_filter(message_event):
             self.logger.debug(f"消息因聊天来源过滤失败，聊天ID: {message.chat_id}")
             return False
 
@@ -131,21 +156,21 @@ class BaseMonitor(ABC):
                 else:
                     short_id = sender_id_str
                 
-                user_set_str = {str(x) for x in self.config.users}
+                user_set_str = self._config_set('users', str)
                 if not (sender_id_str in user_set_str or short_id in user_set_str):
                     return False
                     
             elif user_option == '2':
-                sender_username = getattr(sender, 'username', '').lower()
-                if sender_username not in {str(u).lower() for u in self.config.users}:
+                sender_username = (sender.username or '').lower()
+                if sender_username not in self._config_set('users', _lower_str):
                     return False
                     
             elif user_option == '3':
-                if hasattr(sender, 'first_name'):
-                    sender_full = f"{sender.first_name or ''} {sender.last_name or ''}".strip()
+                if sender.first_name is not None:
+                    sender_full = f"{sender.first_name} {sender.last_name or ''}".strip()
                 else:
-                    sender_full = getattr(sender, 'title', '').strip()
-                if sender_full not in {str(u) for u in self.config.users}:
+                    sender_full = (sender.title or '').strip()
+                if sender_full not in self._config_set('users', str):
                     return False
         
         return True
@@ -156,65 +181,55 @@ class BaseMonitor(ABC):
         sender = message.sender
         
         if self.logger.isEnabledFor(logging.DEBUG):
-            sender_info = f"发送者ID: {sender.id if sender else 'None'}, Bot: {getattr(sender, 'bot', False) if sender else False}"
+            sender_info = f"发送者ID: {sender.id if sender else 'None'}, Bot: {sender.is_bot if sender else False}"
             self.logger.debug(f"[过滤检查] 聊天ID: {chat_id}, {sender_info}")
         
         has_specific_ids = bool(self.config.bot_ids or self.config.channel_ids or self.config.group_ids)
         
         if has_specific_ids:
-            self.logger.info(f"🔍 [精确ID过滤] 配置 - Bot: {self.config.bot_ids}, 频道: {self.config.channel_ids}, 群组: {self.config.group_ids}")
+            self.logger.info("🔍 [精确ID过滤] 配置 - Bot: %s, 频道: %s, 群组: %s",
+                             self.config.bot_ids, self.config.channel_ids, self.config.group_ids)
             
             sender_id = sender.id if sender else 0
-            sender_is_bot = getattr(sender, 'bot', False) if sender else False
+            sender_is_bot = sender.is_bot if sender else False
             
-            self.logger.info(f"🔍 [ID匹配检查] 聊天ID: {chat_id}, 发送者ID: {sender_id}, 是Bot: {sender_is_bot}")
+            self.logger.info("🔍 [ID匹配检查] 聊天ID: %s, 发送者ID: %s, 是Bot: %s", chat_id, sender_id, sender_is_bot)
             
             id_matched = False
             
             if self.config.bot_ids and sender_is_bot:
-                if sender_id in self.config.bot_ids:
+                if sender_id in self._config_set('bot_ids'):
                     id_matched = True
-                    self.logger.debug(f"✅ 消息匹配Bot ID过滤: {sender_id}")
+                    self.logger.debug("✅ 消息匹配Bot ID过滤: %s", sender_id)
             
-            if self.config.channel_ids:
-                for config_id in self.config.channel_ids:
-                    self.logger.debug(f"🔍 检查配置ID {config_id} 与发送者ID {sender_id}")
-                    
-                    if chat_id == config_id:
-                        id_matched = True
-                        self.logger.debug(f"✅ 聊天ID直接匹配配置ID: {chat_id}")
-                        break
-                    
-                    if config_id < 0 and str(config_id).startswith("-100"):
-                        channel_sender_id = abs(config_id) - 1000000000000
-                        if sender_id == channel_sender_id:
-                            id_matched = True
-                            self.logger.debug(f"✅ 发送者ID匹配频道ID: {sender_id} (频道: {config_id})")
-                            break
-                    
-                    full_channel_id = -1000000000000 - abs(sender_id)
-                    if config_id == full_channel_id:
-                        id_matched = True
-                        self.logger.debug(f"✅ 发送者ID通过格式转换匹配频道ID: {sender_id} -> {full_channel_id}")
-                        break
+            if not id_matched and self.config.channel_ids:
+                channel_chat_ids = self._config_set('channel_ids')
                 
-
+                if chat_id in channel_chat_ids:
+                    id_matched = True
+                    self.logger.debug("✅ 聊天ID直接匹配配置ID: %s", chat_id)
+                elif sender_id in self._config_set('channel_ids', _channel_sender_id):
+                    id_matched = True
+                    self.logger.debug("✅ 发送者ID匹配频道ID: %s", sender_id)
+                elif -CHANNEL_ID_OFFSET - abs(sender_id) in channel_chat_ids:
+                    id_matched = True
+                    self.logger.debug("✅ 发送者ID通过格式转换匹配频道ID: %s -> %s", sender_id, -CHANNEL_ID_OFFSET - abs(sender_id))
             
-            if hasattr(self.config, 'group_ids') and self.config.group_ids:
-                for group_id in self.config.group_ids:
-                    if sender_id == group_id or chat_id == group_id:
-                        id_matched = True
-                        self.logger.debug(f"✅ 匹配群组ID过滤（兼容模式）: {group_id}")
-                        break
+            if not id_matched and self.config.group_ids:
+                group_ids = self._config_set('group_ids')
+                if sender_id in group_ids or chat_id in group_ids:
+                    id_matched = True
+                    self.logger.debug("✅ 匹配群组ID过滤（兼容模式）: %s", sender_id if sender_id in group_ids else chat_id)
             
             if not id_matched:
-                self.logger.info(f"❌ [精确ID过滤] 发送者 {sender_id} 不匹配配置的任何ID，消息被拦截")
-                self.logger.info(f"💡 配置的ID列表 - Bot: {self.config.bot_ids}, 频道: {self.config.channel_ids}, 群组: {self.config.group_ids}")
+                self.logger.info("❌ [精确ID过滤] 发送者 %s 不匹配配置的任何ID，消息被拦截", sender_id)
+                self.logger.info("💡 配置的ID列表 - Bot: %s, 频道: %s, 群组: %s",
+                                 self.config.bot_ids, self.config.channel_ids, self.config.group_ids)
                 return False
             else:
-                self.logger.info(f"✅ [精确ID过滤] 发送者 {sender_id} 匹配成功")
+                self.logger.info("✅ [精确ID过滤] 发送者 %s 匹配成功", sender_id)
         else:
-            self.logger.debug(f"[无精确ID配置] 允许所有聊天来源")
+            self.logger.debug("[无精确ID配置] 允许所有聊天来源")
         
         return True
     
@@ -223,19 +238,20 @@ class BaseMonitor(ABC):
         sender = message.sender
         chat_id = message.chat_id
         
-        if sender and str(sender.id) in self.config.blocked_users:
+        if sender and str(sender.id) in self._config_set('blocked_users', str):
             self.logger.debug(f"消息被用户黑名单拦截: {sender.id}")
             return True
         
-        if sender and getattr(sender, 'is_bot', False) and sender.id in self.config.blocked_bots:
+        if sender and sender.is_bot and sender.id in self._config_set('blocked_bots'):
             self.logger.debug(f"消息被Bot黑名单拦截: {sender.id}")
             return True
         
-        if chat_id in self.config.blocked_channels:
+        blocked_channels = self._config_set('blocked_channels')
+        if chat_id in blocked_channels:
             self.logger.debug(f"消息被频道/群组黑名单拦截: {chat_id}")
             return True
         
-        if message.forward_from_channel_id and message.forward_from_channel_id in self.config.blocked_channels:
+        if message.forward_from_channel_id and message.forward_from_channel_id in blocked_channels:
             self.logger.debug(f"消息被转发来源黑名单拦截: {message.forward_from_channel_id}")
             return True
         
@@ -263,33 +279,36 @@ class BaseMonitor(ABC):
     async def _execute_custom_actions(self, message_event: MessageEvent, account: Account) -> List[str]:
         return []
     
-    async def _log_monitor_trigger(self, message_event: MessageEvent, account: Account):
+    def _log_monitor_trigger(self, message_event: MessageEvent, account: Account):
         message = message_event.message
-        monitor_type = self.__class__.__name__.replace('Monitor', '')
+        monitor_type = self._monitor_type_name
         
-        chat_info = f"聊天{message.chat_id}"
-        
-        sender_info = "未知发送者"
-        if message.sender:
-            sender_name = message.sender.full_name or "未知用户"
-            if message.sender.username:
-                sender_info = f"{sender_name}(@{message.sender.username})"
-            else:
-                sender_info = sender_name
-        
-        content_preview = ""
-        if message.text:
-            content_preview = message.text[:50] + "..." if len(message.text) > 50 else message.text
-        
-        monitor_info = await self._get_monitor_type_info()
-        self.logger.info(f"🎯 [{monitor_type}监控器{monitor_info}] 频道:{message.chat_id} 发送者:{message.sender.id if message.sender else 'N/A'} 内容:\"{content_preview}\"")
+        if self.logger.isEnabledFor(logging.INFO):
+            content_preview = ""
+            if message.text:
+                content_preview = message.text[:50] + "..." if len(message.text) > 50 else message.text
+            
+            monitor_info = self._get_monitor_type_info()
+            self.logger.info(
+                "🎯 [%s监控器%s] 频道:%s 发送者:%s 内容:\"%s\"",
+                monitor_type, monitor_info, message.chat_id,
+                message.sender.id if message.sender else 'N/A', content_preview
+            )
         
         if self.logger.isEnabledFor(logging.DEBUG):
+            sender_info = "未知发送者"
+            if message.sender:
+                sender_name = message.sender.full_name or "未知用户"
+                if message.sender.username:
+                    sender_info = f"{sender_name}(@{message.sender.username})"
+                else:
+                    sender_info = sender_name
+            
             detailed_log_parts = [
                 "=" * 60,
                 f"🎯 [{monitor_type}监控器] 详细信息",
                 f"📱 账号: {account.account_id}",
-                f"💬 聊天: {chat_info} (ID: {message.chat_id})",
+                f"💬 聊天: 聊天{message.chat_id} (ID: {message.chat_id})",
                 f"👤 发送者: {sender_info} (ID: {message.sender.id})",
                 f"⏰ 时间: {message.timestamp}",
             ]
@@ -304,12 +323,12 @@ class BaseMonitor(ABC):
                     detailed_log_parts.append(f"📁 文件: {message.media.file_name}")
             
             if message.has_buttons:
-                button_text = ", ".join(message.button_texts[:3])
-                if len(message.button_texts) > 3:
-                    button_text += f" (+{len(message.button_texts)-3}个)"
+                button_texts = message.button_texts
+                button_count = len(button_texts)
+                button_text = ", ".join(button_texts[:3]) + (f" (+{button_count-3}个)" if button_count > 3 else "")
                 detailed_log_parts.append(f"🔘 按钮: {button_text}")
             
-            await self._add_monitor_specific_info(detailed_log_parts, message_event, account)
+            self._add_monitor_specific_info(detailed_log_parts, message_event, account)
             
             execution_count = getattr(self.config, 'execution_count', 0) + 1
             max_executions = getattr(self.config, 'max_executions', None)
@@ -321,23 +340,21 @@ class BaseMonitor(ABC):
             detailed_log_parts.append("=" * 60)
             self.logger.debug("\n" + "\n".join(detailed_log_parts))
     
-    async def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
+    def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
         pass
     
     def _log_execution_result(self, message_event: MessageEvent, account: Account, actions_taken: List[str]):
-        monitor_type = self.__class__.__name__.replace('Monitor', '')
-        
         if actions_taken:
-            actions_summary = ", ".join(actions_taken)
-            self.logger.debug(f"✅ [{monitor_type}监控器] 执行完成: {actions_summary}")
+            self.logger.debug("✅ [%s监控器] 执行完成: %s", self._monitor_type_name, ", ".join(actions_taken))
         else:
-            self.logger.debug(f"ℹ️ [{monitor_type}监控器] 匹配成功但无需执行动作")
+            self.logger.debug("ℹ️ [%s监控器] 匹配成功但无需执行动作", self._monitor_type_name)
     
     def get_config(self) -> BaseMonitorConfig:
         return self.config
     
     def update_config(self, config: BaseMonitorConfig):
         self.config = config
+        self._config_sets.clear()
     
-    async def _get_monitor_type_info(self) -> str:
+    def _get_monitor_type_info(self) -> str:
         return "" 
\ No newline at end of file
@@ -4,18 +4,48 @@
 """
 
 import os
+import asyncio
+from pathlib import Path
 from typing import List
 
+import aiofiles
+from telethon.errors import RPCError
+
 from models import MessageEvent, Account
 from models.config import FileConfig
 from .base_monitor import BaseMonitor
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class FileMonitor(BaseMonitor):
     
     def __init__(self, config: FileConfig):
         super().__init__(config)
+        self._apply_config(config)
+    
+    def update_config(self, config: FileConfig):
+        super().update_config(config)
+        self._apply_config(config)
+    
+    def _apply_config(self, config: FileConfig):
         self.file_config = config
+        self._save_dir_ready = False
+        if config.save_folder:
+            try:
+                os.makedirs(config.save_folder, exist_ok=True)
+                self._save_dir_ready = True
+            except OSError as e:
+                self.logger.warning(f"创建保存目录失败: {config.save_folder}, {e}")
+        self._type_info = f"(文件:{config.file_extension})"
+        self._size_limit_line = None
+        if config.min_size or config.max_size:
+            size_info = []
+            if config.min_size:
+                size_info.append(f"最小{config.min_size}MB")
+            if config.max_size:
+                size_info.append(f"最大{config.max_size}MB")
+            self._size_limit_line = f"📐 大小限制: {' - '.join(size_info)}"
     
     async def _match_condition(self, message_event: MessageEvent, account: Account) -> bool:
         message = message_event.message
@@ -24,69 +54,14 @@ class FileMonitor(BaseMonitor):
             return False
         
         media = message.media
-        
-        file_ext = None
-        file_name = None
-        
-        if hasattr(media, 'file_extension') and media.file_extension:
-            file_ext = media.file_extension
-            file_name = getattr(media, 'file_name', 'unknown_file') or 'unknown_file'
-            
-        elif hasattr(media, 'file_name') and media.file_name:
-            file_name = media.file_name
-            _, file_ext = os.path.splitext(file_name)
-            if not file_ext:
-                return False
-            file_ext = file_ext.lower()
-                
-        elif hasattr(media, 'media_type') and media.media_type:
-            mime_type = getattr(media, 'mime_type', None)
-            if mime_type:
-                mime_to_ext = {
-                    'application/pdf': '.pdf',
-                    'application/zip': '.zip',
-                    'application/x-rar-compressed': '.rar',
-                    'application/x-7z-compressed': '.7z',
-                    'text/plain': '.txt',
-                    'application/msword': '.doc',
-                    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
-                    'application/vnd.ms-excel': '.xls',
-                    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': '.xlsx',
-                    'image/jpeg': '.jpg',
-                    'image/png': '.png',
-                    'video/mp4': '.mp4',
-                    'audio/mpeg': '.mp3',
-                    'audio/ogg': '.ogg',
-                    'video/webm': '.webm'
-                }
-                file_ext = mime_to_ext.get(mime_type, '')
-                if file_ext:
-                    file_name = f"unknown_file{file_ext}"
-                else:
-                    return False
-            else:
-                return False
-        else:
+        file_ext = media.resolved_extension
+        if not file_ext or file_ext != self.file_config.file_extension:
             return False
         
-        if file_ext:
-            file_ext = file_ext.lower()
-            if not file_ext.startswith('.'):
-                file_ext = '.' + file_ext
-                
-            config_ext = self.file_config.file_extension.lower()
-            if not config_ext.startswith('.'):
-                config_ext = '.' + config_ext
-                
-            match_result = file_ext == config_ext
-            
-            if match_result:
-                file_size_mb = getattr(message.media, 'file_size_mb', 0) or (getattr(message.media, 'file_size', 0) / (1024 * 1024))
-                self.logger.info(f"✅ [文件匹配] 文件: {file_name}, 扩展名: {file_ext}, 大小: {file_size_mb:.2f}MB")
-            
-            return match_result
-        
-        return False
+        file_name = media.file_name or f"unknown_file{file_ext}"
+        file_size_mb = media.file_size_mb or 0
+        self.logger.info(f"✅ [文件匹配] 文件: {file_name}, 扩展名: {file_ext}, 大小: {file_size_mb:.2f}MB")
+        return True
     
     async def _execute_custom_actions(self, message_event: MessageEvent, account: Account) -> List[str]:
         actions_taken = []
@@ -99,75 +74,95 @@ class FileMonitor(BaseMonitor):
         return actions_taken
     
     async def _save_file(self, message_event: MessageEvent, account: Account) -> bool:
+        message = message_event.message
+        
+        if not message.media or not message.media.has_media:
+            self.logger.error("消息不包含媒体文件")
+            return False
+        
+        file_size_mb = message.media.file_size_mb
+        if file_size_mb is None:
+            self.logger.warning("无法获取文件大小信息")
+            file_size_mb = 0
+        
+        if not self.file_config.is_size_valid(file_size_mb):
+            self.logger.info(f"文件大小 {file_size_mb:.2f} MB 不在设定范围内")
+            return False
+        
+        client = account.client
         try:
-            message = message_event.message
-            
-            if not message.media or not message.media.has_media:
-                self.logger.error("消息不包含媒体文件")
-                return False
-            
-            file_size_mb = getattr(message.media, 'file_size_mb', None)
-            if file_size_mb is None:
-                file_size_bytes = getattr(message.media, 'file_size', 0)
-                if file_size_bytes > 0:
-                    file_size_mb = file_size_bytes / (1024 * 1024)
-                else:
-                    self.logger.warning("无法获取文件大小信息")
-                    file_size_mb = 0
+            if not self._save_dir_ready:
+                os.makedirs(self.file_config.save_folder, exist_ok=True)
+                self._save_dir_ready = True
             
-            if not self.file_config.is_size_valid(file_size_mb):
-                self.logger.info(f"文件大小 {file_size_mb:.2f} MB 不在设定范围内")
+            original_message = await message_event.get_original_message(client)
+            if not original_message or not original_message.media:
+                self.logger.error("无法获取原始消息对象或消息无媒体")
                 return False
             
-            os.makedirs(self.file_config.save_folder, exist_ok=True)
-            
-            client = account.client
-            try:
-                original_message = await client.get_messages(message.chat_id, ids=message.message_id)
-                
-                if original_message and original_message.media:
-                    file_path = await original_message.download_media(file=self.file_config.save_folder)
-                    
-                    if file_path:
-                        self.logger.info(f"文件已保存: {file_path}")
-                        return True
-                    else:
-                        self.logger.error("文件下载失败")
-                        return False
-                else:
-                    self.logger.error("无法获取原始消息对象或消息无媒体")
-                    return False
-                    
-            except Exception as download_error:
-                self.logger.error(f"下载文件时出错: {download_error}")
-                return False
-            
-        except Exception as e:
-            self.logger.error(f"保存文件失败: {e}")
+            if original_message.document:
+                file_path = await self._stream_download(client, original_message)
+            else:
+                file_path = await original_message.download_media(file=self.file_config.save_folder)
+        except FileNotFoundError as download_error:
+            self._save_dir_ready = False
+            self.logger.error(f"下载文件时出错: {download_error}")
+            return False
+        except (RPCError, OSError, asyncio.TimeoutError) as download_error:
+            self.logger.error(f"下载文件时出错: {download_error}")
             return False
+        
+        if not file_path:
+            self.logger.error("文件下载失败")
+            return False
+        
+        self.logger.info(f"文件已保存: {file_path}")
+        return True
+
+    async def _stream_download(self, client, original_message) -> str:
+        file_name = os.path.basename(original_message.file.name or "")
+        if not file_name:
+            file_name = f"{original_message.id}{original_message.file.ext or ''}"
+        
+        file_path = self._unique_path(Path(self.file_config.save_folder), file_name)
+        part_path = file_path.with_name(file_path.name + ".part")
+        
+        try:
+            async with aiofiles.open(part_path, 'wb') as f:
+                async for chunk in client.iter_download(original_message.document, chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+            os.replace(part_path, file_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+        
+        return str(file_path)
+    
+    @staticmethod
+    def _unique_path(folder: Path, file_name: str) -> Path:
+        file_path = folder / file_name
+        counter = 1
+        while file_path.exists():
+            file_path = folder / f"{Path(file_name).stem} ({counter}){Path(file_name).suffix}"
+            counter += 1
+        return file_path
 
-    async def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
+    def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
         message = message_event.message
         
         log_parts.append(f"📄 监控扩展名: \"{self.file_config.file_extension}\"")
         
-        if self.file_config.min_size or self.file_config.max_size:
-            size_info = []
-            if self.file_config.min_size:
-                size_info.append(f"最小{self.file_config.min_size}MB")
-            if self.file_config.max_size:
-                size_info.append(f"最大{self.file_config.max_size}MB")
-            log_parts.append(f"📐 大小限制: {' - '.join(size_info)}")
+        if self._size_limit_line:
+            log_parts.append(self._size_limit_line)
         
         if message.media and message.media.has_media:
             if message.media.file_name:
                 log_parts.append(f"📁 检测到文件: {message.media.file_name}")
             if message.media.file_size:
-                file_size_mb = message.media.file_size / 1024 / 1024
-                log_parts.append(f"📊 文件大小: {file_size_mb:.2f} MB")
+                log_parts.append(f"📊 文件大小: {message.media.file_size_mb:.2f} MB")
         
         if self.file_config.save_folder:
             log_parts.append(f"💾 保存路径: {self.file_config.save_folder}")
     
-    async def _get_monitor_type_info(self) -> str:
-        return f"(文件:{self.file_config.file_extension})" 
\ No newline at end of file
+    def _get_monitor_type_info(self) -> str:
+        return self._type_info 
\ No newline at end of file
@@ -3,6 +3,7 @@
 检测图片和按钮内容，发送给AI分析，根据AI结果点击按钮
 """
 import asyncio
+import base64
 from typing import List, Optional, Dict, Any
 from models import MessageEvent, Account
 from models.config import ImageButtonConfig
@@ -18,10 +19,15 @@ class ImageButtonMonitor(BaseMonitor):
         self.logger = get_logger(__name__)
     
     def _read_image_base64(self, photo_path: str) -> str:
-        import base64
         with open(photo_path, "rb") as image_file:
             return base64.b64encode(image_file.read()).decode("utf-8")
     
+    async def _download_image_b64(self, original_message) -> Optional[str]:
+        image_bytes = await original_message.download_media(file=bytes)
+        if not image_bytes:
+            return None
+        return base64.b64encode(image_bytes).decode("ascii")
+    
     async def _match_condition(self, message_event: MessageEvent, account: Account) -> bool:
         message = message_event.message
         
@@ -29,7 +35,7 @@ class ImageButtonMonitor(BaseMonitor):
         has_buttons = bool(message.buttons)
         
         try:
-            original_message = await account.client.get_messages(message.chat_id, ids=message.message_id)
+            original_message = await message_event.get_original_message(account.client)
             if original_message:
                 if (original_message.photo or 
                     (original_message.document and 
@@ -82,7 +88,7 @@ class ImageButtonMonitor(BaseMonitor):
             image_base64 = None
             
             try:
-                original_message = await account.client.get_messages(message.chat_id, ids=message.message_id)
+                original_message = await message_event.get_original_message(account.client)
                 if original_message:
                     if (original_message.photo or 
                         (original_message.document and 
@@ -93,27 +99,9 @@ class ImageButtonMonitor(BaseMonitor):
                         self.logger.info(f"[图片+按钮] 检测到图片，准备下载")
                         
                         try:
-                            photo_path = await original_message.download_media()
-                            if photo_path:
-                                import os
-                                import shutil
-                                import base64
-                                
-                                base, ext = os.path.splitext(photo_path)
-                                if ext.lower() != '.jpg':
-                                    new_image_path = base + '.jpg'
-                                    shutil.move(photo_path, new_image_path)
-                                    photo_path = new_image_path
-                                
-                                with open(photo_path, "rb") as image_file:
-                                    image_base64 = base64.b64encode(image_file.read()).decode("utf-8")
-                                
-                                self.logger.info(f"[图片+按钮] ✅ 成功下载并编码图片: {photo_path}")
-                                
-                                if os.path.exists(photo_path):
-                                    os.remove(photo_path)
-                                    self.logger.debug(f"[图片+按钮] 已删除临时文件: {photo_path}")
-                                    
+                            image_base64 = await self._download_image_b64(original_message)
+                            if image_base64:
+                                self.logger.info(f"[图片+按钮] ✅ 成功下载并编码图片")
                             else:
                                 self.logger.error(f"[图片+按钮] ❌ 图片下载失败")
                         except Exception as download_error:
@@ -219,36 +207,12 @@ class ImageButtonMonitor(BaseMonitor):
                 
                 if self.image_button_config.download_images:
                     try:
-                        original_message = await account.client.get_messages(message.chat_id, ids=message.message_id)
+                        original_message = await message_event.get_original_message(account.client)
                         if original_message:
-                            photo_path = await original_message.download_media()
-                            if photo_path:
-                                import os
-                                import shutil
-                                base, ext = os.path.splitext(photo_path)
-                                if ext.lower() != '.jpg':
-                                    new_image_path = base + '.jpg'
-                                    shutil.move(photo_path, new_image_path)
-                                    photo_path = new_image_path
-                                
-                                content['image_path'] = str(photo_path)
-                                
-                                import base64
-                                try:
-                                    with open(photo_path, "rb") as image_file:
-                                        base64_image = base64.b64encode(image_file.read()).decode("utf-8")
-                                    content['image_base64'] = base64_image
-                                    self.logger.info(f"[图片处理] 成功下载并编码图片: {photo_path}")
-                                    
-                                    try:
-                                        if os.path.exists(photo_path):
-                                            os.remove(photo_path)
-                                            self.logger.debug(f"[图片处理] 已删除临时图片文件: {photo_path}")
-                                    except Exception as cleanup_error:
-                                        self.logger.warning(f"[图片处理] 删除临时文件失败: {cleanup_error}")
-                                        
-                                except Exception as encode_error:
-                                    self.logger.error(f"[图片处理] base64编码失败: {encode_error}")
+                            image_base64 = await self._download_image_b64(original_message)
+                            if image_base64:
+                                content['image_base64'] = image_base64
+                                self.logger.info(f"[图片处理] 成功下载并编码图片")
                             else:
                                 self.logger.error(f"[图片处理] 图片下载失败")
                         else:
@@ -303,35 +267,41 @@ class ImageButtonMonitor(BaseMonitor):
             message = message_event.message
             ai_answer_lower = ai_answer.lower().strip()
             
+            flat_buttons = [
+                (button.row, button.col, text, text.lower())
+                for button, text in zip((b for row in message.buttons for b in row), message.button_texts)
+            ]
+            
+            exact_buttons = {}
+            for row_idx, col_idx, button_text, button_text_lower in flat_buttons:
+                exact_buttons.setdefault(button_text_lower, (row_idx, col_idx, button_text))
+            
             best_match = None
             best_match_score = 0
             best_position = None
             
-            for row_idx, row in enumerate(message.buttons):
-                for col_idx, button in enumerate(row):
-                    if hasattr(button, 'text'):
-                        button_text = button.text.strip()
-                        button_text_lower = button_text.lower()
-                        
-                        if button_text == ai_answer or button_text_lower == ai_answer_lower:
+            exact = exact_buttons.get(ai_answer_lower)
+            if exact is not None:
+                best_position = exact[:2]
+                best_match = exact[2]
+                best_match_score = 100
+            else:
+                ai_len = len(ai_answer_lower)
+                for row_idx, col_idx, button_text, button_text_lower in flat_buttons:
+                    if ai_answer_lower in button_text_lower or button_text_lower in ai_answer_lower:
+                        button_len = len(button_text_lower)
+                        if ai_len < button_len:
+                            score = ai_len / button_len * 80
+                        else:
+                            score = button_len / ai_len * 80
+                        if score > best_match_score:
                             best_match = button_text
                             best_position = (row_idx, col_idx)
-                            best_match_score = 100
-                            break
-                        
-                        elif ai_answer_lower in button_text_lower or button_text_lower in ai_answer_lower:
-                            score = min(len(ai_answer_lower), len(button_text_lower)) / max(len(ai_answer_lower), len(button_text_lower)) * 80
-                            if score > best_match_score:
-                                best_match = button_text
-                                best_position = (row_idx, col_idx)
-                                best_match_score = score
-                
-                if best_match_score >= 100:
-                    break
+                            best_match_score = score
             
             if best_match and best_position and best_match_score >= 50:
                 row_idx, col_idx = best_position
-                original_message = await account.client.get_messages(message.chat_id, ids=message.message_id)
+                original_message = await message_event.get_original_message(account.client)
                 if original_message:
                     await original_message.click(row_idx, col_idx)
                     self.logger.info(f"[图片+按钮] 点击按钮成功: '{best_match}' (匹配度: {best_match_score:.1f}%)")
@@ -359,7 +329,7 @@ class ImageButtonMonitor(BaseMonitor):
         except Exception as e:
             self.logger.error(f"发送回复失败: {e}")
     
-    async def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
+    def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
         message = message_event.message
         
         log_parts.append(f"🤖 AI提示: \"{self.image_button_config.ai_prompt[:60]}{'...' if len(self.image_button_config.ai_prompt) > 60 else ''}\"")
@@ -392,6 +362,6 @@ class ImageButtonMonitor(BaseMonitor):
         if config_options:
             log_parts.append(f"⚙️ 启用功能: {' | '.join(config_options)}")
     
-    async def _get_monitor_type_info(self) -> str:
+    def _get_monitor_type_info(self) -> str:
         prompt_preview = self.image_button_config.ai_prompt[:25] + "..." if len(self.image_button_config.ai_prompt) > 25 else self.image_button_config.ai_prompt
         return f"(图片+按钮:\"{prompt_preview}\")" 
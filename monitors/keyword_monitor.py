@@ -6,13 +6,20 @@
 import re
 import asyncio
 import random
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 from models import MessageEvent, Account
 from models.config import KeywordConfig, MatchType
 from .base_monitor import BaseMonitor
 
 
+@lru_cache(maxsize=4096)
+def _regex_search(pattern: re.Pattern, text: str) -> Optional[str]:
+    search_result = pattern.search(text)
+    return search_result.group(0) if search_result else None
+
+
 class KeywordMonitor(BaseMonitor):
     
     def __init__(self, config: KeywordConfig):
@@ -25,7 +32,7 @@ class KeywordMonitor(BaseMonitor):
             except re.error as e:
                 self.logger.error(f"正则表达式编译失败: {e}")
         
-        self._lower_keyword = config.keyword.lower()
+        self.folded_keyword = config.keyword.casefold()
     
     async def _match_condition(self, message_event: MessageEvent, account: Account) -> bool:
         message = message_event.message
@@ -33,34 +40,25 @@ class KeywordMonitor(BaseMonitor):
         if not message.text:
             return False
             
-        text = message.text_lower
         matched = False
         matched_content = None
         
         if self.keyword_config.match_type == MatchType.EXACT:
-            matched = text == self._lower_keyword
+            matched = message.text_folded == self.folded_keyword
             if matched:
                 matched_content = self.keyword_config.keyword
         elif self.keyword_config.match_type == MatchType.PARTIAL:
-            matched = self._lower_keyword in text
+            if message_event.matched_keywords is not None:
+                matched = self.folded_keyword in message_event.matched_keywords
+            else:
+                matched = self.folded_keyword in message.text_folded
             if matched:
                 matched_content = self.keyword_config.keyword
         elif self.keyword_config.match_type == MatchType.REGEX:
-            if self._compiled_regex:
-                search_result = self._compiled_regex.search(message.text)
-                if search_result:
-                    matched = True
-                    matched_content = search_result.group(0)
-            else:
-                try:
-                    pattern = re.compile(self.keyword_config.keyword, re.IGNORECASE)
-                    search_result = pattern.search(message.text)
-                    if search_result:
-                        matched = True
-                        matched_content = search_result.group(0)
-                except re.error as e:
-                    self.logger.error(f"正则表达式错误: {e}")
-                    return False
+            if self._compiled_regex is None:
+                return False
+            matched_content = _regex_search(self._compiled_regex, message.text)
+            matched = matched_content is not None
         
         if matched and matched_content:
             self.keyword_config.matched_keyword = matched_content
@@ -83,8 +81,7 @@ class KeywordMonitor(BaseMonitor):
                 delay = random.uniform(0, self.keyword_config.regex_send_random_offset)
                 await asyncio.sleep(delay)
             
-            pattern = re.compile(self.keyword_config.keyword, re.IGNORECASE)
-            matches = pattern.findall(message_event.message.text)
+            matches = self._compiled_regex.findall(message_event.message.text)
             
             if matches:
                 match_text = '\n'.join(matches)
@@ -129,7 +126,7 @@ class KeywordMonitor(BaseMonitor):
         self.logger.debug("关键词监控器无可用的回复内容")
         return []
     
-    async def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
+    def _add_monitor_specific_info(self, log_parts: List[str], message_event: MessageEvent, account: Account):
         match_type_name = {
             'exact': '精确匹配',
             'partial': '包含匹配', 
@@ -152,7 +149,7 @@ class KeywordMonitor(BaseMonitor):
             if self.keyword_config.regex_send_random_offset > 0:
                 log_parts.append(f"⏱️ 随机延时: 0-{self.keyword_config.regex_send_random_offset}秒")
     
-    async def _get_monitor_type_info(self) -> str:
+    def _get_monitor_type_info(self) -> str:
         match_type_name = {
             'exact': '精确',
             'partial': '包含', 
@@ -166,11 +163,11 @@ class KeywordMatchStrategy:
     
     @staticmethod
     def exact_match(text: str, keyword: str) -> bool:
-        return text.lower().strip() == keyword.lower().strip()
+        return text.casefold().strip() == keyword.casefold().strip()
     
     @staticmethod
     def partial_match(text: str, keyword: str) -> bool:
-        return keyword.lower() in text.lower()
+        return keyword.casefold() in text.casefold()
     
     @staticmethod
     def regex_match(text: str, pattern: str) -> bool:
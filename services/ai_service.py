@@ -5,7 +5,7 @@ AI服务
 
 import asyncio
 import threading
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from openai import OpenAI
 
 from utils.singleton import Singleton
@@ -20,7 +20,7 @@ class AIService(metaclass=Singleton):
         self._logger = None
         self._initialized = False
         self._init_lock = threading.Lock()
-        
+        self._inflight: Dict[tuple, asyncio.Task] = {}
     
     @property
     def logger(self):
@@ -86,11 +86,78 @@ class AIService(metaclass=Singleton):
             self.client = None
             self.logger.info("AI服务状态已重置")
     
+    @staticmethod
+    def _request_key(messages: List[Dict[str, Any]]) -> Optional[tuple]:
+        key = [config.OPENAI_MODEL]
+        for message in messages:
+            content = message.get("content")
+            if not isinstance(content, str) or len(message) != 2:
+                return None
+            key.append(message.get("role"))
+            key.append(content)
+        return tuple(key)
+    
     async def get_chat_completion(
         self,
         messages: List[Dict[str, Any]],
         max_retries: int = 1,
-        retry_delay: int = 3
+        retry_delay: int = 3,
+        is_complete: Optional[Callable[[str], bool]] = None
+    ) -> Optional[str]:
+        key = self._request_key(messages)
+        if key is None:
+            return await self._request_chat_completion(messages, max_retries, retry_delay, is_complete)
+        
+        key += (is_complete,)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._request_chat_completion(messages, max_retries, retry_delay, is_complete)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.logger.debug("合并相同的进行中AI请求")
+        
+        return await asyncio.shield(task)
+    
+    def _create_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        is_complete: Optional[Callable[[str], bool]]
+    ) -> str:
+        if is_complete is None:
+            response = self.client.chat.completions.create(
+                model=config.OPENAI_MODEL,
+                messages=messages
+            )
+            return response.choices[0].message.content
+        
+        stream = self.client.chat.completions.create(
+            model=config.OPENAI_MODEL,
+            messages=messages,
+            stream=True
+        )
+        text = ""
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    text += delta
+                    if is_complete(text):
+                        break
+        finally:
+            stream.close()
+        return text
+    
+    async def _request_chat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        max_retries: int,
+        retry_delay: int,
+        is_complete: Optional[Callable[[str], bool]] = None
     ) -> Optional[str]:
         self._ensure_initialized()
         
@@ -102,16 +169,12 @@ class AIService(metaclass=Singleton):
         while attempt < max_retries:
             attempt += 1
             try:
-                async def call_ai():
-                    return await asyncio.to_thread(
-                        self.client.chat.completions.create,
-                        model=config.OPENAI_MODEL,
-                        messages=messages
-                    )
-                
-                response = await asyncio.wait_for(call_ai(), timeout=60.0)
+                response_text = await asyncio.wait_for(
+                    asyncio.to_thread(self._create_completion, messages, is_complete),
+                    timeout=60.0
+                )
                 
-                ai_answer = response.choices[0].message.content.strip()
+                ai_answer = response_text.strip()
                 self.logger.info(f"AI回复: {ai_answer}")
                 return ai_answer
                 
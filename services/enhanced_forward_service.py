@@ -15,12 +15,15 @@ from models import TelegramMessage, Account
 from utils.singleton import Singleton
 from utils.logger import get_logger
 
+FORWARD_CONCURRENCY = 4
+
 
 class EnhancedForwardService(metaclass=Singleton):
     
     def __init__(self):
         self.logger = get_logger(__name__)
         self.temp_downloads: Dict[str, str] = {}
+        self._forward_semaphore = asyncio.Semaphore(FORWARD_CONCURRENCY)
         
     async def forward_message_enhanced(
         self,
@@ -33,25 +36,38 @@ class EnhancedForwardService(metaclass=Singleton):
         results = {}
         client = account.client
         
-        for target_id in target_ids:
+        direct_results = await asyncio.gather(
+            *(self._try_direct_forward_limited(client, message, target_id) for target_id in target_ids),
+            return_exceptions=True
+        )
+        
+        for target_id, success in zip(target_ids, direct_results):
+            if success is True:
+                results[target_id] = True
+                self.logger.info("直接转发成功到 %s", target_id)
+                continue
+            
             try:
-                success = await self._try_direct_forward(client, message, target_id)
-                if success:
-                    results[target_id] = True
-                    self.logger.info(f"直接转发成功到 {target_id}")
-                    continue
-                
                 success = await self._download_and_resend(
                     client, message, target_id, max_download_size_mb, download_folder
                 )
                 results[target_id] = success
                 
             except Exception as e:
-                self.logger.error(f"转发到 {target_id} 时出错: {e}")
+                self.logger.error("转发到 %s 时出错: %s", target_id, e)
                 results[target_id] = False
         
         return results
     
+    async def _try_direct_forward_limited(
+        self,
+        client: TelegramClient,
+        message: TelegramMessage,
+        target_id: int
+    ) -> bool:
+        async with self._forward_semaphore:
+            return await self._try_direct_forward(client, message, target_id)
+    
     async def _try_direct_forward(
         self, 
         client: TelegramClient, 
@@ -63,14 +79,14 @@ class EnhancedForwardService(metaclass=Singleton):
             return True
             
         except (ChatForwardsRestrictedError, MediaEmptyError) as e:
-            self.logger.info(f"直接转发到 {target_id} 受限制: {e}")
+            self.logger.info("直接转发到 %s 受限制: %s", target_id, e)
             return False
         except FloodWaitError as e:
-            self.logger.warning(f"转发频率限制，等待 {e.seconds} 秒")
+            self.logger.warning("转发频率限制，等待 %s 秒", e.seconds)
             await asyncio.sleep(e.seconds)
             return False
         except Exception as e:
-            self.logger.error(f"直接转发失败: {e}")
+            self.logger.error("直接转发失败: %s", e)
             return False
     
     async def _download_and_resend(
@@ -85,7 +101,7 @@ class EnhancedForwardService(metaclass=Singleton):
             if message.media and message.media.file_size_mb:
                 if max_download_size_mb and message.media.file_size_mb > max_download_size_mb:
                     self.logger.warning(
-                        f"文件大小 {message.media.file_size_mb:.2f}MB 超过限制 {max_download_size_mb}MB"
+                        "文件大小 %.2fMB 超过限制 %sMB", message.media.file_size_mb, max_download_size_mb
                     )
                     return False
             
@@ -98,7 +114,7 @@ class EnhancedForwardService(metaclass=Singleton):
                 return await self._send_text_message(client, message, target_id)
                 
         except Exception as e:
-            self.logger.error(f"下载重发失败: {e}")
+            self.logger.error("下载重发失败: %s", e)
             return False
     
     async def _download_and_send_media(
@@ -118,7 +134,7 @@ class EnhancedForwardService(metaclass=Singleton):
             file_name = message.media.file_name or f"file_{message.message_id}"
             file_path = download_path / file_name
             
-            self.logger.info(f"开始下载文件: {file_name}")
+            self.logger.info("开始下载文件: %s", file_name)
             downloaded_path = await original_message.download_media(file=str(file_path))
             
             if not downloaded_path:
@@ -128,11 +144,11 @@ class EnhancedForwardService(metaclass=Singleton):
             caption = message.text if message.text else None
             await client.send_file(target_id, downloaded_path, caption=caption)
             
-            self.logger.info(f"文件重发成功到 {target_id}: {file_name}")
+            self.logger.info("文件重发成功到 %s: %s", target_id, file_name)
             return True
             
         except Exception as e:
-            self.logger.error(f"下载媒体文件失败: {e}")
+            self.logger.error("下载媒体文件失败: %s", e)
             return False
         finally:
             if downloaded_path:
@@ -147,21 +163,21 @@ class EnhancedForwardService(metaclass=Singleton):
         try:
             if message.text:
                 await client.send_message(target_id, message.text)
-                self.logger.info(f"文本消息重发成功到 {target_id}")
+                self.logger.info("文本消息重发成功到 %s", target_id)
                 return True
             return False
             
         except Exception as e:
-            self.logger.error(f"发送文本消息失败: {e}")
+            self.logger.error("发送文本消息失败: %s", e)
             return False
     
     async def _cleanup_file(self, file_path: str):
         try:
             if os.path.exists(file_path):
                 os.remove(file_path)
-                self.logger.debug(f"已清理临时文件: {file_path}")
+                self.logger.debug("已清理临时文件: %s", file_path)
         except Exception as e:
-            self.logger.warning(f"清理临时文件失败: {e}")
+            self.logger.warning("清理临时文件失败: %s", e)
     
     async def cleanup_all_temp_files(self):
         for file_path in self.temp_downloads.values():
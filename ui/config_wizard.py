@@ -4,6 +4,7 @@
 """
 
 import json
+import re
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
@@ -18,6 +19,7 @@ from models.config import (
 from monitors import monitor_factory, AIMonitorBuilder
 from services import AIService
 from utils.logger import get_logger
+from utils.parsers import parse_int_list, parse_id_list, parse_id_lines, parse_str_list, parse_str_csv, parse_lines, parse_bool, parse_float, parse_int
 from utils.singleton import Singleton
 
 
@@ -62,6 +64,72 @@ class WizardSession:
             self.created_at = time.time()
 
 
+EDIT_START_STEPS = {
+    'keyword': WizardStepType.KEYWORD_CONFIG,
+    'file': WizardStepType.FILE_CONFIG,
+    'ai': WizardStepType.AI_CONFIG,
+    'button': WizardStepType.BUTTON_CONFIG,
+    'all_messages': WizardStepType.ALL_MESSAGES_CONFIG
+}
+
+WIZARD_LIST_FIELDS = {
+    'chats': ', ',
+    'forward_targets': ', ',
+    'users': '\n',
+    'blocked_users': '\n',
+    'blocked_channels': '\n',
+    'blocked_bots': '\n',
+    'bot_ids': '\n',
+    'channel_ids': '\n',
+    'group_ids': '\n',
+    'reply_texts': '\n'
+}
+
+WIZARD_STR_FIELDS = {
+    'keyword': '',
+    'chat_id': '',
+    'ai_prompt': '',
+    'ai_reply_prompt': '',
+    'button_keyword': '',
+    'file_extension': '',
+    'save_folder': '',
+    'log_file': '',
+    'execution_mode': 'merge',
+    'ai_model': 'gpt-4o',
+    'min_size': '',
+    'max_size': '',
+    'max_download_size_mb': '',
+    'max_executions': ''
+}
+
+WIZARD_FLOAT_FIELDS = {
+    'reply_delay_min': 0,
+    'reply_delay_max': 0,
+    'confidence_threshold': 0.7
+}
+
+WIZARD_ENUM_FIELDS = {
+    'match_type': 'partial',
+    'reply_mode': 'reply',
+    'mode': 'manual'
+}
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+WIZARD_BOOL_FIELDS = frozenset({'reply_enabled', 'email_notify', 'auto_forward', 'enhanced_forward', 'active'})
+
+WIZARD_SKIP_FIELDS = frozenset({'monitor_type', 'type', 'execution_count'})
+
+WIZARD_FLAG_FIELDS = {
+    'users': 'filter_users',
+    'bot_ids': 'filter_specific_ids',
+    'channel_ids': 'filter_specific_ids',
+    'group_ids': 'filter_specific_ids',
+    'save_folder': 'save_files',
+    'log_file': 'log_to_file'
+}
+
+
 class ConfigWizard(metaclass=Singleton):
 
     def __init__(self):
@@ -935,18 +1003,7 @@ class ConfigWizard(metaclass=Singleton):
 
             monitor_type = collected_data.get('monitor_type', 'keyword')
 
-            if monitor_type == 'keyword':
-                start_step = WizardStepType.KEYWORD_CONFIG
-            elif monitor_type == 'file':
-                start_step = WizardStepType.FILE_CONFIG
-            elif monitor_type == 'ai':
-                start_step = WizardStepType.AI_CONFIG
-            elif monitor_type == 'button':
-                start_step = WizardStepType.BUTTON_CONFIG
-            elif monitor_type == 'all_messages':
-                start_step = WizardStepType.ALL_MESSAGES_CONFIG
-            else:
-                start_step = WizardStepType.ACCOUNT_SETUP
+            start_step = EDIT_START_STEPS.get(monitor_type, WizardStepType.ACCOUNT_SETUP)
 
             session = WizardSession(
                 session_id=session_id,
@@ -1008,111 +1065,33 @@ class ConfigWizard(metaclass=Singleton):
                 data['monitor_type'] = 'keyword'
 
         for key, value in config.items():
-            if key == 'chats' and isinstance(value, list):
-                data['chats'] = ', '.join(str(chat) for chat in value)
-            elif key == 'forward_targets' and isinstance(value, list):
-                data['forward_targets'] = ', '.join(str(target) for target in value)
-            elif key == 'users' and isinstance(value, list):
-                data['users'] = '\n'.join(str(user) for user in value)
-                data['user_ids'] = '\n'.join(str(user) for user in value)
-                if value:
-                    data['filter_users'] = True
-            elif key == 'blocked_users' and isinstance(value, list):
-                data['blocked_users'] = '\n'.join(str(user) for user in value)
-            elif key == 'blocked_channels' and isinstance(value, list):
-                data['blocked_channels'] = '\n'.join(str(channel) for channel in value)
-            elif key == 'blocked_bots' and isinstance(value, list):
-                data['blocked_bots'] = '\n'.join(str(bot) for bot in value)
-            elif key == 'bot_ids' and isinstance(value, list):
-                data['bot_ids'] = '\n'.join(str(bot_id) for bot_id in value)
-                if value:
-                    data['filter_specific_ids'] = True
-            elif key == 'channel_ids' and isinstance(value, list):
-                data['channel_ids'] = '\n'.join(str(channel_id) for channel_id in value)
-                if value:
-                    data['filter_specific_ids'] = True
-            elif key == 'group_ids' and isinstance(value, list):
-                data['group_ids'] = '\n'.join(str(group_id) for group_id in value)
-                if value:
-                    data['filter_specific_ids'] = True
-            elif key == 'reply_texts' and isinstance(value, list):
-                data['reply_texts'] = '\n'.join(value) if value else ''
-
-            elif key == 'keyword':
-                data['keyword'] = str(value) if value else ''
-            elif key == 'chat_id':
-                data['chat_id'] = str(value) if value else ''
-            elif key == 'ai_prompt':
-                data['ai_prompt'] = str(value) if value else ''
-            elif key == 'ai_reply_prompt':
-                data['ai_reply_prompt'] = str(value) if value else ''
-            elif key == 'button_keyword':
-                data['button_keyword'] = str(value) if value else ''
-            elif key == 'file_extension':
-                data['file_extension'] = str(value) if value else ''
-            elif key == 'save_folder':
-                data['save_folder'] = str(value) if value else ''
-                if value:
-                    data['save_files'] = True
-            elif key == 'log_file':
-                data['log_file'] = str(value) if value else ''
-                if value:
-                    data['log_to_file'] = True
-            elif key == 'execution_mode':
-                data['execution_mode'] = str(value) if value else 'merge'
-            elif key == 'ai_model':
-                data['ai_model'] = str(value) if value else 'gpt-4o'
-
-            elif key == 'reply_delay_min':
-                data['reply_delay_min'] = float(value) if value is not None else 0
-            elif key == 'reply_delay_max':
-                data['reply_delay_max'] = float(value) if value is not None else 0
-            elif key == 'confidence_threshold':
-                data['confidence_threshold'] = float(value) if value is not None else 0.7
-            elif key == 'min_size':
-                data['min_size'] = str(value) if value else ''
-            elif key == 'max_size':
-                data['max_size'] = str(value) if value else ''
-            elif key == 'max_download_size_mb':
-                data['max_download_size_mb'] = str(value) if value else ''
-            elif key == 'max_executions':
-                data['max_executions'] = str(value) if value else ''
-            elif key == 'priority':
-                data['priority'] = int(value) if value is not None else 50
-
-            elif key == 'reply_enabled':
-                data['reply_enabled'] = bool(value)
-            elif key == 'email_notify':
-                data['email_notify'] = bool(value)
-            elif key == 'auto_forward':
-                data['auto_forward'] = bool(value)
-            elif key == 'enhanced_forward':
-                data['enhanced_forward'] = bool(value)
-            elif key == 'active':
-                data['active'] = bool(value)
-
-            elif key == 'match_type':
-                if hasattr(value, 'value'):
-                    data['match_type'] = value.value
-                else:
-                    data['match_type'] = str(value) if value else 'partial'
-            elif key == 'reply_mode':
+            if key in WIZARD_LIST_FIELDS and isinstance(value, list):
+                data[key] = WIZARD_LIST_FIELDS[key].join(str(item) for item in value)
+                if key == 'users':
+                    data['user_ids'] = data[key]
+            elif key in WIZARD_STR_FIELDS:
+                data[key] = str(value) if value else WIZARD_STR_FIELDS[key]
+            elif key in WIZARD_BOOL_FIELDS:
+                data[key] = bool(value)
+            elif key in WIZARD_FLOAT_FIELDS:
+                data[key] = float(value) if value is not None else WIZARD_FLOAT_FIELDS[key]
+            elif key in WIZARD_ENUM_FIELDS:
                 if hasattr(value, 'value'):
-                    data['reply_mode'] = value.value
+                    data[key] = value.value
                 else:
-                    data['reply_mode'] = str(value) if value else 'reply'
+                    data[key] = str(value) if value else WIZARD_ENUM_FIELDS[key]
+            elif key == 'priority':
+                data['priority'] = int(value) if value is not None else 50
             elif key == 'reply_content_type':
                 content_type = value.value if hasattr(value, 'value') else (str(value) if value else 'custom')
                 data['reply_type'] = content_type
                 data['reply_content_type'] = content_type
-            elif key == 'mode':
-                if hasattr(value, 'value'):
-                    data['mode'] = value.value
-                else:
-                    data['mode'] = str(value) if value else 'manual'
-
-            elif key not in ['monitor_type', 'type', 'execution_count']:
+            elif key not in WIZARD_SKIP_FIELDS:
                 data[key] = value
+                continue
+
+            if value and key in WIZARD_FLAG_FIELDS:
+                data[WIZARD_FLAG_FIELDS[key]] = True
 
         has_specific_ids = bool(config.get('bot_ids')) or \
                           bool(config.get('channel_ids')) or \
@@ -1130,10 +1109,10 @@ class ConfigWizard(metaclass=Singleton):
     def get_step_data(self, session_id: str) -> Dict[str, Any]:
         import copy
 
-        if session_id not in self.sessions:
+        session = self.sessions.get(session_id)
+        if session is None:
             raise ValueError("会话不存在")
 
-        session = self.sessions[session_id]
         step = self.steps[session.current_step]
 
         fields = self._process_dynamic_fields(step.fields, session)
@@ -1160,6 +1139,7 @@ class ConfigWizard(metaclass=Singleton):
     def _process_dynamic_fields(self, fields: List[Dict[str, Any]], session: WizardSession) -> List[Dict[str, Any]]:
         import copy
         processed_fields = []
+        collected_data = session.collected_data
 
         for field in fields:
             field_copy = copy.deepcopy(field)
@@ -1180,11 +1160,11 @@ class ConfigWizard(metaclass=Singleton):
 
                 should_show = True
                 for key, value in condition.items():
-                    collected_value = session.collected_data.get(key)
+                    collected_value = collected_data.get(key)
                     if isinstance(value, bool) and value:
-                        should_show = collected_value in (True, "on", "true", "1")
+                        should_show = parse_bool(collected_value)
                     elif isinstance(value, bool) and not value:
-                        should_show = collected_value not in (True, "on", "true", "1")
+                        should_show = not parse_bool(collected_value)
                     else:
                         should_show = collected_value == value
 
@@ -1200,15 +1180,16 @@ class ConfigWizard(metaclass=Singleton):
                     field_copy["value"] = self._generate_config_summary(session)
 
             field_name = field["name"]
-            if field_name in session.collected_data:
-                field_copy["value"] = session.collected_data[field_name]
+            if field_name in collected_data:
+                field_copy["value"] = collected_data[field_name]
                 self.logger.debug(f"恢复字段 {field_name} 的值: {field_copy['value']}")
 
             if field_name == "email_addresses":
                 current_value = field_copy.get("value", "")
 
-                if field_name in session.collected_data and session.collected_data[field_name]:
-                    field_copy["value"] = session.collected_data[field_name]
+                collected_email = collected_data.get(field_name)
+                if collected_email:
+                    field_copy["value"] = collected_email
                 elif not current_value or current_value.strip() == "":
                     try:
                         from utils.config import config as env_config
@@ -1268,7 +1249,8 @@ class ConfigWizard(metaclass=Singleton):
         try:
             self.logger.debug(f"处理步骤，session_id: {session_id}")
 
-            if session_id not in self.sessions:
+            session = self.sessions.get(session_id)
+            if session is None:
                 self.logger.warning(f"会话 {session_id} 不存在")
                 return {
                     "success": False,
@@ -1276,7 +1258,6 @@ class ConfigWizard(metaclass=Singleton):
                     "message": "会话已过期，请重新开始配置"
                 }
 
-            session = self.sessions[session_id]
             step = self.steps[session.current_step]
 
             errors = self._validate_step_data(step, step_data)
@@ -1290,18 +1271,19 @@ class ConfigWizard(metaclass=Singleton):
                 }
 
 
-            monitor_type = session.collected_data.get('monitor_type')
-            account_id = session.collected_data.get('account_id')
-            edit_key = session.collected_data.get('edit_key')
+            collected_data = session.collected_data
+            monitor_type = collected_data.get('monitor_type')
+            account_id = collected_data.get('account_id')
+            edit_key = collected_data.get('edit_key')
 
-            session.collected_data.update(step_data)
+            collected_data.update(step_data)
 
             if monitor_type and 'monitor_type' not in step_data:
-                session.collected_data['monitor_type'] = monitor_type
+                collected_data['monitor_type'] = monitor_type
             if account_id and 'account_id' not in step_data:
-                session.collected_data['account_id'] = account_id
+                collected_data['account_id'] = account_id
             if edit_key and 'edit_key' not in step_data:
-                session.collected_data['edit_key'] = edit_key
+                collected_data['edit_key'] = edit_key
 
             session.completed_steps.append(session.current_step)
 
@@ -1328,14 +1310,14 @@ class ConfigWizard(metaclass=Singleton):
 
     def go_to_previous_step(self, session_id: str) -> Dict[str, Any]:
         try:
-            if session_id not in self.sessions:
+            session = self.sessions.get(session_id)
+            if session is None:
                 return {
                     "success": False,
                     "errors": ["会话已过期"],
                     "message": "会话已过期"
                 }
 
-            session = self.sessions[session_id]
 
             if session.completed_steps:
                 last_step = session.completed_steps.pop()
@@ -1377,7 +1359,7 @@ class ConfigWizard(metaclass=Singleton):
             if "required_if" in rules:
                 condition = rules["required_if"]
                 should_require = all(
-                    (data.get(k) in (True, "on", "true", "1") if isinstance(v, bool) and v else data.get(k) == v)
+                    (parse_bool(data.get(k)) if isinstance(v, bool) and v else data.get(k) == v)
                     for k, v in condition.items()
                 )
                 if should_require and not value:
@@ -1390,24 +1372,23 @@ class ConfigWizard(metaclass=Singleton):
                     errors.append(f"{field_name}长度不能少于{rules['min_length']}个字符")
 
                 if rules.get("email_format"):
-                    import re
-                    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-                    if not re.match(email_pattern, value):
+                    if not EMAIL_PATTERN.match(value):
                         errors.append(f"{field_name}邮箱格式不正确")
 
         return errors
 
     def _get_next_step(self, step: WizardStep, step_data: Dict[str, Any]) -> Optional[WizardStepType]:
         if step.conditional_next:
-            if "monitor_type" in step_data:
-                monitor_type = step_data.get("monitor_type")
-                if monitor_type in step.conditional_next:
-                    return step.conditional_next[monitor_type]
+            monitor_type = step_data.get("monitor_type")
+            if monitor_type is not None:
+                next_step = step.conditional_next.get(monitor_type)
+                if next_step is not None:
+                    return next_step
 
-            if "auto_forward" in step_data:
-                auto_forward = step_data.get("auto_forward")
-                if auto_forward in (True, "on", "true", "1") and "auto_forward" in step.conditional_next:
-                    return step.conditional_next["auto_forward"]
+            if parse_bool(step_data.get("auto_forward")):
+                next_step = step.conditional_next.get("auto_forward")
+                if next_step is not None:
+                    return next_step
 
         return step.next_step
 
@@ -1441,8 +1422,7 @@ class ConfigWizard(metaclass=Singleton):
                 monitor_key = f"keyword_{data['keyword']}"
 
             elif monitor_type == "file":
-                extensions_str = data.get("file_extension", "")
-                extensions = [ext.strip() for ext in extensions_str.split(",") if ext.strip()]
+                extensions = parse_str_list(data.get("file_extension", ""))
 
                 if not extensions:
                     return {
@@ -1518,34 +1498,17 @@ class ConfigWizard(metaclass=Singleton):
             }
 
     def _create_keyword_config(self, data: Dict[str, Any]) -> KeywordConfig:
-        chats = []
-        chats_str = data.get('chats', '')
-        if chats_str:
-            for chat in chats_str.split(','):
-                chat = chat.strip()
-                if chat:
-                    try:
-                        chats.append(int(chat))
-                    except ValueError:
-                        chats.append(chat)
+        chats = parse_id_list(data.get('chats', ''))
 
         forward_targets = []
         if data.get('auto_forward'):
-            targets_str = data.get('forward_targets', '')
-            if targets_str:
-                for target in targets_str.split(','):
-                    target = target.strip()
-                    if target:
-                        try:
-                            forward_targets.append(int(target))
-                        except ValueError:
-                            forward_targets.append(target)
+            forward_targets = parse_id_list(data.get('forward_targets', ''))
 
         reply_texts = []
         if data.get('reply_enabled'):
             texts_str = data.get('reply_texts', '')
             if texts_str:
-                reply_texts = [text.strip() for text in texts_str.split('\n') if text.strip()]
+                reply_texts = parse_lines(texts_str)
 
         reply_type = data.get('reply_type', 'keyword')
         if reply_type == 'keyword':
@@ -1556,10 +1519,10 @@ class ConfigWizard(metaclass=Singleton):
         config = KeywordConfig(
             keyword=data.get('keyword', ''),
             match_type=MatchType(data.get('match_type', 'partial')),
-            chats=chats,
+            chats=list(dict.fromkeys(chats)),
             email_notify=data.get('email_notify', False),
             auto_forward=data.get('auto_forward', False),
-            forward_targets=forward_targets,
+            forward_targets=list(dict.fromkeys(forward_targets)),
             enhanced_forward=data.get('enhanced_forward', False),
             max_download_size_mb=float(data.get('max_download_size_mb')) if data.get('max_download_size_mb') and data.get('max_download_size_mb').strip() else None,
             log_file=data.get('log_file') if data.get('log_file') else None,
@@ -1576,71 +1539,25 @@ class ConfigWizard(metaclass=Singleton):
         )
 
         if data.get('filter_users'):
-            users = []
-            users_str = data.get('users', '')
-            if users_str:
-                for user in users_str.split('\n'):
-                    user = user.strip()
-                    if user:
-                        users.append(user)
+            users = parse_lines(data.get('users', ''))
             config.users = users
 
-        blocked_users = []
-        blocked_users_str = data.get('blocked_users', '')
-        if blocked_users_str:
-            for user in blocked_users_str.split('\n'):
-                user = user.strip()
-                if user:
-                    blocked_users.append(user)
+        blocked_users = parse_str_list(data.get('blocked_users', ''))
         config.blocked_users = blocked_users
 
-        blocked_channels = []
-        blocked_channels_str = data.get('blocked_channels', '')
-        if blocked_channels_str:
-            for channel in blocked_channels_str.split('\n'):
-                channel = channel.strip()
-                if channel:
-                    try:
-                        blocked_channels.append(int(channel))
-                    except ValueError:
-                        pass
+        blocked_channels = parse_int_list(data.get('blocked_channels', ''))
         config.blocked_channels = blocked_channels
 
-        blocked_bots = []
-        blocked_bots_str = data.get('blocked_bots', '')
-        if blocked_bots_str:
-            for bot in blocked_bots_str.split('\n'):
-                bot = bot.strip()
-                if bot:
-                    try:
-                        blocked_bots.append(int(bot))
-                    except ValueError:
-                        pass
+        blocked_bots = parse_int_list(data.get('blocked_bots', ''))
 
         filter_mode = data.get("filter_mode", "blacklist")
 
         if filter_mode == "specific_ids":
-            user_ids = []
-            if data.get("user_ids"):
-                for line in data["user_ids"].split("\n"):
-                    line = line.strip()
-                    if line:
-                        try:
-                            user_ids.append(int(line))
-                        except ValueError:
-                            user_ids.append(line)
+            user_ids = parse_id_list(data.get("user_ids", ""))
             config.users = user_ids
             config.user_option = '1'
 
-            bot_ids = []
-            if data.get("bot_ids"):
-                for line in data["bot_ids"].split("\n"):
-                    line = line.strip()
-                    if line:
-                        try:
-                            bot_ids.append(int(line))
-                        except ValueError:
-                            pass
+            bot_ids = parse_int_list(data.get("bot_ids", ""))
             config.bot_ids = bot_ids
 
             channel_ids = []
@@ -1684,144 +1601,50 @@ class ConfigWizard(metaclass=Singleton):
         return config
 
     def _create_file_config(self, data: Dict[str, Any]) -> FileConfig:
-        chats_str = data.get("chats", "")
-        chat_ids = []
+        chat_ids = parse_int_list(data.get("chats", ""))
 
-        if chats_str:
-            for chat in chats_str.split(","):
-                chat = chat.strip()
-                if chat:
-                    try:
-                        chat_ids.append(int(chat))
-                    except ValueError:
-                        pass
-
-        extensions_str = data.get("file_extension", "")
-        extensions = [ext.strip() for ext in extensions_str.split(",") if ext.strip()]
-
-        auto_forward = data.get("auto_forward") in (True, "on", "true", "1")
-        email_notify = data.get("email_notify") in (True, "on", "true", "1")
-        enhanced_forward = data.get("enhanced_forward") in (True, "on", "true", "1")
-        save_files = data.get("save_files") in (True, "on", "true", "1")
-        filter_users = data.get("filter_users") in (True, "on", "true", "1")
-        log_to_file = data.get("log_to_file") in (True, "on", "true", "1")
-        filter_specific_ids = data.get("filter_specific_ids") in (True, "on", "true", "1")
+        extensions = parse_str_list(data.get("file_extension", ""))
+
+        auto_forward = parse_bool(data.get("auto_forward"))
+        email_notify = parse_bool(data.get("email_notify"))
+        enhanced_forward = parse_bool(data.get("enhanced_forward"))
+        save_files = parse_bool(data.get("save_files"))
+        filter_users = parse_bool(data.get("filter_users"))
+        log_to_file = parse_bool(data.get("log_to_file"))
+        filter_specific_ids = parse_bool(data.get("filter_specific_ids"))
         filter_mode = data.get("filter_mode", "blacklist")
 
-        users = []
-        if filter_users and data.get("users"):
-            for line in data["users"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        users.append(int(line))
-                    except ValueError:
-                        users.append(line)
+        users = parse_id_lines(data.get("users", "")) if filter_users else []
 
         if filter_mode == "specific_ids" and data.get("user_ids"):
-            for line in data["user_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        users.append(int(line))
-                    except ValueError:
-                        users.append(line)
-
-        blocked_users = [line.strip() for line in data.get("blocked_users", "").split("\n") if line.strip()]
-        blocked_channels = []
-        if data.get("blocked_channels"):
-            for line in data["blocked_channels"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_channels.append(int(line))
-                    except ValueError:
-                        pass
-
-        blocked_bots = []
-        if data.get("blocked_bots"):
-            for line in data["blocked_bots"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_bots.append(int(line))
-                    except ValueError:
-                        pass
-
-        bot_ids = []
-        if filter_specific_ids and data.get("bot_ids"):
-            for line in data["bot_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        bot_ids.append(int(line))
-                    except ValueError:
-                        pass
-
-        channel_ids = []
-        if filter_specific_ids and data.get("channel_ids"):
-            for line in data["channel_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        channel_ids.append(int(line))
-                    except ValueError:
-                        pass
-
-        group_ids = []
-        if filter_specific_ids and data.get("group_ids"):
-            for line in data["group_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        group_ids.append(int(line))
-                    except ValueError:
-                        pass
+            users.extend(parse_id_list(data["user_ids"]))
 
-        forward_targets = []
-        if auto_forward and data.get("forward_targets"):
-            targets_str = data.get("forward_targets", "")
-            for target in targets_str.split(","):
-                target = target.strip()
-                if target:
-                    try:
-                        forward_targets.append(int(target))
-                    except ValueError:
-                        pass
+        blocked_users = parse_str_list(data.get("blocked_users", ""))
+        blocked_channels = parse_int_list(data.get("blocked_channels", ""))
 
-        min_size = None
-        if data.get("min_size_kb") and str(data.get("min_size_kb")).strip():
-            try:
-                min_size = float(data["min_size_kb"]) / 1024
-            except (ValueError, TypeError):
-                min_size = None
+        blocked_bots = parse_int_list(data.get("blocked_bots", ""))
 
-        max_size = None
-        if data.get("max_size_mb") and str(data.get("max_size_mb")).strip():
-            try:
-                max_size = float(data["max_size_mb"])
-            except (ValueError, TypeError):
-                max_size = None
+        bot_ids = parse_int_list(data.get("bot_ids", "")) if filter_specific_ids else []
 
-        max_download_size = None
-        if data.get("max_download_size"):
-            try:
-                max_download_size = float(data["max_download_size"])
-            except (ValueError, TypeError):
-                max_download_size = None
+        channel_ids = parse_int_list(data.get("channel_ids", "")) if filter_specific_ids else []
 
-        max_executions = None
-        if data.get("max_executions") and str(data.get("max_executions")).strip():
-            try:
-                max_executions = int(data["max_executions"])
-            except (ValueError, TypeError):
-                max_executions = None
+        group_ids = parse_int_list(data.get("group_ids", "")) if filter_specific_ids else []
+
+        forward_targets = parse_int_list(data.get("forward_targets", "")) if auto_forward else []
+
+        min_size = parse_float(data.get("min_size_kb"), scale=1 / 1024)
+
+        max_size = parse_float(data.get("max_size_mb"))
+
+        max_download_size = parse_float(data.get("max_download_size"))
+
+        max_executions = parse_int(data.get("max_executions"))
 
         configs = []
         for ext in extensions:
             config = FileConfig(
                 file_extension=ext,
-                chats=chat_ids,
+                chats=list(dict.fromkeys(chat_ids)),
                 users=users,
                 blocked_users=blocked_users,
                 blocked_channels=blocked_channels,
@@ -1834,7 +1657,7 @@ class ConfigWizard(metaclass=Singleton):
                 max_size=max_size,
                 email_notify=email_notify,
                 auto_forward=auto_forward,
-                forward_targets=forward_targets,
+                forward_targets=list(dict.fromkeys(forward_targets)),
                 enhanced_forward=enhanced_forward,
                 max_download_size_mb=max_download_size,
                 max_executions=max_executions,
@@ -1847,65 +1670,36 @@ class ConfigWizard(metaclass=Singleton):
         return configs[0] if configs else FileConfig()
 
     def _create_ai_monitor(self, data: Dict[str, Any]):
-        chats_str = data.get("chats", "")
-        chat_ids = []
-
-        if chats_str:
-            for chat in chats_str.split(","):
-                chat = chat.strip()
-                if chat:
-                    try:
-                        chat_ids.append(int(chat))
-                    except ValueError:
-                        pass
+        chat_ids = parse_int_list(data.get("chats", ""))
 
-        auto_forward = data.get("auto_forward") in (True, "on", "true", "1")
-        email_notify = data.get("email_notify") in (True, "on", "true", "1")
-        enhanced_forward = data.get("enhanced_forward") in (True, "on", "true", "1")
-        reply_enabled = data.get("reply_enabled") in (True, "on", "true", "1")
+        auto_forward = parse_bool(data.get("auto_forward"))
+        email_notify = parse_bool(data.get("email_notify"))
+        enhanced_forward = parse_bool(data.get("enhanced_forward"))
+        reply_enabled = parse_bool(data.get("reply_enabled"))
 
-        forward_targets = []
-        if auto_forward and data.get("forward_targets"):
-            targets_str = data.get("forward_targets", "")
-            for target in targets_str.split(","):
-                target = target.strip()
-                if target:
-                    try:
-                        forward_targets.append(int(target))
-                    except ValueError:
-                        pass
+        forward_targets = parse_int_list(data.get("forward_targets", "")) if auto_forward else []
 
-        confidence_threshold = 0.7
-        if data.get("confidence_threshold"):
-            try:
-                confidence_threshold = float(data["confidence_threshold"])
-            except (ValueError, TypeError):
-                confidence_threshold = 0.7
+        confidence_threshold = parse_float(data.get("confidence_threshold"), 0.7)
 
         builder = AIMonitorBuilder()
         builder.with_prompt(data.get("ai_prompt", ""))
-        builder.with_chats(chat_ids)
+        builder.with_chats(list(dict.fromkeys(chat_ids)))
         builder.with_confidence_threshold(confidence_threshold)
 
         if email_notify:
             builder.with_email_notify(True)
 
         if auto_forward:
-            builder.with_auto_forward(True, forward_targets)
+            builder.with_auto_forward(True, list(dict.fromkeys(forward_targets)))
 
         if enhanced_forward:
-            max_size = None
-            if data.get("max_download_size"):
-                try:
-                    max_size = float(data["max_download_size"])
-                except (ValueError, TypeError):
-                    max_size = None
+            max_size = parse_float(data.get("max_download_size"))
             builder.with_enhanced_forward(True, max_size)
 
         if reply_enabled:
             reply_texts = []
             if data.get("reply_texts"):
-                reply_texts = [line.strip() for line in data["reply_texts"].split("\n") if line.strip()]
+                reply_texts = parse_lines(data["reply_texts"])
 
             reply_delay_min = 0
             reply_delay_max = 5
@@ -1925,116 +1719,39 @@ class ConfigWizard(metaclass=Singleton):
         return builder.build()
 
     def _create_button_config(self, data: Dict[str, Any]) -> ButtonConfig:
-        chats_str = data.get("chats", "")
-        chat_ids = []
+        chat_ids = parse_int_list(data.get("chats", ""))
 
-        if chats_str:
-            for chat in chats_str.split(","):
-                chat = chat.strip()
-                if chat:
-                    try:
-                        chat_ids.append(int(chat))
-                    except ValueError:
-                        pass
-
-        auto_forward = data.get("auto_forward") in (True, "on", "true", "1")
-        email_notify = data.get("email_notify") in (True, "on", "true", "1")
-        enhanced_forward = data.get("enhanced_forward") in (True, "on", "true", "1")
-        filter_users = data.get("filter_users") in (True, "on", "true", "1")
-        log_to_file = data.get("log_to_file") in (True, "on", "true", "1")
-        filter_specific_ids = data.get("filter_specific_ids") in (True, "on", "true", "1")
-
-        users = []
-        if filter_users and data.get("users"):
-            for line in data["users"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        users.append(int(line))
-                    except ValueError:
-                        users.append(line)
-
-        blocked_users = [line.strip() for line in data.get("blocked_users", "").split("\n") if line.strip()]
-        blocked_channels = []
-        if data.get("blocked_channels"):
-            for line in data["blocked_channels"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_channels.append(int(line))
-                    except ValueError:
-                        pass
-
-        blocked_bots = []
-        if data.get("blocked_bots"):
-            for line in data["blocked_bots"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_bots.append(int(line))
-                    except ValueError:
-                        pass
-
-        bot_ids = []
-        if filter_specific_ids and data.get("bot_ids"):
-            for line in data["bot_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        bot_ids.append(int(line))
-                    except ValueError:
-                        pass
-
-        channel_ids = []
-        if filter_specific_ids and data.get("channel_ids"):
-            for line in data["channel_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        channel_ids.append(int(line))
-                    except ValueError:
-                        pass
-
-        group_ids = []
-        if filter_specific_ids and data.get("group_ids"):
-            for line in data["group_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        group_ids.append(int(line))
-                    except ValueError:
-                        pass
+        auto_forward = parse_bool(data.get("auto_forward"))
+        email_notify = parse_bool(data.get("email_notify"))
+        enhanced_forward = parse_bool(data.get("enhanced_forward"))
+        filter_users = parse_bool(data.get("filter_users"))
+        log_to_file = parse_bool(data.get("log_to_file"))
+        filter_specific_ids = parse_bool(data.get("filter_specific_ids"))
 
-        forward_targets = []
-        if auto_forward and data.get("forward_targets"):
-            targets_str = data.get("forward_targets", "")
-            for target in targets_str.split(","):
-                target = target.strip()
-                if target:
-                    try:
-                        forward_targets.append(int(target))
-                    except ValueError:
-                        pass
+        users = parse_id_lines(data.get("users", "")) if filter_users else []
 
-        max_executions = None
-        if data.get("max_executions"):
-            try:
-                max_executions = int(data["max_executions"])
-            except (ValueError, TypeError):
-                max_executions = None
+        blocked_users = parse_str_list(data.get("blocked_users", ""))
+        blocked_channels = parse_int_list(data.get("blocked_channels", ""))
 
-        max_download_size = None
-        if data.get("max_download_size"):
-            try:
-                max_download_size = float(data["max_download_size"])
-            except (ValueError, TypeError):
-                max_download_size = None
+        blocked_bots = parse_int_list(data.get("blocked_bots", ""))
+
+        bot_ids = parse_int_list(data.get("bot_ids", "")) if filter_specific_ids else []
+
+        channel_ids = parse_int_list(data.get("channel_ids", "")) if filter_specific_ids else []
+
+        group_ids = parse_int_list(data.get("group_ids", "")) if filter_specific_ids else []
+
+        forward_targets = parse_int_list(data.get("forward_targets", "")) if auto_forward else []
+
+        max_executions = parse_int(data.get("max_executions"))
+
+        max_download_size = parse_float(data.get("max_download_size"))
 
         return ButtonConfig(
             button_keyword=data.get("button_keyword", ""),
             mode=MonitorMode(data.get("mode", "manual")),
             ai_prompt=data.get("ai_prompt", ""),
-            chats=chat_ids,
+            chats=list(dict.fromkeys(chat_ids)),
             users=users,
             blocked_users=blocked_users,
             blocked_channels=blocked_channels,
@@ -2044,7 +1761,7 @@ class ConfigWizard(metaclass=Singleton):
             group_ids=group_ids,
             email_notify=email_notify,
             auto_forward=auto_forward,
-            forward_targets=forward_targets,
+            forward_targets=list(dict.fromkeys(forward_targets)),
             enhanced_forward=enhanced_forward,
             max_download_size_mb=max_download_size,
             max_executions=max_executions,
@@ -2054,129 +1771,47 @@ class ConfigWizard(metaclass=Singleton):
         )
 
     def _create_image_button_config(self, data: Dict[str, Any]):
-        chats_str = data.get("chats", "")
-        chat_ids = []
+        chat_ids = parse_int_list(data.get("chats", ""))
 
-        if chats_str:
-            for chat in chats_str.split(","):
-                chat = chat.strip()
-                if chat:
-                    try:
-                        chat_ids.append(int(chat))
-                    except ValueError:
-                        pass
-
-        auto_forward = data.get("auto_forward") in (True, "on", "true", "1")
-        email_notify = data.get("email_notify") in (True, "on", "true", "1")
-        enhanced_forward = data.get("enhanced_forward") in (True, "on", "true", "1")
-        download_images = data.get("download_images") in (True, "on", "true", "1")
-        filter_users = data.get("filter_users") in (True, "on", "true", "1")
-        log_to_file = data.get("log_to_file") in (True, "on", "true", "1")
-        filter_specific_ids = data.get("filter_specific_ids") in (True, "on", "true", "1")
+        auto_forward = parse_bool(data.get("auto_forward"))
+        email_notify = parse_bool(data.get("email_notify"))
+        enhanced_forward = parse_bool(data.get("enhanced_forward"))
+        download_images = parse_bool(data.get("download_images"))
+        filter_users = parse_bool(data.get("filter_users"))
+        log_to_file = parse_bool(data.get("log_to_file"))
+        filter_specific_ids = parse_bool(data.get("filter_specific_ids"))
 
         button_keywords = []
         if data.get("button_keywords"):
-            button_keywords = [kw.strip() for kw in data["button_keywords"].split(",") if kw.strip()]
+            button_keywords = parse_str_csv(data["button_keywords"])
 
-        confidence_threshold = 0.7
-        if data.get("confidence_threshold"):
-            try:
-                confidence_threshold = float(data["confidence_threshold"])
-            except (ValueError, TypeError):
-                confidence_threshold = 0.7
+        confidence_threshold = parse_float(data.get("confidence_threshold"), 0.7)
 
-        users = []
-        if filter_users and data.get("users"):
-            for line in data["users"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        users.append(int(line))
-                    except ValueError:
-                        users.append(line)
-
-        blocked_users = [line.strip() for line in data.get("blocked_users", "").split("\n") if line.strip()]
-        blocked_channels = []
-        if data.get("blocked_channels"):
-            for line in data["blocked_channels"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_channels.append(int(line))
-                    except ValueError:
-                        pass
-
-        blocked_bots = []
-        if data.get("blocked_bots"):
-            for line in data["blocked_bots"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_bots.append(int(line))
-                    except ValueError:
-                        pass
-
-        bot_ids = []
-        if filter_specific_ids and data.get("bot_ids"):
-            for line in data["bot_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        bot_ids.append(int(line))
-                    except ValueError:
-                        pass
-
-        channel_ids = []
-        if filter_specific_ids and data.get("channel_ids"):
-            for line in data["channel_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        channel_ids.append(int(line))
-                    except ValueError:
-                        pass
-
-        group_ids = []
-        if filter_specific_ids and data.get("group_ids"):
-            for line in data["group_ids"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        group_ids.append(int(line))
-                    except ValueError:
-                        pass
+        users = parse_id_lines(data.get("users", "")) if filter_users else []
 
-        forward_targets = []
-        if auto_forward and data.get("forward_targets"):
-            targets_str = data.get("forward_targets", "")
-            for target in targets_str.split(","):
-                target = target.strip()
-                if target:
-                    try:
-                        forward_targets.append(int(target))
-                    except ValueError:
-                        pass
+        blocked_users = parse_str_list(data.get("blocked_users", ""))
+        blocked_channels = parse_int_list(data.get("blocked_channels", ""))
 
-        max_executions = None
-        if data.get("max_executions"):
-            try:
-                max_executions = int(data["max_executions"])
-            except (ValueError, TypeError):
-                max_executions = None
+        blocked_bots = parse_int_list(data.get("blocked_bots", ""))
 
-        max_download_size = None
-        if data.get("max_download_size"):
-            try:
-                max_download_size = float(data["max_download_size"])
-            except (ValueError, TypeError):
-                max_download_size = None
+        bot_ids = parse_int_list(data.get("bot_ids", "")) if filter_specific_ids else []
+
+        channel_ids = parse_int_list(data.get("channel_ids", "")) if filter_specific_ids else []
+
+        group_ids = parse_int_list(data.get("group_ids", "")) if filter_specific_ids else []
+
+        forward_targets = parse_int_list(data.get("forward_targets", "")) if auto_forward else []
+
+        max_executions = parse_int(data.get("max_executions"))
+
+        max_download_size = parse_float(data.get("max_download_size"))
 
         return ImageButtonConfig(
             ai_prompt=data.get("image_ai_prompt", "分析图片和按钮内容，判断是否需要点击某个按钮"),
             button_keywords=button_keywords,
             download_images=download_images,
             confidence_threshold=confidence_threshold,
-            chats=chat_ids,
+            chats=list(dict.fromkeys(chat_ids)),
             users=users,
             blocked_users=blocked_users,
             blocked_channels=blocked_channels,
@@ -2186,7 +1821,7 @@ class ConfigWizard(metaclass=Singleton):
             group_ids=group_ids,
             email_notify=email_notify,
             auto_forward=auto_forward,
-            forward_targets=forward_targets,
+            forward_targets=list(dict.fromkeys(forward_targets)),
             enhanced_forward=enhanced_forward,
             max_download_size_mb=max_download_size,
             max_executions=max_executions,
@@ -2203,72 +1838,29 @@ class ConfigWizard(metaclass=Singleton):
             except ValueError:
                 pass
 
-        auto_forward = data.get("auto_forward") in (True, "on", "true", "1")
-        email_notify = data.get("email_notify") in (True, "on", "true", "1")
-        enhanced_forward = data.get("enhanced_forward") in (True, "on", "true", "1")
-        reply_enabled = data.get("reply_enabled") in (True, "on", "true", "1")
-        filter_users = data.get("filter_users") in (True, "on", "true", "1")
-        log_to_file = data.get("log_to_file") in (True, "on", "true", "1")
+        auto_forward = parse_bool(data.get("auto_forward"))
+        email_notify = parse_bool(data.get("email_notify"))
+        enhanced_forward = parse_bool(data.get("enhanced_forward"))
+        reply_enabled = parse_bool(data.get("reply_enabled"))
+        filter_users = parse_bool(data.get("filter_users"))
+        log_to_file = parse_bool(data.get("log_to_file"))
 
         reply_texts = []
         if reply_enabled and data.get("reply_texts"):
-            reply_texts = [line.strip() for line in data["reply_texts"].split("\n") if line.strip()]
+            reply_texts = parse_lines(data["reply_texts"])
 
-        users = []
-        if filter_users and data.get("users"):
-            for line in data["users"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        users.append(int(line))
-                    except ValueError:
-                        users.append(line)
-
-        blocked_users = [line.strip() for line in data.get("blocked_users", "").split("\n") if line.strip()]
-        blocked_channels = []
-        if data.get("blocked_channels"):
-            for line in data["blocked_channels"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_channels.append(int(line))
-                    except ValueError:
-                        pass
-
-        blocked_bots = []
-        if data.get("blocked_bots"):
-            for line in data["blocked_bots"].split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        blocked_bots.append(int(line))
-                    except ValueError:
-                        pass
+        users = parse_id_lines(data.get("users", "")) if filter_users else []
 
-        forward_targets = []
-        if auto_forward and data.get("forward_targets"):
-            targets_str = data.get("forward_targets", "")
-            for target in targets_str.split(","):
-                target = target.strip()
-                if target:
-                    try:
-                        forward_targets.append(int(target))
-                    except ValueError:
-                        pass
+        blocked_users = parse_str_list(data.get("blocked_users", ""))
+        blocked_channels = parse_int_list(data.get("blocked_channels", ""))
 
-        max_executions = None
-        if data.get("max_executions"):
-            try:
-                max_executions = int(data["max_executions"])
-            except (ValueError, TypeError):
-                max_executions = None
+        blocked_bots = parse_int_list(data.get("blocked_bots", ""))
 
-        max_download_size = None
-        if data.get("max_download_size"):
-            try:
-                max_download_size = float(data["max_download_size"])
-            except (ValueError, TypeError):
-                max_download_size = None
+        forward_targets = parse_int_list(data.get("forward_targets", "")) if auto_forward else []
+
+        max_executions = parse_int(data.get("max_executions"))
+
+        max_download_size = parse_float(data.get("max_download_size"))
 
         reply_delay_min = 0
         reply_delay_max = 0
@@ -2289,7 +1881,7 @@ class ConfigWizard(metaclass=Singleton):
             blocked_bots=blocked_bots,
             email_notify=email_notify,
             auto_forward=auto_forward,
-            forward_targets=forward_targets,
+            forward_targets=list(dict.fromkeys(forward_targets)),
             enhanced_forward=enhanced_forward,
             max_download_size_mb=max_download_size,
             reply_enabled=reply_enabled,
@@ -2306,8 +1898,7 @@ class ConfigWizard(metaclass=Singleton):
         )
 
     def _cleanup_session(self, session_id: str):
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        self.sessions.pop(session_id, None)
 
     def force_new_session(self, session_id: str) -> Dict[str, Any]:
         self._cleanup_session(session_id)
@@ -2331,18 +1922,11 @@ class ConfigWizard(metaclass=Singleton):
         ]
 
     def validate_email_list(self, email_text: str) -> Dict[str, Any]:
-        import re
-        
-        if not email_text or not email_text.strip():
+        emails = parse_lines(email_text)
+        if not emails:
             return {"valid": False, "message": "请输入至少一个邮箱地址"}
         
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        emails = [email.strip() for email in email_text.strip().split('\n') if email.strip()]
-        
-        invalid_emails = []
-        for email in emails:
-            if not re.match(email_pattern, email):
-                invalid_emails.append(email)
+        invalid_emails = [email for email in emails if not EMAIL_PATTERN.match(email)]
         
         if invalid_emails:
             return {
@@ -6,12 +6,10 @@ Web应用主文件
 import asyncio
 import json
 import secrets
-import pytz
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from datetime import datetime
 import io
-from apscheduler.triggers.cron import CronTrigger
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Form, HTTPException, Depends, Cookie
 from fastapi.staticfiles import StaticFiles
@@ -26,7 +24,8 @@ from models import Account, AccountConfig
 from models.config import KeywordConfig, FileConfig, AIMonitorConfig, MatchType, ScheduledMessageConfig
 from monitors import monitor_factory, AIMonitorBuilder
 from services import AIService
-from utils.logger import get_logger
+from utils.logger import get_logger, flush_log_handlers
+from utils.parsers import parse_int_list, parse_str_csv, parse_bool, parse_float
 from .status_monitor import StatusMonitor
 from .config_wizard import ConfigWizard
 
@@ -283,7 +282,7 @@ class WebApp:
         async def wizard_page(request: Request):
             user = self.get_current_user(request)
             monitor_type = request.query_params.get('type', 'keyword')
-            edit_mode = request.query_params.get('edit', 'false').lower() == 'true'
+            edit_mode = parse_bool(request.query_params.get('edit', 'false'))
             edit_key = request.query_params.get('key', '')
             edit_config = request.query_params.get('config', '{}')
             
@@ -356,10 +355,9 @@ class WebApp:
                 account_count = len(accounts_list)
                 
                 monitor_count = 0
+                engine_monitors = self.monitor_engine.monitors
                 for account in accounts_list:
-                    account_id = account.account_id
-                    if account_id in self.monitor_engine.monitors:
-                        monitor_count += len(self.monitor_engine.monitors[account_id])
+                    monitor_count += len(engine_monitors.get(account.account_id, ()))
                 
                 return {
                     "success": True,
@@ -456,9 +454,7 @@ class WebApp:
                 accounts_info = []
                 
                 for account in accounts_list:
-                    monitor_count = 0
-                    if account.account_id in self.monitor_engine.monitors:
-                        monitor_count = len(self.monitor_engine.monitors[account.account_id])
+                    monitor_count = len(self.monitor_engine.monitors.get(account.account_id, ()))
                     
                     is_valid, status = await account.check_validity()
                     status_display = account.get_status_display(status)
@@ -677,23 +673,22 @@ class WebApp:
                 data = await request.json()
                 active = data.get('active', True)
                 
-                if account_id in self.monitor_engine.monitors:
-                    monitors = self.monitor_engine.monitors[account_id]
-                    for i, monitor in enumerate(monitors):
-                        generated_key = f"{monitor.__class__.__name__}_{i}"
+                monitors = self.monitor_engine.monitors.get(account_id, ())
+                for i, monitor in enumerate(monitors):
+                    generated_key = f"{monitor.__class__.__name__}_{i}"
+                    
+                    if generated_key == monitor_key:
+                        monitor.config.active = active
+                        self.monitor_engine._save_monitors()
+                        await self.broadcast_status_update()
                         
-                        if generated_key == monitor_key:
-                            monitor.config.active = active
-                            self.monitor_engine._save_monitors()
-                            await self.broadcast_status_update()
-                            
-                            self.logger.info(f"监控器状态切换成功: {monitor_key} -> {'启动' if active else '暂停'}")
-                            
-                            return {
-                                "success": True,
-                                "message": f"监控器已{'启动' if active else '暂停'}",
-                                "active": active
-                            }
+                        self.logger.info(f"监控器状态切换成功: {monitor_key} -> {'启动' if active else '暂停'}")
+                        
+                        return {
+                            "success": True,
+                            "message": f"监控器已{'启动' if active else '暂停'}",
+                            "active": active
+                        }
                 
                 return {"success": False, "message": "未找到指定的监控器"}
                 
@@ -791,9 +786,9 @@ class WebApp:
         ):
             user = self.get_current_user(request)
             try:
-                chat_ids = [int(x.strip()) for x in chats.split(',') if x.strip()]
-                target_ids = [int(x.strip()) for x in forward_targets.split(',') if x.strip() and auto_forward]
-                max_size = float(max_download_size) if max_download_size else None
+                chat_ids = list(dict.fromkeys(parse_int_list(chats, strict=True)))
+                target_ids = list(dict.fromkeys(parse_int_list(forward_targets, strict=True))) if auto_forward else []
+                max_size = parse_float(max_download_size, strict=True)
                 
                 config = KeywordConfig(
                     keyword=keyword,
@@ -844,9 +839,9 @@ class WebApp:
                 if not ai_service.is_configured():
                     return {"success": False, "message": "AI服务未配置，请先配置AI服务"}
                 
-                chat_ids = [int(x.strip()) for x in chats.split(',') if x.strip()]
-                target_ids = [int(x.strip()) for x in forward_targets.split(',') if x.strip() and auto_forward]
-                max_size = float(max_download_size) if max_download_size else None
+                chat_ids = list(dict.fromkeys(parse_int_list(chats, strict=True)))
+                target_ids = list(dict.fromkeys(parse_int_list(forward_targets, strict=True))) if auto_forward else []
+                max_size = parse_float(max_download_size, strict=True)
                 
                 ai_monitor = (AIMonitorBuilder()
                              .with_prompt(ai_prompt)
@@ -885,10 +880,10 @@ class WebApp:
         ):
             user = self.get_current_user(request)
             try:
-                chat_ids = [int(x.strip()) for x in chats.split(',') if x.strip()]
-                target_ids = [int(x.strip()) for x in forward_targets.split(',') if x.strip() and auto_forward]
-                min_size_mb = float(min_size) if min_size else None
-                max_size_mb = float(max_size) if max_size else None
+                chat_ids = list(dict.fromkeys(parse_int_list(chats, strict=True)))
+                target_ids = list(dict.fromkeys(parse_int_list(forward_targets, strict=True))) if auto_forward else []
+                min_size_mb = parse_float(min_size, strict=True)
+                max_size_mb = parse_float(max_size, strict=True)
                 
                 from models.config import FileConfig
                 config = FileConfig(
@@ -903,8 +898,8 @@ class WebApp:
                     forward_targets=target_ids,
                     enhanced_forward=enhanced_forward,
                     save_folder=save_folder if save_folder else None,
-                    min_size_mb=min_size_mb,
-                    max_size_mb=max_size_mb
+                    min_size=min_size_mb,
+                    max_size=max_size_mb
                 )
                 
                 monitor = monitor_factory.create_monitor(config)
@@ -949,7 +944,7 @@ class WebApp:
         async def get_account_channels(request: Request, account_id: str, page: int = 1, limit: int = 100, search: str = "", fetch_all: str = ""):
             user = self.get_current_user(request)
             try:
-                fetch_all_bool = fetch_all.lower() in ['1', 'true', 'yes']
+                fetch_all_bool = parse_bool(fetch_all)
                 self.logger.info(f"fetch_all参数: '{fetch_all}' -> {fetch_all_bool}")
                 account = self.account_manager.get_account(account_id)
                 if not account:
@@ -1302,7 +1297,8 @@ class WebApp:
                 
                 from core import MonitorEngine
                 engine = MonitorEngine()
-                engine.add_scheduled_message(config)
+                if not engine.add_scheduled_message(config):
+                    raise HTTPException(status_code=400, detail="定时规则或随机延时无效")
                 
                 return {"success": True, "job_id": config.job_id}
                 
@@ -1366,74 +1362,59 @@ class WebApp:
             user = self.get_current_user(request)
             try:
                 data = await request.json()
+                if not data:
+                    return {"success": False, "message": "没有需要修改的内容"}
                 
                 from core import MonitorEngine
                 engine = MonitorEngine()
                 
-                for i, msg in enumerate(engine.scheduled_messages):
-                    if msg.get('job_id') == job_id:
-                        old_cron = msg.get('cron') or msg.get('schedule')
-                        old_active = msg.get('active', True)
-                        
-                        max_executions = data.get("max_executions")
-                        if max_executions == "" or max_executions is None or max_executions == 0:
+                msg = engine.get_scheduled_message(job_id)
+                if msg is None:
+                    return {"success": False, "message": "未找到指定的定时消息"}
+                
+                old_cron = msg.get('cron') or msg.get('schedule')
+                old_active = msg.get('active', True)
+                
+                max_executions = data.get("max_executions")
+                if max_executions == "" or max_executions is None or max_executions == 0:
+                    max_executions = None
+                else:
+                    try:
+                        max_executions = int(max_executions)
+                        if max_executions <= 0:
                             max_executions = None
-                        else:
-                            try:
-                                max_executions = int(max_executions)
-                                if max_executions <= 0:
-                                    max_executions = None
-                            except (ValueError, TypeError):
-                                max_executions = None
-                        
-                        self.logger.info(f"📝 更新定时消息执行次数限制: {max_executions or '无限制'}")
-                        
-                        new_cron = data.get('schedule', data.get('cron', old_cron))
-                        engine.scheduled_messages[i].update({
-                            'account_id': data.get('account_id'),
-                            'message': data.get('message', ''),
-                            'channel_id': data.get('channel_id'),
-                            'target_id': data.get('channel_id'),
-                            'schedule': new_cron,
-                            'cron': new_cron,
-                            'use_ai': data.get('use_ai', False),
-                            'ai_prompt': data.get('ai_prompt', ''),
-                            'random_delay': data.get('random_delay', 0),
-                            'random_offset': data.get('random_delay', 0),
-                            'delete_after_send': data.get('delete_after_send', False),
-                            'delete_after_sending': data.get('delete_after_send', False),
-                            'max_executions': max_executions
-                        })
-                        
-                        self.logger.info(f"📝 定时消息更新: {job_id}, 执行限制: {max_executions or '无限制'}, Cron: {new_cron}")
-                        
-                        if old_cron != new_cron or old_active:
-                            engine._ensure_scheduler_started()
-                            
-                            if engine.scheduler and engine.scheduler.running:
-                                try:
-                                    engine.scheduler.remove_job(job_id)
-                                    self.logger.info(f"移除旧的定时任务: {job_id}")
-                                except Exception as remove_error:
-                                    self.logger.info(f"移除旧任务失败（可能不存在）: {remove_error}")
-                                
-                                if msg.get('active', True) and new_cron:
-                                    try:
-                                        engine.scheduler.add_job(
-                                            engine._execute_scheduled_message,
-                                            CronTrigger.from_crontab(new_cron, timezone=pytz.timezone('Asia/Shanghai')),
-                                            id=job_id,
-                                            args=[job_id],
-                                            replace_existing=True
-                                        )
-                                        self.logger.info(f"更新定时任务: {job_id}, 新Cron: {new_cron}")
-                                    except Exception as add_error:
-                                        self.logger.error(f"重新添加定时任务失败: {add_error}")
-                        
-                        engine._save_scheduled_messages()
-                        return {"success": True, "message": "定时消息更新成功"}
+                    except (ValueError, TypeError):
+                        max_executions = None
                 
-                return {"success": False, "message": "未找到指定的定时消息"}
+                self.logger.info(f"📝 更新定时消息执行次数限制: {max_executions or '无限制'}")
+                
+                new_cron = data.get('schedule', data.get('cron', old_cron))
+                msg.update({
+                    'account_id': data.get('account_id'),
+                    'message': data.get('message', ''),
+                    'channel_id': data.get('channel_id'),
+                    'target_id': data.get('channel_id'),
+                    'schedule': new_cron,
+                    'cron': new_cron,
+                    'use_ai': data.get('use_ai', False),
+                    'ai_prompt': data.get('ai_prompt', ''),
+                    'random_delay': data.get('random_delay', 0),
+                    'random_offset': data.get('random_delay', 0),
+                    'delete_after_send': data.get('delete_after_send', False),
+                    'delete_after_sending': data.get('delete_after_send', False),
+                    'max_executions': max_executions
+                })
+                
+                self.logger.info(f"📝 定时消息更新: {job_id}, 执行限制: {max_executions or '无限制'}, Cron: {new_cron}")
+                
+                if old_cron != new_cron or old_active:
+                    if engine.reschedule_message(msg):
+                        self.logger.info(f"更新定时任务: {job_id}, 新Cron: {new_cron}")
+                    elif msg.get('active', True):
+                        self.logger.error(f"重新添加定时任务失败: {job_id}")
+                
+                engine._save_scheduled_messages()
+                return {"success": True, "message": "定时消息更新成功"}
                 
             except Exception as e:
                 self.logger.error(f"更新定时消息失败: {e}")
@@ -1449,66 +1430,31 @@ class WebApp:
                 from core import MonitorEngine
                 engine = MonitorEngine()
                 
-                for msg in engine.scheduled_messages:
-                    if msg.get('job_id') == job_id:
-                        msg['active'] = active
-                        
-                        engine._ensure_scheduler_started()
-                        
-                        if active:
-                            if msg.get('max_executions') and msg.get('execution_count', 0) >= msg.get('max_executions'):
-                                msg['execution_count'] = 0
-                                self.logger.info(f"重新启动定时任务，执行计数已重置: {job_id}")
-                            
-                            cron_expr = msg.get('cron', msg.get('schedule'))
-                            schedule_mode = msg.get('schedule_mode', 'cron')
-                            
-                            if cron_expr and engine.scheduler and engine.scheduler.running:
-                                try:
-                                    if schedule_mode == 'interval':
-                                        parts = cron_expr.split()
-                                        hours = int(parts[0]) if len(parts) > 0 else 0
-                                        minutes = int(parts[1]) if len(parts) > 1 else 0
-                                        
-                                        from apscheduler.triggers.interval import IntervalTrigger
-                                        trigger = IntervalTrigger(
-                                            hours=hours,
-                                            minutes=minutes,
-                                            timezone=pytz.timezone('Asia/Shanghai')
-                                        )
-                                        self.logger.info(f"使用间隔触发器重新启动: {hours}小时 {minutes}分钟")
-                                    else:
-                                        trigger = CronTrigger.from_crontab(cron_expr, timezone=pytz.timezone('Asia/Shanghai'))
-                                        self.logger.info(f"使用Cron触发器重新启动: {cron_expr}")
-                                    
-                                    engine.scheduler.add_job(
-                                        engine._execute_scheduled_message,
-                                        trigger,
-                                        id=job_id,
-                                        args=[job_id],
-                                        replace_existing=True
-                                    )
-                                    self.logger.info(f"成功重新启动定时任务: {job_id}")
-                                except Exception as scheduler_error:
-                                    self.logger.error(f"启动定时任务失败: {scheduler_error}")
-                        else:
-                            if engine.scheduler and engine.scheduler.running:
-                                try:
-                                    engine.scheduler.remove_job(job_id)
-                                    self.logger.info(f"暂停定时任务: {job_id}")
-                                except Exception as scheduler_error:
-                                    self.logger.warning(f"暂停定时任务失败: {scheduler_error}")
-                            else:
-                                self.logger.debug(f"调度器未运行，跳过暂停任务: {job_id}")
-                        
-                        engine._save_scheduled_messages()
-                        return {
-                            "success": True, 
-                            "message": f"定时消息已{'启动' if active else '暂停'}",
-                            "active": active
-                        }
+                msg = engine.get_scheduled_message(job_id)
+                if msg is None:
+                    return {"success": False, "message": "未找到指定的定时消息"}
+                
+                msg['active'] = active
+                
+                if active:
+                    max_executions = msg.get('max_executions')
+                    if max_executions and msg.get('execution_count', 0) >= max_executions:
+                        msg['execution_count'] = 0
+                        self.logger.info(f"重新启动定时任务，执行计数已重置: {job_id}")
+                
+                if engine.reschedule_message(msg):
+                    self.logger.info(f"成功重新启动定时任务: {job_id}")
+                elif active:
+                    self.logger.error(f"启动定时任务失败: {job_id}")
+                else:
+                    self.logger.info(f"暂停定时任务: {job_id}")
                 
-                return {"success": False, "message": "未找到指定的定时消息"}
+                engine._save_scheduled_messages()
+                return {
+                    "success": True, 
+                    "message": f"定时消息已{'启动' if active else '暂停'}",
+                    "active": active
+                }
                 
             except Exception as e:
                 self.logger.error(f"切换定时消息状态失败: {e}")
@@ -1524,6 +1470,7 @@ class WebApp:
                 
                 logs = []
                 
+                flush_log_handlers()
                 log_file = Path("logs/telegram_monitor.log")
                 if log_file.exists():
                     try:
@@ -1594,21 +1541,24 @@ class WebApp:
         async def download_logs(request: Request):
             user = self.get_current_user(request)
             try:
+                flush_log_handlers()
                 log_file = Path("logs/telegram_monitor.log")
+                now = datetime.now()
+                filename = f"tg_monitor_logs_{now.strftime('%Y%m%d_%H%M%S')}.log"
                 if log_file.exists():
                     return FileResponse(
                         path=str(log_file),
-                        filename=f"tg_monitor_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
+                        filename=filename,
                         media_type="text/plain"
                     )
                 else:
-                    temp_content = f"# TG监控系统日志文件\n# 生成时间: {datetime.now()}\n\n暂无日志记录。\n"
-                    temp_file = Path(f"temp_logs_{datetime.now().timestamp()}.log")
+                    temp_content = f"# TG监控系统日志文件\n# 生成时间: {now}\n\n暂无日志记录。\n"
+                    temp_file = Path(f"temp_logs_{now.timestamp()}.log")
                     temp_file.write_text(temp_content, encoding='utf-8')
                     
                     return FileResponse(
                         path=str(temp_file),
-                        filename=f"tg_monitor_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
+                        filename=filename,
                         media_type="text/plain"
                     )
                     
@@ -1669,17 +1619,14 @@ class WebApp:
                     accounts = self.account_manager.list_accounts()
                     self.logger.info(f"导出全部账号，共 {len(accounts)} 个")
                 else:
-                    account_list = account_ids.split(',') if ',' in account_ids else [account_ids]
                     accounts = []
-                    for aid in account_list:
-                        aid = aid.strip()
-                        if aid:
-                            account = self.account_manager.get_account(aid)
-                            if account:
-                                accounts.append(account)
-                                self.logger.info(f"成功获取账号: {aid}")
-                            else:
-                                self.logger.warning(f"未找到账号: {aid}")
+                    for aid in parse_str_csv(account_ids):
+                        account = self.account_manager.get_account(aid)
+                        if account:
+                            accounts.append(account)
+                            self.logger.info(f"成功获取账号: {aid}")
+                        else:
+                            self.logger.warning(f"未找到账号: {aid}")
                     self.logger.info(f"导出指定账号，共 {len(accounts)} 个")
                 
                 if not accounts:
@@ -1781,295 +1728,294 @@ class WebApp:
                         except Exception as e:
                             self.logger.error(f"导入账号 {account_id} 配置失败: {e}")
                 
-                if 'monitors' in config:
-                    self.logger.info("导入监控器配置")
-                    for account_id, monitors_data in config['monitors'].items():
-                        account = self.account_manager.get_account(account_id)
-                        if not account:
-                            self.logger.warning(f"账号 {account_id} 不存在，跳过导入")
-                            continue
+                with self.monitor_engine.batch_monitor_updates():
+                    if 'monitors' in config:
+                        self.logger.info("导入监控器配置")
+                        for account_id, monitors_data in config['monitors'].items():
+                            account = self.account_manager.get_account(account_id)
+                            if not account:
+                                self.logger.warning(f"账号 {account_id} 不存在，跳过导入")
+                                continue
                         
-                        self.logger.info(f"为账号 {account_id} 导入 {len(monitors_data)} 个监控器")
+                            self.logger.info(f"为账号 {account_id} 导入 {len(monitors_data)} 个监控器")
                         
-                        for monitor_data in monitors_data:
-                            try:
-                                monitor_type = monitor_data.get('type')
-                                config_data = monitor_data.get('config', {})
-                                
-                                type_mapping = {
-                                    'KeywordMonitor': 'keyword',
-                                    'FileMonitor': 'file', 
-                                    'AIMonitor': 'ai',
-                                    'AllMessagesMonitor': 'allmessages',
-                                    'ImageButtonMonitor': 'imagebutton',
-                                    'ButtonMonitor': 'button'
-                                }
+                            for monitor_data in monitors_data:
+                                try:
+                                    monitor_type = monitor_data.get('type')
+                                    config_data = monitor_data.get('config', {})
                                 
-                                def convert_bool(value):
-                                    if isinstance(value, str):
-                                        return value.lower() in ('true', 'on', 'yes', '1')
-                                    return bool(value)
+                                    type_mapping = {
+                                        'KeywordMonitor': 'keyword',
+                                        'FileMonitor': 'file', 
+                                        'AIMonitor': 'ai',
+                                        'AllMessagesMonitor': 'allmessages',
+                                        'ImageButtonMonitor': 'imagebutton',
+                                        'ButtonMonitor': 'button'
+                                    }
                                 
-                                if monitor_type in type_mapping:
-                                    monitor_type = type_mapping[monitor_type]
-                                    self.logger.debug(f"类型映射: {monitor_data.get('type')} -> {monitor_type}")
+                                    mapped_type = type_mapping.get(monitor_type)
+                                    if mapped_type is not None:
+                                        monitor_type = mapped_type
+                                        self.logger.debug(f"类型映射: {monitor_data.get('type')} -> {monitor_type}")
                                 
-                                if monitor_type == 'keyword':
-                                    from models.config import KeywordConfig, MatchType, ReplyMode
-                                    monitor_config = KeywordConfig(
-                                        keyword=config_data.get('keyword', ''),
-                                        match_type=MatchType(config_data.get('match_type', 'partial')),
-                                        chats=config_data.get('chats', []),
-                                        users=config_data.get('users', []),
-                                        user_option=config_data.get('user_option'),
-                                        blocked_users=config_data.get('blocked_users', []),
-                                        blocked_channels=config_data.get('blocked_channels', []),
-                                        blocked_bots=config_data.get('blocked_bots', []),
-                                        bot_ids=config_data.get('bot_ids', []),
-                                        channel_ids=config_data.get('channel_ids', []),
-                                        group_ids=config_data.get('group_ids', []),
-                                        email_notify=convert_bool(config_data.get('email_notify', False)),
-                                        auto_forward=convert_bool(config_data.get('auto_forward', False)),
-                                        forward_targets=config_data.get('forward_targets', []),
-                                        enhanced_forward=convert_bool(config_data.get('enhanced_forward', False)),
-                                        reply_enabled=convert_bool(config_data.get('reply_enabled', False)),
-                                        reply_texts=config_data.get('reply_texts', []),
-                                        reply_delay_min=config_data.get('reply_delay_min', 0),
-                                        reply_delay_max=config_data.get('reply_delay_max', 0),
-                                        reply_mode=ReplyMode(config_data.get('reply_mode', 'reply')),
-                                        max_executions=config_data.get('max_executions'),
-                                        execution_count=config_data.get('execution_count', 0),
-                                        priority=config_data.get('priority', 50),
-                                        execution_mode=config_data.get('execution_mode', 'merge'),
-                                        active=convert_bool(config_data.get('active', True)),
-                                        log_file=config_data.get('log_file')
-                                    )
-                                    monitor = monitor_factory.create_monitor(monitor_config)
-                                    if monitor:
-                                        self.monitor_engine.add_monitor(account_id, monitor, f"keyword_{monitor_config.keyword}")
-                                        imported_monitors += 1
+                                    if monitor_type == 'keyword':
+                                        from models.config import KeywordConfig, MatchType, ReplyMode
+                                        monitor_config = KeywordConfig(
+                                            keyword=config_data.get('keyword', ''),
+                                            match_type=MatchType(config_data.get('match_type', 'partial')),
+                                            chats=config_data.get('chats', []),
+                                            users=config_data.get('users', []),
+                                            user_option=config_data.get('user_option'),
+                                            blocked_users=config_data.get('blocked_users', []),
+                                            blocked_channels=config_data.get('blocked_channels', []),
+                                            blocked_bots=config_data.get('blocked_bots', []),
+                                            bot_ids=config_data.get('bot_ids', []),
+                                            channel_ids=config_data.get('channel_ids', []),
+                                            group_ids=config_data.get('group_ids', []),
+                                            email_notify=parse_bool(config_data.get('email_notify', False)),
+                                            auto_forward=parse_bool(config_data.get('auto_forward', False)),
+                                            forward_targets=config_data.get('forward_targets', []),
+                                            enhanced_forward=parse_bool(config_data.get('enhanced_forward', False)),
+                                            reply_enabled=parse_bool(config_data.get('reply_enabled', False)),
+                                            reply_texts=config_data.get('reply_texts', []),
+                                            reply_delay_min=config_data.get('reply_delay_min', 0),
+                                            reply_delay_max=config_data.get('reply_delay_max', 0),
+                                            reply_mode=ReplyMode(config_data.get('reply_mode', 'reply')),
+                                            max_executions=config_data.get('max_executions'),
+                                            execution_count=config_data.get('execution_count', 0),
+                                            priority=config_data.get('priority', 50),
+                                            execution_mode=config_data.get('execution_mode', 'merge'),
+                                            active=parse_bool(config_data.get('active', True)),
+                                            log_file=config_data.get('log_file')
+                                        )
+                                        monitor = monitor_factory.create_monitor(monitor_config)
+                                        if monitor:
+                                            self.monitor_engine.add_monitor(account_id, monitor, f"keyword_{monitor_config.keyword}")
+                                            imported_monitors += 1
                                 
-                                elif monitor_type == 'file':
-                                    from models.config import FileConfig
-                                    monitor_config = FileConfig(
-                                        file_extension=config_data.get('file_extension', ''),
-                                        chats=config_data.get('chats', []),
-                                        users=config_data.get('users', []),
-                                        user_option=config_data.get('user_option'),
-                                        blocked_users=config_data.get('blocked_users', []),
-                                        blocked_channels=config_data.get('blocked_channels', []),
-                                        blocked_bots=config_data.get('blocked_bots', []),
-                                        bot_ids=config_data.get('bot_ids', []),
-                                        channel_ids=config_data.get('channel_ids', []),
-                                        group_ids=config_data.get('group_ids', []),
-                                        email_notify=convert_bool(config_data.get('email_notify', False)),
-                                        auto_forward=convert_bool(config_data.get('auto_forward', False)),
-                                        forward_targets=config_data.get('forward_targets', []),
-                                        enhanced_forward=convert_bool(config_data.get('enhanced_forward', False)),
-                                        save_folder=config_data.get('save_folder'),
-                                        min_size=config_data.get('min_size'),
-                                        max_size=config_data.get('max_size'),
-                                        max_download_size_mb=config_data.get('max_download_size_mb'),
-                                        max_executions=config_data.get('max_executions'),
-                                        execution_count=config_data.get('execution_count', 0),
-                                        priority=config_data.get('priority', 50),
-                                        execution_mode=config_data.get('execution_mode', 'merge'),
-                                        active=convert_bool(config_data.get('active', True)),
-                                        log_file=config_data.get('log_file')
-                                    )
-                                    monitor = monitor_factory.create_monitor(monitor_config)
-                                    if monitor:
-                                        self.monitor_engine.add_monitor(account_id, monitor, f"file_{monitor_config.file_extension}")
-                                        imported_monitors += 1
+                                    elif monitor_type == 'file':
+                                        from models.config import FileConfig
+                                        monitor_config = FileConfig(
+                                            file_extension=config_data.get('file_extension', ''),
+                                            chats=config_data.get('chats', []),
+                                            users=config_data.get('users', []),
+                                            user_option=config_data.get('user_option'),
+                                            blocked_users=config_data.get('blocked_users', []),
+                                            blocked_channels=config_data.get('blocked_channels', []),
+                                            blocked_bots=config_data.get('blocked_bots', []),
+                                            bot_ids=config_data.get('bot_ids', []),
+                                            channel_ids=config_data.get('channel_ids', []),
+                                            group_ids=config_data.get('group_ids', []),
+                                            email_notify=parse_bool(config_data.get('email_notify', False)),
+                                            auto_forward=parse_bool(config_data.get('auto_forward', False)),
+                                            forward_targets=config_data.get('forward_targets', []),
+                                            enhanced_forward=parse_bool(config_data.get('enhanced_forward', False)),
+                                            save_folder=config_data.get('save_folder'),
+                                            min_size=config_data.get('min_size'),
+                                            max_size=config_data.get('max_size'),
+                                            max_download_size_mb=config_data.get('max_download_size_mb'),
+                                            max_executions=config_data.get('max_executions'),
+                                            execution_count=config_data.get('execution_count', 0),
+                                            priority=config_data.get('priority', 50),
+                                            execution_mode=config_data.get('execution_mode', 'merge'),
+                                            active=parse_bool(config_data.get('active', True)),
+                                            log_file=config_data.get('log_file')
+                                        )
+                                        monitor = monitor_factory.create_monitor(monitor_config)
+                                        if monitor:
+                                            self.monitor_engine.add_monitor(account_id, monitor, f"file_{monitor_config.file_extension}")
+                                            imported_monitors += 1
                                     
-                                elif monitor_type == 'ai':
-                                    from models.config import AIMonitorConfig, ReplyMode
-                                    monitor_config = AIMonitorConfig(
-                                        ai_prompt=config_data.get('ai_prompt', ''),
-                                        chats=config_data.get('chats', []),
-                                        users=config_data.get('users', []),
-                                        user_option=config_data.get('user_option'),
-                                        blocked_users=config_data.get('blocked_users', []),
-                                        blocked_channels=config_data.get('blocked_channels', []),
-                                        blocked_bots=config_data.get('blocked_bots', []),
-                                        bot_ids=config_data.get('bot_ids', []),
-                                        channel_ids=config_data.get('channel_ids', []),
-                                        group_ids=config_data.get('group_ids', []),
-                                        email_notify=convert_bool(config_data.get('email_notify', False)),
-                                        auto_forward=convert_bool(config_data.get('auto_forward', False)),
-                                        forward_targets=config_data.get('forward_targets', []),
-                                        enhanced_forward=convert_bool(config_data.get('enhanced_forward', False)),
-                                        confidence_threshold=config_data.get('confidence_threshold', 0.7),
-                                        ai_model=config_data.get('ai_model', 'gpt-4o'),
-                                        reply_enabled=convert_bool(config_data.get('reply_enabled', False)),
-                                        reply_texts=config_data.get('reply_texts', []),
-                                        reply_delay_min=config_data.get('reply_delay_min', 0),
-                                        reply_delay_max=config_data.get('reply_delay_max', 0),
-                                        reply_mode=ReplyMode(config_data.get('reply_mode', 'reply')),
-                                        max_executions=config_data.get('max_executions'),
-                                        execution_count=config_data.get('execution_count', 0),
-                                        priority=config_data.get('priority', 50),
-                                        execution_mode=config_data.get('execution_mode', 'merge'),
-                                        active=convert_bool(config_data.get('active', True)),
-                                        log_file=config_data.get('log_file')
-                                    )
-                                    monitor = monitor_factory.create_monitor(monitor_config)
-                                    if monitor:
-                                        self.monitor_engine.add_monitor(account_id, monitor, f"ai_{monitor_config.ai_prompt[:20]}...")
-                                        imported_monitors += 1
+                                    elif monitor_type == 'ai':
+                                        from models.config import AIMonitorConfig, ReplyMode
+                                        monitor_config = AIMonitorConfig(
+                                            ai_prompt=config_data.get('ai_prompt', ''),
+                                            chats=config_data.get('chats', []),
+                                            users=config_data.get('users', []),
+                                            user_option=config_data.get('user_option'),
+                                            blocked_users=config_data.get('blocked_users', []),
+                                            blocked_channels=config_data.get('blocked_channels', []),
+                                            blocked_bots=config_data.get('blocked_bots', []),
+                                            bot_ids=config_data.get('bot_ids', []),
+                                            channel_ids=config_data.get('channel_ids', []),
+                                            group_ids=config_data.get('group_ids', []),
+                                            email_notify=parse_bool(config_data.get('email_notify', False)),
+                                            auto_forward=parse_bool(config_data.get('auto_forward', False)),
+                                            forward_targets=config_data.get('forward_targets', []),
+                                            enhanced_forward=parse_bool(config_data.get('enhanced_forward', False)),
+                                            confidence_threshold=config_data.get('confidence_threshold', 0.7),
+                                            ai_model=config_data.get('ai_model', 'gpt-4o'),
+                                            reply_enabled=parse_bool(config_data.get('reply_enabled', False)),
+                                            reply_texts=config_data.get('reply_texts', []),
+                                            reply_delay_min=config_data.get('reply_delay_min', 0),
+                                            reply_delay_max=config_data.get('reply_delay_max', 0),
+                                            reply_mode=ReplyMode(config_data.get('reply_mode', 'reply')),
+                                            max_executions=config_data.get('max_executions'),
+                                            execution_count=config_data.get('execution_count', 0),
+                                            priority=config_data.get('priority', 50),
+                                            execution_mode=config_data.get('execution_mode', 'merge'),
+                                            active=parse_bool(config_data.get('active', True)),
+                                            log_file=config_data.get('log_file')
+                                        )
+                                        monitor = monitor_factory.create_monitor(monitor_config)
+                                        if monitor:
+                                            self.monitor_engine.add_monitor(account_id, monitor, f"ai_{monitor_config.ai_prompt[:20]}...")
+                                            imported_monitors += 1
                                 
-                                elif monitor_type == 'allmessages':
-                                    from models.config import AllMessagesConfig, ReplyMode, ReplyContentType
-                                    monitor_config = AllMessagesConfig(
-                                        chat_id=config_data.get('chat_id', 0),
-                                        chats=config_data.get('chats', []),
-                                        users=config_data.get('users', []),
-                                        user_option=config_data.get('user_option'),
-                                        blocked_users=config_data.get('blocked_users', []),
-                                        blocked_channels=config_data.get('blocked_channels', []),
-                                        blocked_bots=config_data.get('blocked_bots', []),
-                                        bot_ids=config_data.get('bot_ids', []),
-                                        channel_ids=config_data.get('channel_ids', []),
-                                        group_ids=config_data.get('group_ids', []),
-                                        email_notify=convert_bool(config_data.get('email_notify', False)),
-                                        auto_forward=convert_bool(config_data.get('auto_forward', False)),
-                                        forward_targets=config_data.get('forward_targets', []),
-                                        enhanced_forward=convert_bool(config_data.get('enhanced_forward', False)),
-                                        reply_enabled=convert_bool(config_data.get('reply_enabled', False)),
-                                        reply_texts=config_data.get('reply_texts', []),
-                                        reply_delay_min=config_data.get('reply_delay_min', 0),
-                                        reply_delay_max=config_data.get('reply_delay_max', 0),
-                                        reply_mode=ReplyMode(config_data.get('reply_mode', 'reply')),
-                                        reply_content_type=ReplyContentType(config_data.get('reply_content_type', 'custom')),
-                                        ai_reply_prompt=config_data.get('ai_reply_prompt', ''),
-                                        max_executions=config_data.get('max_executions'),
-                                        execution_count=config_data.get('execution_count', 0),
-                                        priority=config_data.get('priority', 50),
-                                        execution_mode=config_data.get('execution_mode', 'merge'),
-                                        active=convert_bool(config_data.get('active', True)),
-                                        log_file=config_data.get('log_file')
-                                    )
-                                    monitor = monitor_factory.create_monitor(monitor_config)
-                                    if monitor:
-                                        self.monitor_engine.add_monitor(account_id, monitor, f"allmessages_{monitor_config.chat_id}")
-                                        imported_monitors += 1
+                                    elif monitor_type == 'allmessages':
+                                        from models.config import AllMessagesConfig, ReplyMode, ReplyContentType
+                                        monitor_config = AllMessagesConfig(
+                                            chat_id=config_data.get('chat_id', 0),
+                                            chats=config_data.get('chats', []),
+                                            users=config_data.get('users', []),
+                                            user_option=config_data.get('user_option'),
+                                            blocked_users=config_data.get('blocked_users', []),
+                                            blocked_channels=config_data.get('blocked_channels', []),
+                                            blocked_bots=config_data.get('blocked_bots', []),
+                                            bot_ids=config_data.get('bot_ids', []),
+                                            channel_ids=config_data.get('channel_ids', []),
+                                            group_ids=config_data.get('group_ids', []),
+                                            email_notify=parse_bool(config_data.get('email_notify', False)),
+                                            auto_forward=parse_bool(config_data.get('auto_forward', False)),
+                                            forward_targets=config_data.get('forward_targets', []),
+                                            enhanced_forward=parse_bool(config_data.get('enhanced_forward', False)),
+                                            reply_enabled=parse_bool(config_data.get('reply_enabled', False)),
+                                            reply_texts=config_data.get('reply_texts', []),
+                                            reply_delay_min=config_data.get('reply_delay_min', 0),
+                                            reply_delay_max=config_data.get('reply_delay_max', 0),
+                                            reply_mode=ReplyMode(config_data.get('reply_mode', 'reply')),
+                                            reply_content_type=ReplyContentType(config_data.get('reply_content_type', 'custom')),
+                                            ai_reply_prompt=config_data.get('ai_reply_prompt', ''),
+                                            max_executions=config_data.get('max_executions'),
+                                            execution_count=config_data.get('execution_count', 0),
+                                            priority=config_data.get('priority', 50),
+                                            execution_mode=config_data.get('execution_mode', 'merge'),
+                                            active=parse_bool(config_data.get('active', True)),
+                                            log_file=config_data.get('log_file')
+                                        )
+                                        monitor = monitor_factory.create_monitor(monitor_config)
+                                        if monitor:
+                                            self.monitor_engine.add_monitor(account_id, monitor, f"allmessages_{monitor_config.chat_id}")
+                                            imported_monitors += 1
                                 
-                                elif monitor_type == 'imagebutton':
-                                    from models.config import ImageButtonConfig
-                                    monitor_config = ImageButtonConfig(
-                                        ai_prompt=config_data.get('ai_prompt', '分析图片和按钮内容'),
-                                        button_keywords=config_data.get('button_keywords', []),
-                                        download_images=convert_bool(config_data.get('download_images', True)),
-                                        auto_reply=convert_bool(config_data.get('auto_reply', False)),
-                                        confidence_threshold=config_data.get('confidence_threshold', 0.7),
-                                        chats=config_data.get('chats', []),
-                                        users=config_data.get('users', []),
-                                        blocked_users=config_data.get('blocked_users', []),
-                                        blocked_channels=config_data.get('blocked_channels', []),
-                                        blocked_bots=config_data.get('blocked_bots', []),
-                                        bot_ids=config_data.get('bot_ids', []),
-                                        channel_ids=config_data.get('channel_ids', []),
-                                        group_ids=config_data.get('group_ids', []),
-                                        email_notify=convert_bool(config_data.get('email_notify', False)),
-                                        auto_forward=convert_bool(config_data.get('auto_forward', False)),
-                                        forward_targets=config_data.get('forward_targets', []),
-                                        enhanced_forward=convert_bool(config_data.get('enhanced_forward', False)),
-                                        max_executions=config_data.get('max_executions'),
-                                        execution_count=config_data.get('execution_count', 0),
-                                        priority=config_data.get('priority', 50),
-                                        active=convert_bool(config_data.get('active', True)),
-                                        log_file=config_data.get('log_file')
-                                    )
-                                    monitor = monitor_factory.create_monitor(monitor_config)
-                                    if monitor:
-                                        self.monitor_engine.add_monitor(account_id, monitor, f"imagebutton_{monitor_config.ai_prompt[:20]}")
-                                        imported_monitors += 1
+                                    elif monitor_type == 'imagebutton':
+                                        from models.config import ImageButtonConfig
+                                        monitor_config = ImageButtonConfig(
+                                            ai_prompt=config_data.get('ai_prompt', '分析图片和按钮内容'),
+                                            button_keywords=config_data.get('button_keywords', []),
+                                            download_images=parse_bool(config_data.get('download_images', True)),
+                                            auto_reply=parse_bool(config_data.get('auto_reply', False)),
+                                            confidence_threshold=config_data.get('confidence_threshold', 0.7),
+                                            chats=config_data.get('chats', []),
+                                            users=config_data.get('users', []),
+                                            blocked_users=config_data.get('blocked_users', []),
+                                            blocked_channels=config_data.get('blocked_channels', []),
+                                            blocked_bots=config_data.get('blocked_bots', []),
+                                            bot_ids=config_data.get('bot_ids', []),
+                                            channel_ids=config_data.get('channel_ids', []),
+                                            group_ids=config_data.get('group_ids', []),
+                                            email_notify=parse_bool(config_data.get('email_notify', False)),
+                                            auto_forward=parse_bool(config_data.get('auto_forward', False)),
+                                            forward_targets=config_data.get('forward_targets', []),
+                                            enhanced_forward=parse_bool(config_data.get('enhanced_forward', False)),
+                                            max_executions=config_data.get('max_executions'),
+                                            execution_count=config_data.get('execution_count', 0),
+                                            priority=config_data.get('priority', 50),
+                                            active=parse_bool(config_data.get('active', True)),
+                                            log_file=config_data.get('log_file')
+                                        )
+                                        monitor = monitor_factory.create_monitor(monitor_config)
+                                        if monitor:
+                                            self.monitor_engine.add_monitor(account_id, monitor, f"imagebutton_{monitor_config.ai_prompt[:20]}")
+                                            imported_monitors += 1
                                 
-                                else:
-                                    self.logger.warning(f"未知的监控器类型: {monitor_type}")
+                                    else:
+                                        self.logger.warning(f"未知的监控器类型: {monitor_type}")
                                     
-                            except Exception as e:
-                                self.logger.error(f"导入监控器失败: {e}")
-                                continue
+                                except Exception as e:
+                                    self.logger.error(f"导入监控器失败: {e}")
+                                    continue
                     
-                    else:
-                        for account_id, account_data in config.items():
-                            if not isinstance(account_data, dict) or 'config' not in account_data:
-                                continue
+                        else:
+                            for account_id, account_data in config.items():
+                                if not isinstance(account_data, dict) or 'config' not in account_data:
+                                    continue
                             
-                            account_config = account_data['config']
+                                account_config = account_data['config']
                             
-                            account = self.account_manager.get_account(account_id)
-                            if not account:
-                                self.logger.warning(f"账号 {account_id} 不存在，跳过导入")
-                                continue
+                                account = self.account_manager.get_account(account_id)
+                                if not account:
+                                    self.logger.warning(f"账号 {account_id} 不存在，跳过导入")
+                                    continue
                             
-                            if mode == 'replace':
-                                self.monitor_engine.remove_all_monitors(account_id)
+                                if mode == 'replace':
+                                    self.monitor_engine.remove_all_monitors(account_id)
                             
-                            if 'keyword_config' in account_config:
-                                for keyword, cfg in account_config['keyword_config'].items():
-                                    try:
-                                        from models.config import KeywordConfig, MatchType
-                                        monitor_config = KeywordConfig(
-                                            keyword=keyword,
-                                            match_type=MatchType(cfg.get('match_type', 'contains')),
-                                            chats=cfg.get('chats', []),
-                                            email_notify=cfg.get('email_notify', False),
-                                            auto_forward=cfg.get('auto_forward', False),
-                                            forward_targets=cfg.get('forward_targets', []),
-                                            enhanced_forward=cfg.get('enhanced_forward', False),
-                                            reply_enabled=cfg.get('reply_enabled', False),
-                                            reply_texts=cfg.get('reply_texts', []),
-                                            reply_delay_min=cfg.get('reply_delay_min', 0),
-                                            reply_delay_max=cfg.get('reply_delay_max', 0),
-                                            max_executions=cfg.get('max_executions'),
-                                            priority=cfg.get('priority', 50),
-                                            bot_ids=cfg.get('bot_ids', []),
-                                            channel_ids=cfg.get('channel_ids', []),
-                                            group_ids=cfg.get('group_ids', [])
-                                        )
-                                        monitor = monitor_factory.create_monitor(monitor_config)
-                                        if monitor:
-                                            self.monitor_engine.add_monitor(account_id, monitor, f"keyword_{keyword}")
-                                            imported_monitors += 1
-                                    except Exception as e:
-                                        self.logger.error(f"导入关键词配置失败: {e}")
-                                        continue
+                                keyword_configs = account_config.get('keyword_config')
+                                if keyword_configs:
+                                    for keyword, cfg in keyword_configs.items():
+                                        try:
+                                            from models.config import KeywordConfig, MatchType
+                                            monitor_config = KeywordConfig(
+                                                keyword=keyword,
+                                                match_type=MatchType(cfg.get('match_type', 'contains')),
+                                                chats=cfg.get('chats', []),
+                                                email_notify=cfg.get('email_notify', False),
+                                                auto_forward=cfg.get('auto_forward', False),
+                                                forward_targets=cfg.get('forward_targets', []),
+                                                enhanced_forward=cfg.get('enhanced_forward', False),
+                                                reply_enabled=cfg.get('reply_enabled', False),
+                                                reply_texts=cfg.get('reply_texts', []),
+                                                reply_delay_min=cfg.get('reply_delay_min', 0),
+                                                reply_delay_max=cfg.get('reply_delay_max', 0),
+                                                max_executions=cfg.get('max_executions'),
+                                                priority=cfg.get('priority', 50),
+                                                bot_ids=cfg.get('bot_ids', []),
+                                                channel_ids=cfg.get('channel_ids', []),
+                                                group_ids=cfg.get('group_ids', [])
+                                            )
+                                            monitor = monitor_factory.create_monitor(monitor_config)
+                                            if monitor:
+                                                self.monitor_engine.add_monitor(account_id, monitor, f"keyword_{keyword}")
+                                                imported_monitors += 1
+                                        except Exception as e:
+                                            self.logger.error(f"导入关键词配置失败: {e}")
+                                            continue
                             
-                            if 'file_extension_config' in account_config:
-                                for extension, cfg in account_config['file_extension_config'].items():
-                                    try:
-                                        from models.config import FileConfig
-                                        monitor_config = FileConfig(
-                                            file_extension=extension,
-                                            chats=cfg.get('chats', []),
-                                            users=cfg.get('users', []),
-                                            blocked_users=cfg.get('blocked_users', []),
-                                            blocked_channels=cfg.get('blocked_channels', []),
-                                            blocked_bots=cfg.get('blocked_bots', []),
-                                            email_notify=cfg.get('email_notify', False),
-                                            auto_forward=cfg.get('auto_forward', False),
-                                            forward_targets=cfg.get('forward_targets', []),
-                                            enhanced_forward=cfg.get('enhanced_forward', False),
-                                            save_folder=cfg.get('save_folder'),
-                                            min_size=cfg.get('min_size'),
-                                            max_size=cfg.get('max_size'),
-                                            max_download_size_mb=cfg.get('max_download_size_mb'),
-                                            max_executions=cfg.get('max_executions'),
-                                            priority=cfg.get('priority', 50),
-                                            log_file=cfg.get('log_file'),
-                                            bot_ids=cfg.get('bot_ids', []),
-                                            channel_ids=cfg.get('channel_ids', []),
-                                            group_ids=cfg.get('group_ids', [])
-                                        )
-                                        monitor = monitor_factory.create_monitor(monitor_config)
-                                        if monitor:
-                                            self.monitor_engine.add_monitor(account_id, monitor, f"file_{extension}")
-                                            imported_monitors += 1
-                                    except Exception as e:
-                                        self.logger.error(f"导入文件配置失败: {e}")
-                                        continue
+                                file_extension_configs = account_config.get('file_extension_config')
+                                if file_extension_configs:
+                                    for extension, cfg in file_extension_configs.items():
+                                        try:
+                                            from models.config import FileConfig
+                                            monitor_config = FileConfig(
+                                                file_extension=extension,
+                                                chats=cfg.get('chats', []),
+                                                users=cfg.get('users', []),
+                                                blocked_users=cfg.get('blocked_users', []),
+                                                blocked_channels=cfg.get('blocked_channels', []),
+                                                blocked_bots=cfg.get('blocked_bots', []),
+                                                email_notify=cfg.get('email_notify', False),
+                                                auto_forward=cfg.get('auto_forward', False),
+                                                forward_targets=cfg.get('forward_targets', []),
+                                                enhanced_forward=cfg.get('enhanced_forward', False),
+                                                save_folder=cfg.get('save_folder'),
+                                                min_size=cfg.get('min_size'),
+                                                max_size=cfg.get('max_size'),
+                                                max_download_size_mb=cfg.get('max_download_size_mb'),
+                                                max_executions=cfg.get('max_executions'),
+                                                priority=cfg.get('priority', 50),
+                                                log_file=cfg.get('log_file'),
+                                                bot_ids=cfg.get('bot_ids', []),
+                                                channel_ids=cfg.get('channel_ids', []),
+                                                group_ids=cfg.get('group_ids', [])
+                                            )
+                                            monitor = monitor_factory.create_monitor(monitor_config)
+                                            if monitor:
+                                                self.monitor_engine.add_monitor(account_id, monitor, f"file_{extension}")
+                                                imported_monitors += 1
+                                        except Exception as e:
+                                            self.logger.error(f"导入文件配置失败: {e}")
+                                            continue
                     
                 if 'scheduled_messages' in config and config['scheduled_messages']:
                     self.logger.info(f"导入 {len(config['scheduled_messages'])} 个定时消息")
@@ -2104,8 +2050,8 @@ class WebApp:
                                 schedule_mode=msg_data.get('schedule_mode', 'cron')
                             )
                             
-                            self.monitor_engine.add_scheduled_message(config)
-                            imported_scheduled += 1
+                            if self.monitor_engine.add_scheduled_message(config):
+                                imported_scheduled += 1
                         except Exception as e:
                             self.logger.error(f"导入定时消息失败: {e}")
                             continue
@@ -4,11 +4,17 @@
 """
 
 from .singleton import Singleton
-from .logger import get_logger, setup_logger
+from .logger import get_logger, setup_logger, flush_log_handlers
 from .validators import validate_phone, validate_chat_id
+from .keyword_matcher import KeywordMatcher
+from .parsers import parse_int_list, parse_id_list, parse_id_lines, parse_str_list, parse_str_csv, parse_lines, parse_bool, parse_float, parse_int
 
 __all__ = [
     'Singleton',
-    'get_logger', 'setup_logger',
-    'validate_phone', 'validate_chat_id'
+    'get_logger', 'setup_logger', 'flush_log_handlers',
+    'validate_phone', 'validate_chat_id',
+    'KeywordMatcher',
+    'parse_int_list', 'parse_id_list', 'parse_id_lines',
+    'parse_str_list', 'parse_str_csv', 'parse_lines', 'parse_bool',
+    'parse_float', 'parse_int'
 ] 
\ No newline at end of file
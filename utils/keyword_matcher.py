@@ -0,0 +1,37 @@
+"""
+关键词匹配工具
+将多个包含匹配关键词预构建为 Aho-Corasick 自动机，单次扫描消息文本
+"""
+
+from typing import Iterable, Set, FrozenSet
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: FrozenSet[str] = frozenset(k for k in keywords if k)
+        self._automaton = None
+
+        if ahocorasick is not None and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def find_all(self, text: str) -> Set[str]:
+        if not text or not self.keywords:
+            return set()
+
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+
+        return {keyword for keyword in self.keywords if keyword in text}
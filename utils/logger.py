@@ -3,12 +3,65 @@
 统一管理系统日志
 """
 
+import atexit
 import logging
 import sys
+import time
 import threading
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from typing import Optional
 
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_BUFFER_CAPACITY = 200
+LOG_FLUSH_INTERVAL = 1.0
+
+
+class FastFormatter(logging.Formatter):
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt)
+        self._cached_time = (None, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, prefix = self._cached_time
+        if cached_second != second:
+            prefix = time.strftime(self.default_time_format, self.converter(second))
+            self._cached_time = (second, prefix)
+
+        return self.default_msec_format % (prefix, record.msecs)
+
+
+class TimedMemoryHandler(MemoryHandler):
+
+    def __init__(self, capacity: int, flush_interval: float = LOG_FLUSH_INTERVAL, **kwargs):
+        super().__init__(capacity, **kwargs)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (super().shouldFlush(record)
+                or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self):
+        super().flush()
+        self._last_flush = time.monotonic()
+
+
+def _buffered_file_handler(log_file: str, level: int, formatter: logging.Formatter) -> MemoryHandler:
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setLevel(level)
+    file_handler.setFormatter(formatter)
+
+    memory_handler = TimedMemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler)
+    memory_handler.setLevel(level)
+    atexit.register(memory_handler.close)
+    return memory_handler
+
 
 def setup_logger(
     name: str = 'telegram_monitor',
@@ -20,12 +73,14 @@ def setup_logger(
     logger.setLevel(level)
     
     if logger.handlers:
+        for handler in logger.handlers:
+            handler.flush()
         logger.handlers.clear()
     
     if format_string is None:
-        format_string = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        format_string = DEFAULT_FORMAT
     
-    formatter = logging.Formatter(format_string)
+    formatter = FastFormatter(format_string)
     
     console_handler = logging.StreamHandler(stream=sys.stdout)
     console_handler.setLevel(level)
@@ -36,14 +91,17 @@ def setup_logger(
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        logger.addHandler(_buffered_file_handler(log_file, level, formatter))
     
     return logger
 
 
+def flush_log_handlers():
+    for logger in (logging.getLogger(), logging.getLogger('telegram_monitor')):
+        for handler in logger.handlers:
+            handler.flush()
+
+
 def get_logger(name: str) -> logging.Logger:
     _ensure_initialized()
     
@@ -100,18 +158,14 @@ def setup_root_logger():
         
         console_handler = logging.StreamHandler(stream=sys.stdout)
         console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(console_formatter)
+        formatter = FastFormatter(DEFAULT_FORMAT)
+        console_handler.setFormatter(formatter)
         root_logger.addHandler(console_handler)
         
         log_path = Path('logs/telegram_monitor.log')
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler('logs/telegram_monitor.log', encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(_buffered_file_handler('logs/telegram_monitor.log', logging.INFO, formatter))
 
 
 def init_logging():
@@ -0,0 +1,97 @@
+"""
+输入解析工具
+统一处理表单中以逗号或换行分隔的ID、扩展名、关键词列表
+"""
+
+import re
+from typing import Any, Iterable, List, Optional, Union
+
+_TOKEN_RE = re.compile(r'[^,\s]+')
+_TRUE_STRINGS = frozenset({'1', 'true', 'on', 'yes', 'y'})
+
+
+def parse_int_list(text: str, strict: bool = False) -> List[int]:
+    if not text:
+        return []
+
+    tokens = _TOKEN_RE.findall(text)
+    try:
+        return list(map(int, tokens))
+    except ValueError:
+        if strict:
+            raise
+
+    result = []
+    for token in tokens:
+        try:
+            result.append(int(token))
+        except ValueError:
+            pass
+    return result
+
+
+def _to_ids(tokens: Iterable[str]) -> List[Union[int, str]]:
+    result = []
+    for token in tokens:
+        try:
+            result.append(int(token))
+        except ValueError:
+            result.append(token)
+    return result
+
+
+def parse_id_list(text: str) -> List[Union[int, str]]:
+    return _to_ids(_TOKEN_RE.findall(text)) if text else []
+
+
+def parse_str_list(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text) if text else []
+
+
+def parse_lines(text: str) -> List[str]:
+    if not text:
+        return []
+
+    return [line for line in map(str.strip, text.splitlines()) if line]
+
+
+def parse_id_lines(text: str) -> List[Union[int, str]]:
+    return _to_ids(parse_lines(text))
+
+
+def parse_str_csv(text: str) -> List[str]:
+    if not text:
+        return []
+
+    return [part for part in map(str.strip, text.split(',')) if part]
+
+
+def parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+def _is_blank(value: Any) -> bool:
+    return not value or (isinstance(value, str) and not value.strip())
+
+
+def parse_float(value: Any, default: Optional[float] = None, scale: float = 1.0,
+                strict: bool = False) -> Optional[float]:
+    if _is_blank(value):
+        return default
+    try:
+        return float(value) * scale
+    except (ValueError, TypeError):
+        if strict:
+            raise
+        return default
+
+
+def parse_int(value: Any, default: Optional[int] = None) -> Optional[int]:
+    if _is_blank(value):
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
@@ -3,7 +3,18 @@
 """
 
 import re
+from functools import lru_cache
 from typing import Union
+from zoneinfo import ZoneInfo
+
+from apscheduler.triggers.cron import CronTrigger
+
+SCHEDULE_TIMEZONE = ZoneInfo('Asia/Shanghai')
+
+
+@lru_cache(maxsize=256)
+def get_cron_trigger(cron: str) -> CronTrigger:
+    return CronTrigger.from_crontab(cron, timezone=SCHEDULE_TIMEZONE)
 
 
 def validate_phone(phone: str) -> bool:
@@ -53,10 +64,7 @@ def validate_cron_expression(cron: str) -> tuple[bool, str]:
     ]
     
     try:
-        from apscheduler.triggers.cron import CronTrigger
-        import pytz
-        
-        CronTrigger.from_crontab(cron, timezone=pytz.timezone('Asia/Shanghai'))
+        get_cron_trigger(cron)
         return True, ""
         
     except Exception as e:
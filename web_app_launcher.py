@@ -18,6 +18,20 @@ from ui.status_monitor import StatusMonitor
 from core import AccountManager, MonitorEngine
 from utils.logger import get_logger
 
+PUBLIC_MODE_WARNING = (
+    "⚠️  警告: 启用公共访问模式，Web界面将对外网开放\n"
+    "⚠️  请确保在安全的网络环境中使用\n"
+)
+
+STARTUP_FAILURE_HINTS = (
+    "\n"
+    "💡 提示:\n"
+    "1. 检查是否已正确配置 .env 文件\n"
+    "2. 运行 'python web_app_launcher.py --check-config' 检查配置\n"
+    "3. 运行 'python web_app_launcher.py --check-imports' 检查模块导入\n"
+    "4. 查看日志获取详细错误信息\n"
+)
+
 
 class TelegramMonitorWebApp:
     
@@ -135,27 +149,32 @@ class TelegramMonitorWebApp:
         except Exception as e:
             self.logger.error(f"Web应用启动失败: {e}")
             raise
+        finally:
+            await self.monitor_engine.shutdown()
 
 
 def check_config_only():
     try:
         from utils.config import config
-        print("✅ 配置模块加载成功")
+        lines = ["✅ 配置模块加载成功"]
         
         if config.is_telegram_configured():
-            print("✅ Telegram API 已配置")
+            lines.append("✅ Telegram API 已配置")
         else:
-            print("❌ Telegram API 未配置")
+            lines.append("❌ Telegram API 未配置")
             
         if config.is_openai_configured():
-            print("✅ OpenAI API 已配置")
+            lines.append("✅ OpenAI API 已配置")
         else:
-            print("⚠️  OpenAI API 未配置（AI功能不可用）")
+            lines.append("⚠️  OpenAI API 未配置（AI功能不可用）")
             
         if config.EMAIL_USERNAME and config.EMAIL_PASSWORD:
-            print("✅ 邮件配置已设置")
+            lines.append("✅ 邮件配置已设置")
         else:
-            print("⚠️  邮件配置未设置（邮件通知不可用）")
+            lines.append("⚠️  邮件配置未设置（邮件通知不可用）")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
             
         return config.validate_config()
         
@@ -192,10 +211,10 @@ def main():
         try:
             result = subprocess.run([sys.executable, "简单启动检查.py"], 
                                   capture_output=True, text=True, cwd=Path.cwd())
-            print(result.stdout)
+            output = result.stdout + '\n'
             if result.stderr:
-                print("错误信息:")
-                print(result.stderr)
+                output += f"错误信息:\n{result.stderr}\n"
+            sys.stdout.write(output)
             sys.exit(result.returncode)
         except FileNotFoundError:
             print("❌ 未找到 简单启动检查.py 文件")
@@ -208,8 +227,8 @@ def main():
     host = args.host
     if args.public:
         host = "0.0.0.0"
-        print("⚠️  警告: 启用公共访问模式，Web界面将对外网开放")
-        print("⚠️  请确保在安全的网络环境中使用")
+        sys.stdout.write(PUBLIC_MODE_WARNING)
+        sys.stdout.flush()
         
         try:
             confirm = input("是否继续? (y/N): ").lower().strip()
@@ -224,12 +243,7 @@ def main():
         app = TelegramMonitorWebApp(host=host, port=args.port)
         app.run()
     except Exception as e:
-        print(f"启动失败: {e}")
-        print("\n💡 提示:")
-        print("1. 检查是否已正确配置 .env 文件")
-        print("2. 运行 'python web_app_launcher.py --check-config' 检查配置")
-        print("3. 运行 'python web_app_launcher.py --check-imports' 检查模块导入")
-        print("4. 查看日志获取详细错误信息")
+        sys.stdout.write(f"启动失败: {e}\n{STARTUP_FAILURE_HINTS}")
         sys.exit(1)
 
 